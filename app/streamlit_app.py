@@ -16,7 +16,7 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 import streamlit as st
 
 # Imports Skripte
-from scripts.preprocess_rag import run_preprocess, ask_rag, _latest_raw_file, load_records
+from scripts.preprocess_rag import run_preprocess, ask_rag, _latest_raw_file, iter_records
 import re
 
 # Import crawl_all
@@ -29,12 +29,11 @@ st.set_page_config(page_title="Newsletter-Agent Demo", layout="centered")
 
 st.title("📰 NEWSLETTER-AGENT \n – Top-Artikel der Woche -")
 
-def run_full_pipeline():
+def run_full_pipeline(budget_min: float):
 
-    # Crawl alle Quellen und speichere in einer JSON
-    st.info("Crawle Artikel aus allen Quellen …")
-    run_all_crawlers()
-    latest = _latest_raw_file()
+    # Crawl alle Quellen (parallel, Banking/Fintech zuerst) innerhalb des Zeitbudgets
+    st.info(f"Crawle Artikel aus allen Quellen (max. {budget_min:.0f} Minuten) …")
+    latest = run_all_crawlers(parallel=True, budget=budget_min * 60)
     st.success(f"Artikel gespeichert unter: {latest.name}")
 
     # Preprocessing starten
@@ -43,8 +42,12 @@ def run_full_pipeline():
     st.success("FAISS-Index erfolgreich aktualisiert.")
 
 if not st.session_state.pipeline_done:
+    budget_min = st.number_input(
+        "Zeitbudget für den Crawl (Minuten)",
+        min_value=1, max_value=120, value=10, step=1
+    )
     if st.button("🔄 Kompletten Prozess starten"):
-        run_full_pipeline()
+        run_full_pipeline(budget_min)
         st.session_state.pipeline_done = True
         st.rerun()
 else:
@@ -76,14 +79,20 @@ else:
                 "Artikel, die ich letzte Woche gelesen habe.\n\n"
             )
 
+            # Volltexte der Treffer in einem Durchgang aus dem Roh-Snapshot streamen
+            wanted = {art["url"] for art in hits}
+            url_to_text = {
+                r["url"]: r.get("text", "")
+                for r in iter_records(_latest_raw_file())
+                if r["url"] in wanted
+            }
+
             md_lines = []
             for i, art in enumerate(hits, 1):
                 summary = art.get("summary", "").strip()
                 summary_line = f"{summary}\n" if summary else "(keine Zusammenfassung)\n"
 
-                # Lade den Volltext aus der Roh-JSON, um die ersten drei Sätze zu zeigen
-                raw_records = load_records(_latest_raw_file())
-                url_to_text = {r["url"]: r.get("text", "") for r in raw_records}
+                # Volltext aus dem Snapshot, um die ersten drei Sätze zu zeigen
                 full_text = url_to_text.get(art["url"], "")
                 # Splitte in Sätze und nimm die ersten drei
                 sentences = re.split(r'(?<=[.!?])\s+', full_text.strip())
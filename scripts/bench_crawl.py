@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+End-to-End-Benchmark der Crawler ohne Netz: spielt eine mit
+`crawl_all --record DIR` erstellte Aufnahme über einen lokalen Replay-Server
+ab und misst pro Quelle Requests/s, Bytes/s und Wall-Time.
+
+Latenz und Fehler lassen sich injizieren, um Retry- und Rate-Limit-Verhalten
+reproduzierbar zu vergleichen. Zeitfenster beziehen sich auf den
+Aufnahmezeitpunkt, die Aufnahme bleibt also dauerhaft gültig.
+
+> python -m scripts.crawl_all --record data/fixtures/2025-06-05
+> python -m scripts.bench_crawl data/fixtures/2025-06-05 --latency 80 --error-rate 0.02 --concurrency 8
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import scripts.crawler.base as base
+from scripts.crawler.fixtures import FixtureArchive, ReplayServer
+from scripts.crawl_all import SOURCES, SourceResult, _run_source
+
+
+def _source_hosts() -> Dict[str, str]:
+    """Host → Quelle, abgeleitet aus dem Sitemap-Index jedes Crawler-Moduls."""
+    hosts = {}
+    for name, crawl in SOURCES:
+        module = sys.modules[crawl.__module__]
+        host = urlsplit(module.SITEMAP_INDEX_URL).netloc
+        hosts[host] = name
+        hosts[host.removeprefix("www.")] = name
+    return hosts
+
+
+def run(fixtures: Path, latency: float, jitter: float, error_rate: float, error_status: int,
+        parallel: bool, days_back: int | None, seed: int, **opts: Any) -> None:
+    archive = FixtureArchive(fixtures)
+    server = ReplayServer(archive, latency=latency, jitter=jitter, error_rate=error_rate,
+                          error_status=error_status, seed=seed).start()
+    base.HTTP_CACHE = None            # jeder Request soll den Replay-Server erreichen
+    base.REPLAY_URL = server.url
+    base.FROZEN_NOW = archive.recorded_at
+    days_back = days_back or archive.meta.get("days_back") or 7
+    print(f"[bench] {len(archive)} Fixtures, aufgenommen {archive.recorded_at:%Y-%m-%d %H:%M}, "
+          f"Replay über {server.url}")
+
+    def write(name: str, record: Dict[str, Any]) -> None:
+        pass
+
+    results: Dict[str, SourceResult] = {}
+    start = time.perf_counter()
+    try:
+        if parallel:
+            with ThreadPoolExecutor(max_workers=len(SOURCES)) as pool:
+                futures = {pool.submit(_run_source, name, crawl, days_back, write, **opts): name
+                           for name, crawl in SOURCES}
+                for fut in as_completed(futures):
+                    results[futures[fut]] = fut.result()
+        else:
+            for name, crawl in SOURCES:
+                results[name] = _run_source(name, crawl, days_back, write, **opts)
+    finally:
+        wall = time.perf_counter() - start
+        server.stop()
+        base.REPLAY_URL = base.FROZEN_NOW = None
+
+    hosts = _source_hosts()
+    per_source: Dict[str, list[int]] = {name: [0, 0, 0, 0] for name, _ in SOURCES}
+    stats = server.stats
+    for host in stats.requests:
+        row = per_source.setdefault(hosts.get(host, host), [0, 0, 0, 0])
+        row[0] += stats.requests[host]
+        row[1] += stats.bytes[host]
+        row[2] += stats.errors[host]
+        row[3] += stats.missing[host]
+
+    print(f"\n{'Quelle':<18} {'Artikel':>7} {'Requests':>8} {'req/s':>7} {'MB':>7} "
+          f"{'MB/s':>6} {'Fehler':>6} {'fehlt':>5} {'Wall s':>7}")
+    for name, (reqs, nbytes, errors, missing) in per_source.items():
+        count, secs, _ = results.get(name, (0, 0.0, None))
+        rate = reqs / secs if secs else 0.0
+        mbps = nbytes / 1e6 / secs if secs else 0.0
+        print(f"{name:<18} {count:>7} {reqs:>8} {rate:>7.1f} {nbytes / 1e6:>7.2f} "
+              f"{mbps:>6.2f} {errors:>6} {missing:>5} {secs:>7.1f}")
+    total_reqs = sum(r[0] for r in per_source.values())
+    total_bytes = sum(r[1] for r in per_source.values())
+    print(f"{'gesamt':<18} {sum(r[0] for r in results.values()):>7} {total_reqs:>8} "
+          f"{total_reqs / wall:>7.1f} {total_bytes / 1e6:>7.2f} {total_bytes / 1e6 / wall:>6.2f} "
+          f"{sum(r[2] for r in per_source.values()):>6} {sum(r[3] for r in per_source.values()):>5} "
+          f"{wall:>7.1f}")
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Offline-Benchmark der Crawler über eine Aufnahme")
+    p.add_argument("fixtures", type=Path, help="Verzeichnis aus crawl_all --record")
+    p.add_argument("--latency", type=float, default=0.0, help="Latenz pro Response (ms)")
+    p.add_argument("--jitter", type=float, default=0.0, help="Zufällige Abweichung der Latenz (± ms)")
+    p.add_argument("--error-rate", type=float, default=0.0, help="Anteil fehlerhafter Responses (0–1)")
+    p.add_argument("--error-status", type=int, default=503, help="HTTP-Status der Fehler (Standard: 503)")
+    p.add_argument("--parallel", action="store_true", help="Quellen parallel crawlen")
+    p.add_argument("--concurrency", type=int, default=0,
+                   help="Gleichzeitige Artikel-Downloads je Quelle (0 = sequentiell)")
+    p.add_argument("--days", type=int, default=None,
+                   help="Zeitraum in Tagen (Standard: wie bei der Aufnahme)")
+    p.add_argument("--seed", type=int, default=0, help="Seed für Latenz/Fehler")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    run(args.fixtures, args.latency / 1000, args.jitter / 1000, args.error_rate, args.error_status,
+        args.parallel, args.days, args.seed, concurrency=args.concurrency)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark der FAISS-Indextypen (vecindex.INDEX_KINDS) und Speicherformate
+(vecindex.STORAGES, optional mit PCA) auf unserem Korpus: recall@k gegenüber
+der exakten Suche (flat/f32), Latenz p50/p99 pro Einzelabfrage und
+Speicherbedarf des serialisierten Index samt Ersparnis.
+
+Bei komprimierten Formaten steht der Recall ohne und mit exakter
+Nachbewertung (RESCORE_FACTOR × k Kandidaten) nebeneinander; die Latenz gilt
+mit Nachbewertung (hier aus dem RAM, im Betrieb per memmap von der Platte).
+
+Grundlage sind die Vollvektoren des aktuellen Index (data/vectorstore/, nach
+`preprocess_rag`). Als Abfragen dienen zufällig gezogene Chunks, die dafür aus
+dem indexierten Bestand herausgenommen werden.
+
+> python -m scripts.bench_index --queries 200 --k 10
+> python -m scripts.bench_index --kind ivf --kind hnsw --nprobe 4 --nprobe 32 --ef-search 128
+> python -m scripts.bench_index --kind flat --storage f32 --storage f16 --storage int8 \
+      --storage binary --pca 0 --pca 256 --pca 128
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from itertools import product
+from typing import Callable, List
+
+import faiss  # type: ignore
+import numpy as np
+
+from scripts.vecindex import (
+    INDEX_KINDS, PCA_DIMS, RESCORE_FACTOR, STORAGES, IndexSpec, VectorIndex,
+    build_index, check_spec, effective_spec, rescore,
+)
+
+VEC_DIR = Path(__file__).resolve().parent.parent / "data" / "vectorstore"
+
+NPROBES = [1, 4, 16, 64]
+EF_SEARCHES = [16, 64, 256]
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def _measure(index: faiss.Index, queries: np.ndarray, truth: np.ndarray, k: int,
+             params: faiss.SearchParameters | None,
+             fetch: Callable[[List[int]], np.ndarray] | None) -> tuple[float, float, float, float]:
+    """
+    recall@k ohne und mit Nachbewertung, p50 und p99 in Millisekunden
+    (Einzelabfragen wie in ask_rag; ohne `fetch` keine Nachbewertung).
+    """
+    n_cand = k * RESCORE_FACTOR if fetch else k
+    raw = np.empty((len(queries), k), dtype=np.int64)
+    found = np.empty((len(queries), k), dtype=np.int64)
+    lat: List[float] = []
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        cand = index.search(queries[i:i + 1], n_cand, params=params)[1]
+        found[i] = rescore(queries[i:i + 1], cand, k, fetch)[1][0] if fetch else cand[0]
+        lat.append((time.perf_counter() - start) * 1000)
+        raw[i] = cand[0, :k]
+    return (_recall(raw, truth), _recall(found, truth),
+            float(np.percentile(lat, 50)), float(np.percentile(lat, 99)))
+
+
+def run(index_dir: Path, kinds: List[str], storages: List[str], pcas: List[int | None],
+        n_queries: int, k: int, nprobes: List[int], ef_searches: List[int], seed: int) -> None:
+    vi = VectorIndex.load(index_dir / "articles.index", index_dir / "articles.meta.pkl")
+    if vi is None:
+        sys.exit("Kein Index mit Vollvektoren gefunden – bitte zuerst preprocess_rag ausführen.")
+    ids = np.fromiter(vi.rows, dtype=np.int64, count=len(vi.rows))
+    vectors = vi.vectors(ids.tolist())
+
+    rng = np.random.default_rng(seed)
+    is_query = np.zeros(len(ids), dtype=bool)
+    is_query[rng.choice(len(ids), size=min(n_queries, len(ids) // 10), replace=False)] = True
+    queries, base_vecs, base_ids = vectors[is_query], vectors[~is_query], ids[~is_query]
+    print(f"[bench] {len(base_ids)} Vektoren (dim={vi.dim}), {len(queries)} Abfragen, k={k}")
+
+    exact = build_index(IndexSpec(), base_vecs, base_ids)
+    truth = exact.search(queries, k)[1]
+    exact_mb = faiss.serialize_index(exact).nbytes / 2**20
+    row_of = {int(i): r for r, i in enumerate(base_ids)}
+
+    def fetch(cand: List[int]) -> np.ndarray:
+        return base_vecs[[row_of[i] for i in cand]]
+
+    print(f"{'Index':<22} {'Parameter':<13} {'recall':>7} {'+rescore':>9} {'p50 ms':>7} "
+          f"{'p99 ms':>7} {'Speicher':>9} {'gespart':>8} {'Aufbau s':>8}")
+    for kind, storage, pca in product(kinds, storages, pcas):
+        spec = IndexSpec(kind, storage, pca)
+        try:
+            check_spec(spec)
+        except ValueError:
+            continue  # Kombination gibt es nicht (z. B. hnsw/binary)
+        built = effective_spec(spec, len(base_ids), vi.dim)
+        start = time.perf_counter()
+        index = build_index(spec, base_vecs, base_ids, seed=seed)
+        build_s = time.perf_counter() - start
+        mem_mb = faiss.serialize_index(index).nbytes / 2**20
+        if built.kind in ("ivf", "ivfpq"):
+            settings = [(f"nprobe={p}", faiss.SearchParametersIVF(nprobe=p)) for p in nprobes]
+        elif built.kind == "hnsw":
+            settings = [(f"efSearch={e}", faiss.SearchParametersHNSW(efSearch=e)) for e in ef_searches]
+        else:
+            settings = [("exakt" if not built.compressed else "-", None)]
+        label = str(spec) if built == spec else f"{spec}→{built}"  # zu wenig Daten fürs Training
+        for name, params in settings:
+            recall, rescored, p50, p99 = _measure(index, queries, truth, k, params,
+                                                 fetch if built.compressed else None)
+            print(f"{label:<22} {name:<13} {recall:>7.3f} "
+                  f"{(f'{rescored:.3f}' if built.compressed else '-'):>9} {p50:>7.2f} {p99:>7.2f} "
+                  f"{mem_mb:>7.1f}MB {1 - mem_mb / exact_mb:>7.0%} {build_s:>8.1f}")
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="FAISS-Indextypen und Kompression: recall@k, Latenz, Speicher")
+    p.add_argument("--index-dir", type=Path, default=VEC_DIR,
+                   help="Verzeichnis mit articles.index/articles.meta.pkl (Standard: data/vectorstore)")
+    p.add_argument("--kind", dest="kinds", action="append", choices=INDEX_KINDS,
+                   help="Nur diese Indextypen messen (mehrfach möglich; Standard: alle)")
+    p.add_argument("--storage", dest="storages", action="append", choices=STORAGES,
+                   help="Speicherformate (mehrfach möglich; Standard: f32)")
+    p.add_argument("--pca", dest="pcas", type=int, action="append", choices=(0,) + PCA_DIMS,
+                   help="PCA-Dimensionen, 0 = ohne (mehrfach möglich; Standard: ohne)")
+    p.add_argument("--queries", type=int, default=200, help="Anzahl Abfragen (Standard: 200)")
+    p.add_argument("--k", type=int, default=10, help="Treffer pro Abfrage (Standard: 10)")
+    p.add_argument("--nprobe", dest="nprobes", type=int, action="append",
+                   help=f"IVF-Listen pro Suche (mehrfach möglich; Standard: {NPROBES})")
+    p.add_argument("--ef-search", dest="ef_searches", type=int, action="append",
+                   help=f"HNSW-Suchbreite (mehrfach möglich; Standard: {EF_SEARCHES})")
+    p.add_argument("--seed", type=int, default=1234)
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    run(args.index_dir, args.kinds or list(INDEX_KINDS), args.storages or ["f32"],
+        [p or None for p in args.pcas or [0]], args.queries, args.k,
+        args.nprobes or NPROBES, args.ef_searches or EF_SEARCHES, args.seed)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark der Artikel-Parser: alte BeautifulSoup-Variante vs. neue
+lxml-Extraktions-Engine (base.extract_article), gemessen in Seiten/Sekunde.
+
+Erwartet gespeicherte HTML-Seiten je Quelle:
+    data/html/<source>/*.html
+
+> python -m scripts.bench_parsers --html-dir data/html --repeat 3
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup, Tag
+
+from scripts.crawler import (
+    bankingclub, cio, derbankblog, financefwd, ifun, iphonetricks,
+    itfinanzmagazin, netzpolitik, paymentandbanking, spiegel,
+)
+from scripts.crawler.base import clean_text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HTML_DIR = BASE_DIR / "data" / "html"
+
+# ---------------------------------------------------------------------------
+# Referenz: die bisherigen BeautifulSoup-Parser (html.parser, mehrere Durchläufe)
+# ---------------------------------------------------------------------------
+
+
+def _legacy_head(soup: BeautifulSoup) -> tuple[str, str]:
+    title_tag = soup.find("meta", property="og:title") or soup.find("title")
+    title = clean_text((title_tag.get("content") if title_tag else "") or "")
+    author_tag = soup.find("meta", {"name": "author"})
+    author = author_tag["content"].strip() if author_tag and author_tag.get("content") else ""
+    return title, author
+
+
+def _legacy_first_article(html: str) -> Dict[str, str]:
+    soup = BeautifulSoup(html, "html.parser")
+    title, author = _legacy_head(soup)
+    article_tag = soup.find("article")
+    paragraphs = (
+        [p.get_text(" ", strip=True) for p in article_tag.find_all("p") if isinstance(p, Tag)]
+        if article_tag else []
+    )
+    return {"title": title, "author": author, "text": clean_text("\n".join(paragraphs))}
+
+
+def _legacy_containers(selectors: tuple[str, ...],
+                       keep: Callable[[str], bool] | None = None) -> Callable[[str], Dict[str, str]]:
+    def parse(html: str) -> Dict[str, str]:
+        soup = BeautifulSoup(html, "html.parser")
+        title, author = _legacy_head(soup)
+        paragraphs = []
+        for sel in selectors:
+            for container in soup.select(sel):
+                paragraphs.extend(
+                    p.get_text(" ", strip=True) for p in container.find_all("p") if isinstance(p, Tag)
+                )
+        if keep is not None:
+            paragraphs = [para for para in paragraphs if keep(para)]
+        return {"title": title, "author": author, "text": clean_text("\n".join(paragraphs))}
+    return parse
+
+
+def _legacy_itfinanz_keep(para: str) -> bool:
+    low = para.lower()
+    return ".mp3" not in low and not low.startswith("https://") and not re.match(r"^\s*preview\s*:", low)
+
+
+WORDPRESS = ("article", ".post-content", ".entry-content", ".content")
+
+PARSERS: Dict[str, tuple[Callable[[str], Dict[str, str]], Callable[[str, str, str], object]]] = {
+    "spiegel": (_legacy_first_article, spiegel.parse_article),
+    "ifun": (_legacy_first_article, ifun.parse_article),
+    "iphonetricks": (_legacy_first_article, iphonetricks.parse_article),
+    "derbankblog": (_legacy_first_article, derbankblog.parse_article),
+    "bankingclub": (_legacy_containers(WORDPRESS + (".single-content", ".inner-content")),
+                    bankingclub.parse_article),
+    "cio": (_legacy_containers(WORDPRESS + (".single-content", ".inner-content")), cio.parse_article),
+    "financefwd": (_legacy_containers(WORDPRESS), financefwd.parse_article),
+    "itfinanzmagazin": (_legacy_containers(WORDPRESS, _legacy_itfinanz_keep),
+                        itfinanzmagazin.parse_article),
+    "netzpolitik": (_legacy_containers(WORDPRESS), netzpolitik.parse_article),
+    "paymentandbanking": (_legacy_containers(WORDPRESS), paymentandbanking.parse_article),
+}
+
+# ---------------------------------------------------------------------------
+# Messung
+# ---------------------------------------------------------------------------
+
+
+def _pages_per_sec(fn: Callable[[str], object], pages: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) / best if best > 0 else float("inf")
+
+
+def run(html_dir: Path, repeat: int) -> None:
+    print(f"{'Quelle':<18} {'Seiten':>6} {'alt p/s':>9} {'neu p/s':>9} {'Faktor':>7}")
+    for source, (legacy, current) in PARSERS.items():
+        files = sorted((html_dir / source).glob("*.html"))
+        if not files:
+            continue
+        pages = [fp.read_text(encoding="utf-8", errors="replace") for fp in files]
+        old = _pages_per_sec(legacy, pages, repeat)
+        new = _pages_per_sec(lambda html: current(html, "", ""), pages, repeat)
+        print(f"{source:<18} {len(pages):>6} {old:>9.1f} {new:>9.1f} {new / old:>6.1f}x")
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Parser-Benchmark: BeautifulSoup vs. lxml-Engine")
+    p.add_argument("--html-dir", type=Path, default=HTML_DIR,
+                   help="Verzeichnis mit <source>/*.html (Standard: data/html)")
+    p.add_argument("--repeat", type=int, default=3, help="Wiederholungen (bester Lauf zählt)")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    run(args.html_dir, args.repeat)
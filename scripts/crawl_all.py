@@ -1,64 +1,415 @@
 #!/usr/bin/env python3
 """
-Sammelt Artikel aus allen Quell‑Crawlern (Spiegel, ifun, …),
-führt sie zu einer Liste zusammen und speichert genau eine
-JSON-Datei unter data/raw/articles_raw_<timestamp>.json.
+Sammelt Artikel aus allen Quell‑Crawlern (Spiegel, ifun, …) und schreibt sie
+während des Crawls Zeile für Zeile in genau einen Snapshot
+data/raw/articles_raw_<timestamp>.jsonl.gz (siehe crawler/snapshot.py) –
+oder mit --store per Upsert in den Artikelspeicher data/store/articles.sqlite
+(siehe crawler/store.py).
+
+Jede fertig bearbeitete Seite landet zusätzlich im Checkpoint-Journal
+(crawler/journal.py). Bricht ein Lauf ab, setzt --resume ihn fort, ohne
+erledigte Seiten erneut zu laden.
+
+Mit --budget MIN endet der Crawl nach spätestens MIN Minuten; geladen wird
+nach erwartetem Nutzen (Banking/Fintech zuerst, siehe crawler/schedule.py).
+
+Alle geladenen Artikel-HTMLs landen zusätzlich im HTML-Archiv data/archive/
+(crawler/archive.py); scripts/reextract.py wertet es ohne Netz neu aus.
 """
 
+import argparse
+import json
 import sys
+import tempfile
+import threading
+import time
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import scripts.crawler.base as base
+from scripts.crawler.base import CURRENT_SOURCE, METRICS, RAW_DIR
+from scripts.crawler.archive import HTML_ARCHIVE_DIR, HtmlArchive
+from scripts.crawler.fixtures import FixtureArchive
+from scripts.crawler.journal import JOURNAL_PATH, CrawlJournal
+from scripts.crawler.schedule import CrawlBudget, source_priority
+from scripts.crawler.snapshot import COMPRESSIONS, DEFAULT_COMPRESSION, SnapshotWriter, snapshot_path
+from scripts.crawler.state import CrawlState
+from scripts.crawler.store import ARTICLE_STORE_PATH, ArticleStore
+from scripts.crawler.spiegel import crawl_spiegel
+from scripts.crawler.ifun import crawl_ifun
+from scripts.crawler.iphonetricks import crawl_iphonetricks
+from scripts.crawler.bankingclub import crawl_bankingclub
+from scripts.crawler.cio import crawl_cio
+from scripts.crawler.derbankblog import crawl_derbankblog
+from scripts.crawler.financefwd import crawl_financefwd
+from scripts.crawler.itfinanzmagazin import crawl_itfinanzmagazin
+from scripts.crawler.netzpolitik import crawl_netzpolitik
+from scripts.crawler.paymentandbanking import crawl_paymentandbanking
+
+SOURCES: List[Tuple[str, Callable[..., List[Dict[str, Any]]]]] = [
+    ("spiegel", crawl_spiegel),
+    ("ifun", crawl_ifun),
+    ("iphonetricks", crawl_iphonetricks),
+    ("bankingclub", crawl_bankingclub),
+    ("cio", crawl_cio),
+    ("derbankblog", crawl_derbankblog),
+    ("financefwd", crawl_financefwd),
+    ("itfinanzmagazin", crawl_itfinanzmagazin),
+    ("netzpolitik", crawl_netzpolitik),
+    ("paymentandbanking", crawl_paymentandbanking),
+]
+
+
+SourceResult = Tuple[int, float, Exception | None]  # (Artikel, Sekunden, Fehler)
+
+
+def _run_source(name: str, crawl: Callable[..., List[Dict[str, Any]]],
+                days_back: int, write: Callable[[str, Dict[str, Any]], None],
+                **opts) -> SourceResult:
+    """
+    Führt einen Crawler aus und übergibt jeden Datensatz sofort an `write(name, record)`.
+    Fehler werden gefangen statt den Lauf abzubrechen – bereits geschriebene
+    Artikel der Quelle bleiben erhalten.
+
+    Mit `journal` in opts werden zuerst die im Journal stehenden Datensätze
+    geschrieben; eine laut Journal abgeschlossene Quelle wird nicht erneut gecrawlt.
+    Mit `budget` in opts startet die Quelle nicht mehr, wenn die Deadline schon erreicht ist.
+    """
+    print(f"\n=== CRAWLE {name.upper()} ===")
+    start = time.perf_counter()
+    written = 0
+    token = CURRENT_SOURCE.set(name)  # auch Sitemap-Requests zählen für die Quelle
+    journal: CrawlJournal | None = opts.get("journal")
+    budget: CrawlBudget | None = opts.get("budget")
+
+    def sink(record: Dict[str, Any]) -> None:
+        nonlocal written
+        write(name, record)
+        written += 1
+
+    try:
+        if journal is not None:
+            for record in journal.records(name):
+                sink(record)
+            if written:
+                print(f"[{name}] {written} Artikel aus dem Journal übernommen")
+            if journal.finished(name):
+                print(f"[{name}] laut Journal abgeschlossen – übersprungen")
+                return written, time.perf_counter() - start, None
+        if budget is not None and budget.expired:
+            print(f"[{name}] ⏱ Zeitbudget erschöpft – Quelle nicht gestartet")
+            budget.skip_source(name)
+            return written, time.perf_counter() - start, None
+        crawl(days_back=days_back, sink=sink, **opts)
+        if journal is not None:
+            journal.finish(name)
+        return written, time.perf_counter() - start, None
+    except Exception as exc:
+        print(f"[{name}] ✖ Crawler abgebrochen: {exc}", file=sys.stderr)
+        return written, time.perf_counter() - start, exc
+    finally:
+        CURRENT_SOURCE.reset(token)
+
+
+class _OrderedWrite:
+    """
+    Reicht die Datensätze paralleler Quellen in fester Quellen-Reihenfolge an
+    `write` weiter, damit der Snapshot nicht von den Laufzeiten abhängt: die
+    vorderste noch laufende Quelle schreibt direkt, spätere puffern in einer
+    temporären JSONL-Datei, bis alle Quellen vor ihnen fertig sind.
+    """
+
+    def __init__(self, names: List[str], write: Callable[[str, Dict[str, Any]], None]) -> None:
+        self._order = names
+        self._write = write
+        self._head = 0  # Index der vordersten noch nicht fertigen Quelle
+        self._done: set[str] = set()
+        self._spool: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._head < len(self._order) and name == self._order[self._head]:
+                self._write(name, record)
+                return
+            if name not in self._spool:
+                self._spool[name] = tempfile.TemporaryFile("w+", encoding="utf-8")
+            self._spool[name].write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def finish(self, name: str) -> None:
+        """Quelle fertig: nachrückende Quellen ausschreiben, soweit alle davor fertig sind."""
+        with self._lock:
+            self._done.add(name)
+            while self._head < len(self._order) and self._order[self._head] in self._done:
+                self._head += 1
+                if self._head < len(self._order):
+                    self._flush(self._order[self._head])
+
+    def _flush(self, name: str) -> None:
+        spool = self._spool.pop(name, None)
+        if spool is None:
+            return
+        with spool:
+            spool.seek(0)
+            for line in spool:
+                self._write(name, json.loads(line))
+
+    def close(self) -> None:
+        """Nicht mehr ausgeschriebene Puffer verwerfen (Abbruch; das Journal hat sie)."""
+        for spool in self._spool.values():
+            spool.close()
+        self._spool.clear()
+
+
+def _print_summary(results: Dict[str, SourceResult], total: float) -> None:
+    print("\n=== ZUSAMMENFASSUNG ===")
+    for name, _ in SOURCES:
+        count, secs, error = results[name]
+        status = f"FEHLER: {error}" if error else "ok"
+        print(f"  {name:<18} {count:>5} Artikel  {secs:>7.1f}s  {status}")
+    print(f"  {'gesamt':<18} {sum(r[0] for r in results.values()):>5} Artikel  {total:>7.1f}s")
+
+
+STATE_PATH = Path(__file__).resolve().parent.parent / "data" / "state" / "crawl_state.sqlite"
+REPORT_DIR = Path(__file__).resolve().parent.parent / "data" / "reports"
+
+
+def _write_reports(results: Dict[str, SourceResult], total: float,
+                   run: Dict[str, Any]) -> Tuple[Path, Path]:
+    """
+    Metriken des Laufs als JSON-Report (data/reports/crawl_<ts>.json) und als
+    Prometheus-Textdatei (data/reports/crawl.prom, wird jeweils überschrieben).
+    """
+    extra = {
+        name: {"wall_seconds": round(secs, 3), "articles": count, "failed": int(error is not None)}
+        for name, (count, secs, error) in results.items()
+    }
+    ts = time.strftime("%Y%m%dT%H%M%S")
+    json_fp = METRICS.write_json(REPORT_DIR / f"crawl_{ts}.json", extra,
+                                 run={**run, "wall_seconds": round(total, 3)})
+    prom_fp = METRICS.write_prometheus(REPORT_DIR / "crawl.prom", extra)
+    return json_fp, prom_fp
+
+
+def _print_delta(state: CrawlState) -> None:
+    print("\n=== DELTA ===")
+    for name, _ in SOURCES:
+        stats = state.stats.get(name, {})
+        print(f"  {name:<18} neu {stats.get('new', 0):>5}  geändert {stats.get('changed', 0):>5}  "
+              f"unverändert {stats.get('unchanged', 0) + stats.get('skipped', 0):>5}")
+
+
+def _print_budget(budget: CrawlBudget) -> None:
+    lines = budget.report()
+    print(f"\n=== ZEITBUDGET ({budget.seconds / 60:.1f} min) ===")
+    print("\n".join(lines) if lines else "  alles geladen")
+
+
+def _open_journal(resume: bool, days_back: int, **meta: Any) -> Tuple[CrawlJournal, int]:
+    """
+    Öffnet das Checkpoint-Journal. Ohne `resume` beginnt ein neuer Lauf; mit
+    `resume` gilt das Zeitfenster des unterbrochenen Laufs, damit dieselben
+    Links wie beim Abbruch anstehen.
+    """
+    journal = CrawlJournal(JOURNAL_PATH)
+    previous = journal.meta
+    if resume and previous:
+        done = sum(journal.pages(name) for name, _ in SOURCES)
+        finished = [name for name, _ in SOURCES if journal.finished(name)]
+        print(f"[INFO] Setze Lauf vom {previous.get('started_at', '?')} fort: {done} Seiten erledigt, "
+              f"abgeschlossen: {', '.join(finished) or '–'}")
+        if previous.get("days_back", days_back) != days_back:
+            print(f"[WARN] --days {days_back} ignoriert, der Lauf nutzt {previous['days_back']} Tage")
+        return journal, previous.get("days_back", days_back)
+    if resume:
+        print("[INFO] Kein unterbrochener Lauf im Journal – starte neu")
+    journal.start(days_back=days_back, **meta)
+    return journal, days_back
+
+
+def _make_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """Prozess-Pool für die Parser; forkserver/spawn, da Fetcher-Threads laufen."""
+    method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context(method))
+
+
+def main(days_back: int = 7, parallel: bool = False, workers: int = len(SOURCES),
+         incremental: bool = False, parse_workers: int = 0,
+         compression: str = DEFAULT_COMPRESSION, store: bool = False,
+         record: Path | None = None, resume: bool = False,
+         budget: float | None = None, archive: bool = True, feeds: bool = True,
+         wp_api: bool = False, **opts) -> Path:
+    """
+    Crawlt alle Quellen und streamt das Ergebnis in einen JSONL-Snapshot
+    (`compression`: gzip, zstd oder none); liefert dessen Pfad. Die Artikel
+    stehen darin quellenweise in der Reihenfolge von SOURCES (mit `budget`
+    nach Priorität) – im parallelen Modus genauso wie nacheinander.
+
+    Mit store=True landen die Artikel stattdessen im SQLite-Artikelspeicher
+    (ein Eintrag pro URL, erneut gecrawlte Artikel werden aktualisiert);
+    zurückgegeben wird dann dessen Pfad.
+
+    Mit `record` (Verzeichnis) wird jede Response zusätzlich als Fixture
+    abgelegt; scripts/bench_crawl.py spielt die Aufnahme offline wieder ab.
+
+    - parallel=False: Quellen nacheinander (bisheriges Verhalten).
+    - parallel=True:  Quellen gleichzeitig in einem Thread-Pool mit `workers`
+      Threads; die Gesamtlaufzeit bestimmt dann die langsamste Quelle.
 
-# Aktuellen Ordner (scripts/crawler) zum Python‑Pfad hinzufügen, damit lokale Module ohne Paketkontext importierbar sind
-sys.path.append(str(Path(__file__).resolve().parent))
+    Mit incremental=True wird über den Crawl-Zustand in data/state/ nur geladen,
+    was seit dem letzten Lauf neu ist oder einen neuen Lastmod hat; die JSON
+    enthält dann nur neue bzw. geänderte Artikel.
 
-from crawler.base import save_bulk_json
-from crawler.spiegel import crawl_spiegel
-from crawler.ifun import crawl_ifun
-from crawler.iphonetricks import crawl_iphonetricks
-from crawler.bankingclub import crawl_bankingclub
-from crawler.cio import crawl_cio
-from crawler.derbankblog import crawl_derbankblog
-from crawler.financefwd import crawl_financefwd
-from crawler.itfinanzmagazin import crawl_itfinanzmagazin
-from crawler.netzpolitik import crawl_netzpolitik
-from crawler.paymentandbanking import crawl_paymentandbanking
+    Mit parse_workers>0 parsen so viele Prozesse das HTML aller Quellen,
+    während die Fetcher nur noch Bytes laden (Pipeline-Modus).
 
-def main() -> None:
-    records = []
-    days_back = 7
+    Jede bearbeitete Seite wird im Checkpoint-Journal vermerkt. Mit
+    resume=True setzt der Lauf einen abgebrochenen fort: die dort erledigten
+    Artikel gehen direkt in den neuen Snapshot, nur der Rest wird geladen.
+    Nach einem fehlerfreien Lauf wird das Journal geleert.
 
-    print("\n=== CRAWLE SPIEGEL ===")
-    records += crawl_spiegel(days_back=days_back)
+    Mit `budget` (Sekunden) endet der Lauf spätestens nach dieser Zeit: Quellen
+    starten nach Priorität, Links werden nach erwartetem Nutzen geladen, beim
+    Ablauf bleiben Teilergebnisse erhalten und das Übersprungene wird
+    aufgelistet (und lässt sich per --resume nachholen).
 
-    print("\n=== CRAWLE IFUN ===")
-    records += crawl_ifun(days_back=days_back)
+    Mit archive=True (Standard) wird jedes geladene Artikel-HTML im
+    HTML-Archiv abgelegt (unveränderte Seiten nur einmal).
 
-    print("\n=== CRAWLE IPHONETRICKS ===")
-    records += crawl_iphonetricks(days_back=days_back)
+    Mit feeds=False werden die Links immer über die Sitemaps gesammelt statt
+    zuerst über die RSS/Atom-Feeds der Quellen.
 
-    print("\n=== CRAWLE BANKINGCLUB ===")
-    records += crawl_bankingclub(days_back=days_back)
+    Mit wp_api=True holen die WordPress-Quellen ihre Artikel seitenweise über
+    /wp-json/wp/v2/posts (bis zu 100 pro Request); ist die API einer Quelle
+    nicht nutzbar, wird dort wie gewohnt HTML gecrawlt.
 
-    print("\n=== CRAWLE CIO ===")
-    records += crawl_cio(days_back=days_back)
+    Weitere Optionen (z. B. concurrency) gehen an jeden crawl_*-Aufruf.
+    """
+    start = time.perf_counter()
+    METRICS.reset()
+    base.FEED_DISCOVERY = feeds
+    base.WP_API_INGEST = wp_api
+    journal, days_back = _open_journal(resume, days_back, store=store, incremental=incremental)
+    opts["journal"] = journal
+    html_archive = HtmlArchive(HTML_ARCHIVE_DIR) if archive else None
+    if html_archive is not None:
+        opts["archive"] = html_archive
+    sources = SOURCES
+    if budget is not None:
+        opts["budget"] = CrawlBudget(budget)
+        sources = sorted(SOURCES, key=lambda s: -source_priority(s[0]))
+    if record is not None:
+        base.RECORD_ARCHIVE = FixtureArchive(record, days_back=days_back)
+    state = CrawlState(STATE_PATH) if incremental else None
+    if state is not None:
+        opts["state"] = state
+    parse_pool = _make_parse_pool(parse_workers) if parse_workers else None
+    if parse_pool is not None:
+        opts["parse_pool"] = parse_pool
+    results: Dict[str, SourceResult] = {}
+    writer: SnapshotWriter | ArticleStore
+    if store:
+        writer = ArticleStore(ARTICLE_STORE_PATH)
+        write = writer.upsert
+    else:
+        writer = SnapshotWriter(snapshot_path(RAW_DIR, "articles", compression), compression)
+        write = lambda name, record: writer.write(record)
 
-    print("\n=== CRAWLE DERBANKBLOG ===")
-    records += crawl_derbankblog(days_back=days_back)
+    try:
+        if parallel:
+            ordered = _OrderedWrite([name for name, _ in sources], write)
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = {
+                        pool.submit(_run_source, name, crawl, days_back, ordered, **opts): name
+                        for name, crawl in sources
+                    }
+                    for fut in as_completed(futures):
+                        results[futures[fut]] = fut.result()
+                        ordered.finish(futures[fut])
+            finally:
+                ordered.close()
+        else:
+            for name, crawl in sources:
+                results[name] = _run_source(name, crawl, days_back, write, **opts)
+    except KeyboardInterrupt:
+        print(f"\n[WARN] Abgebrochen – mit --resume fortsetzen ({JOURNAL_PATH})", file=sys.stderr)
+        raise
+    finally:
+        writer.close()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        complete = budget is None or not (opts["budget"].total_skipped or opts["budget"].not_started)
+        if len(results) == len(SOURCES) and not any(r[2] for r in results.values()) and complete:
+            journal.clear()
+        journal.close()
+        if html_archive is not None:
+            html_archive.close()
 
-    print("\n=== CRAWLE FINANCEFWD ===")
-    records += crawl_financefwd(days_back=days_back)
+    total = time.perf_counter() - start
+    _print_summary(results, total)
+    if budget is not None:
+        _print_budget(opts["budget"])
+    json_fp, prom_fp = _write_reports(results, total, run={
+        "days_back": days_back, "parallel": parallel, "incremental": incremental,
+        "parse_workers": parse_workers, "concurrency": opts.get("concurrency", 0),
+        "budget_seconds": budget,
+    })
+    print(f"[INFO] Metriken: {json_fp} / {prom_fp}")
+    if record is not None:
+        print(f"[INFO] {len(base.RECORD_ARCHIVE)} Responses aufgezeichnet in {record}")
+        base.RECORD_ARCHIVE = None
+    if state is not None:
+        _print_delta(state)
+        state.close()
 
-    print("\n=== CRAWLE ITFINANZMAGAZIN ===")
-    records += crawl_itfinanzmagazin(days_back=days_back)
+    if html_archive is not None:
+        print(f"[INFO] {html_archive.count} neue HTML-Seiten in {html_archive.root} archiviert")
+    if any(r[2] for r in results.values()):
+        print("[INFO] Fehlgeschlagene Quellen lassen sich mit --resume nachholen")
+    print(f"[INFO] {writer.count} Artikel in {writer.path} gespeichert")
+    return writer.path
 
-    print("\n=== CRAWLE NETZPOLITIK ===")
-    records += crawl_netzpolitik(days_back=days_back)
 
-    print("\n=== CRAWLE PAYMENTANDBANKING ===")
-    records += crawl_paymentandbanking(days_back=days_back)
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Crawlt alle Quellen und speichert einen Roh-Snapshot")
+    p.add_argument("--days", type=int, default=7, help="Zeitraum in Tagen (Standard: 7)")
+    p.add_argument("--parallel", action="store_true", help="Quellen parallel crawlen")
+    p.add_argument("--workers", type=int, default=len(SOURCES),
+                   help="Anzahl paralleler Quellen im --parallel-Modus")
+    p.add_argument("--concurrency", type=int, default=0,
+                   help="Gleichzeitige Artikel-Downloads je Quelle (0 = sequentiell)")
+    p.add_argument("--parse-workers", type=int, default=0,
+                   help=f"Parser-Prozesse im Pipeline-Modus (0 = im Fetcher-Thread, z. B. {os.cpu_count()})")
+    p.add_argument("--incremental", action="store_true",
+                   help="Nur neue/geänderte Artikel laden und speichern")
+    p.add_argument("--compress", choices=sorted(COMPRESSIONS), default=DEFAULT_COMPRESSION,
+                   help="Kompression des JSONL-Snapshots (Standard: gzip)")
+    p.add_argument("--record", type=Path, metavar="DIR",
+                   help="Alle Responses als Fixtures für bench_crawl.py aufzeichnen")
+    p.add_argument("--store", action="store_true",
+                   help="In den SQLite-Artikelspeicher schreiben statt in einen Snapshot")
+    p.add_argument("--budget", type=float, metavar="MIN",
+                   help="Zeitbudget in Minuten; lädt nach Priorität und bricht danach ab")
+    p.add_argument("--no-archive", dest="archive", action="store_false",
+                   help="Geladene HTMLs nicht im HTML-Archiv ablegen")
+    p.add_argument("--no-feeds", dest="feeds", action="store_false",
+                   help="Links nur über die Sitemaps sammeln (keine RSS/Atom-Feeds)")
+    p.add_argument("--wp-api", action="store_true",
+                   help="WordPress-Quellen über die REST-API laden (Fallback: HTML)")
+    p.add_argument("--resume", action="store_true",
+                   help="Abgebrochenen Lauf laut Checkpoint-Journal fortsetzen")
+    return p
 
-    outfile = save_bulk_json("articles", records)
-    print(f"[INFO] Artikel in {outfile} gespeichert")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = build_argparser().parse_args()
+    main(days_back=args.days, parallel=args.parallel, workers=args.workers,
+         incremental=args.incremental, parse_workers=args.parse_workers,
+         compression=args.compress, store=args.store, record=args.record,
+         resume=args.resume, archive=args.archive, feeds=args.feeds,
+         wp_api=args.wp_api, concurrency=args.concurrency,
+         budget=args.budget * 60 if args.budget else None)
@@ -0,0 +1,143 @@
+"""
+Append‑only Archiv der geladenen Artikel‑HTMLs (WARC‑ähnlich).
+
+Ändert eine Quelle ihr Markup, reicht es, `parse_article` zu reparieren und
+das Archiv neu auszuwerten (scripts/reextract.py) – ohne erneuten Live‑Crawl.
+
+Aufbau:
+
+  data/archive/html-YYYY-MM-DD.warc.gz  – ein Segment pro Tag; jeder Eintrag ist
+                                          ein eigenes gzip‑Member mit einem
+                                          WARC/1.0‑`resource`‑Record (lesbar mit
+                                          üblichen WARC‑Werkzeugen)
+  data/archive/index.sqlite             – URL, Quelle, Fetch‑Zeit, Lastmod und
+                                          Byte‑Offset/Länge im Segment
+
+Ein Eintrag lässt sich damit ohne Entpacken des ganzen Segments per Seek
+lesen. Unveränderte Seiten (gleicher SHA‑1 wie der letzte Stand der URL)
+werden nicht erneut abgelegt.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+HTML_ARCHIVE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "archive"
+
+
+class ArchiveEntry(NamedTuple):
+    url: str
+    source: str
+    fetched_at: str
+    lastmod: str | None
+    segment: str
+    offset: int
+    length: int
+
+
+class HtmlArchive:
+    """Thread‑sicheres HTML‑Archiv; Schreiben hängt nur an, Lesen per Offset."""
+
+    def __init__(self, root: Path = HTML_ARCHIVE_DIR) -> None:
+        root.mkdir(parents=True, exist_ok=True)
+        self.root = root
+        self.count = 0  # neu abgelegte Seiten in diesem Lauf
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(root / "index.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """CREATE TABLE IF NOT EXISTS pages (
+                   url        TEXT NOT NULL,
+                   source     TEXT NOT NULL,
+                   fetched_at TEXT NOT NULL,
+                   lastmod    TEXT,
+                   sha1       TEXT,
+                   segment    TEXT NOT NULL,
+                   offset     INTEGER NOT NULL,
+                   length     INTEGER NOT NULL
+               );
+               CREATE INDEX IF NOT EXISTS idx_pages_url     ON pages(url, fetched_at);
+               CREATE INDEX IF NOT EXISTS idx_pages_fetched ON pages(source, fetched_at);"""
+        )
+
+    # -------------------------------------------------------------- Schreiben
+    def add(self, source: str, url: str, html: str, lastmod: str | None = None) -> bool:
+        """Legt eine Seite ab; False, wenn der letzte Stand der URL identisch ist."""
+        body = html.encode("utf-8")
+        digest = hashlib.sha1(body).hexdigest()
+        now = datetime.now(timezone.utc)
+        header = (
+            "WARC/1.0\r\n"
+            "WARC-Type: resource\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Date: {now.strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+            f"WARC-Payload-Digest: sha1:{digest}\r\n"
+            "Content-Type: text/html; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("utf-8")
+        member = gzip.compress(header + body + b"\r\n\r\n", compresslevel=6)
+        segment = f"html-{now:%Y-%m-%d}.warc.gz"
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sha1 FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+            ).fetchone()
+            if row is not None and row[0] == digest:
+                return False
+            with open(self.root / segment, "ab") as fh:
+                offset = fh.tell()
+                fh.write(member)
+            self._db.execute(
+                "INSERT INTO pages (url, source, fetched_at, lastmod, sha1, segment, offset, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, source, now.isoformat(), lastmod, digest, segment, offset, len(member)),
+            )
+            self._db.commit()
+            self.count += 1
+        return True
+
+    # ------------------------------------------------------------------ Lesen
+    def latest(self, source: str | None = None,
+               fetched_since: datetime | str | None = None) -> Iterator[ArchiveEntry]:
+        """Jüngster archivierter Stand je URL, optional gefiltert nach Quelle und Fetch‑Zeit."""
+        where, params = [], []
+        if source is not None:
+            where.append("source = ?")
+            params.append(source)
+        if fetched_since is not None:
+            where.append("fetched_at >= ?")
+            params.append(fetched_since if isinstance(fetched_since, str)
+                          else fetched_since.astimezone(timezone.utc).isoformat())
+        # SQLite: bei MAX() stammen die übrigen Spalten aus derselben Zeile
+        sql = ("SELECT url, source, MAX(fetched_at), lastmod, segment, offset, length FROM pages"
+               + (" WHERE " + " AND ".join(where) if where else "")
+               + " GROUP BY url ORDER BY segment, offset")
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        for row in rows:
+            yield ArchiveEntry(*row)
+
+    def read(self, entry: ArchiveEntry) -> str:
+        return read_entry(self.root, entry)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def read_entry(root: Path, entry: ArchiveEntry) -> str:
+    """HTML eines Eintrags (ohne Index‑Zugriff, daher auch in Worker‑Prozessen nutzbar)."""
+    with open(root / entry.segment, "rb") as fh:
+        fh.seek(entry.offset)
+        record = gzip.decompress(fh.read(entry.length))
+    _, _, payload = record.partition(b"\r\n\r\n")
+    return payload[:-4].decode("utf-8")
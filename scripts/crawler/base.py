@@ -2,28 +2,53 @@
 Basis‑Utilities für alle Quell‑Crawler des Newsletter‑Agenten.
 
 Hier werden wiederkehrende Funktionen (HTTP‑Fetch mit Retry, GZip‑Support,
-Whitespace‑Cleaning und Bulk‑JSON‑Speichern) zentral bereitgestellt, damit
-einzelne Crawler‑Module wie `spiegel.py`, `ifun.py` etc. keinen Boilerplate
-duplizieren müssen.
+asynchroner Batch‑Fetch, gemeinsame Download/Parse‑Schleife, Whitespace‑Cleaning
+und Bulk‑JSON‑Speichern) zentral bereitgestellt, damit einzelne Crawler‑Module
+wie `spiegel.py`, `ifun.py` etc. keinen Boilerplate duplizieren müssen.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import gzip
+import html as htmllib
 from io import BytesIO
 import json
-import os
-from datetime import datetime
+import queue
+import re
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import takewhile
 from pathlib import Path
-from typing import List, Dict
-from datetime import datetime
-import pytz
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
 
+import httpx
 import requests
 from bs4 import BeautifulSoup, Tag
+import lxml.html
+from lxml import etree
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from scripts.crawler.archive import HtmlArchive
+from scripts.crawler.fixtures import FixtureArchive
+from scripts.crawler.httpcache import HttpCache
+from scripts.crawler.journal import CrawlJournal
+from scripts.crawler.metrics import CURRENT_SOURCE, METRICS
+from scripts.crawler.ratelimit import HostRateLimiter, THROTTLE_STATUS, parse_retry_after
+from scripts.crawler.schedule import CrawlBudget
+from scripts.crawler.state import CrawlState
+
 # ---------------------------------------------------------------------------#
 # Konstante HTTP‑Header & Session mit Retry                                  #
 # ---------------------------------------------------------------------------#
@@ -39,8 +64,9 @@ def _make_session(backoff: float = 1.5, retries: int = 5) -> requests.Session:
     retry = Retry(
         total=retries,
         backoff_factor=backoff,
-        status_forcelist=[500, 502, 503, 504],
+        status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET"],
+        respect_retry_after_header=True,
     )
     adapter = HTTPAdapter(max_retries=retry)
     sess = requests.Session()
@@ -52,23 +78,1101 @@ def _make_session(backoff: float = 1.5, retries: int = 5) -> requests.Session:
 SESSION = _make_session()
 TIMEOUT = 6  # Sekunden
 
+# ---------------------------------------------------------------------------#
+# Persistenter HTTP‑Cache (ETag / Last‑Modified, TTL, LRU‑Eviction)          #
+# ---------------------------------------------------------------------------#
+
+HTTP_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "cache" / "http"
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+SITEMAP_INDEX_TTL = 60 * 60  # Sitemap‑Indizes höchstens stündlich neu laden
+
+# Auf None setzen, um den Cache abzuschalten
+HTTP_CACHE: HttpCache | None = HttpCache(HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES)
+
+# ---------------------------------------------------------------------------#
+# Adaptives Rate‑Limit pro Host (AIMD‑Token‑Bucket, siehe ratelimit.py)      #
+# ---------------------------------------------------------------------------#
+
+PER_HOST_CONCURRENCY = 4   # Obergrenze gleichzeitiger Requests pro Host
+
+# Jeder Request (sync wie async) holt sich hier vorher einen Slot für seinen Host
+RATE_LIMITER = HostRateLimiter(max_concurrency=PER_HOST_CONCURRENCY)
+
+# ---------------------------------------------------------------------------#
+# Record & Replay (siehe fixtures.py und scripts/bench_crawl.py)             #
+# ---------------------------------------------------------------------------#
+
+# Gesetzt ⇒ jeder Fetch legt seinen Body zusätzlich im Fixture‑Archiv ab
+RECORD_ARCHIVE: FixtureArchive | None = None
+# Gesetzt (z. B. "http://127.0.0.1:8123") ⇒ Requests gehen an den Replay‑Server
+REPLAY_URL: str | None = None
+# Gesetzt ⇒ Bezugszeitpunkt für alle days_back‑Fenster (Replay einer Aufnahme)
+FROZEN_NOW: datetime | None = None
+
+
+def crawl_now() -> datetime:
+    """Aktueller Zeitpunkt für Zeitfenster – beim Replay der Aufnahmezeitpunkt."""
+    return FROZEN_NOW or datetime.now(timezone.utc)
+
+
+def _wire_url(url: str) -> str:
+    """URL, die tatsächlich angefragt wird (beim Replay über den lokalen Server)."""
+    return f"{REPLAY_URL}/?url={quote(url, safe='')}" if REPLAY_URL else url
+
+
+def _record(url: str, body: bytes, encoding: str | None, content_type: str = "") -> None:
+    if RECORD_ARCHIVE is not None:
+        RECORD_ARCHIVE.add(url, body, encoding, content_type)
+
 # ---------------------------------------------------------------------------#
 # Fetch‑Utility mit GZip‑Unterstützung                                       #
 # ---------------------------------------------------------------------------#
 
-def fetch_html(url: str, timeout: int = TIMEOUT) -> str:
+MAX_BODY_BYTES = 8 * 1024 * 1024  # größere Antworten werden abgebrochen
+STREAM_CHUNK = 16 * 1024
+
+# Prädikat für den Streaming‑Fetch: bekommt die bisher gelesenen (entpackten)
+# Bytes. True ⇒ abbrechen, False ⇒ weiter prüfen, None ⇒ weiterlesen, ohne
+# erneut zu fragen (Entscheidung gefallen).
+StopWhen = Callable[[bytearray], "bool | None"]
+
+
+class BodyTooLarge(Exception):
+    """Antwort überschreitet `max_bytes`."""
+
+
+def fetch_html(url: str, timeout: int = TIMEOUT, ttl: float | None = None) -> str:
     """
     HTTP‑GET mit kurzem Timeout und automatischem Retry.
     Erkennt .gz‑Sitemaps und entpackt sie transparent.
+
+    Läuft über den HTTP‑Cache: vorhandene Einträge werden per Conditional GET
+    revalidiert (304 ⇒ kein erneuter Download). Mit `ttl` (Sekunden) wird ein
+    Eintrag, der jünger ist, ganz ohne Request zurückgegeben.
+    """
+    body, encoding = _fetch_raw(url, timeout, ttl)
+    return _decode_body(body, encoding)
+
+
+def fetch_stream(url: str,
+                 stop_when: StopWhen | None = None,
+                 max_bytes: int = MAX_BODY_BYTES,
+                 timeout: int = TIMEOUT) -> str | None:
+    """
+    Streamender Fetch: liest den Body in Blöcken, entpackt .gz inkrementell und
+    bricht mit `BodyTooLarge` ab, sobald `max_bytes` überschritten sind (bei
+    passendem Content‑Length schon vor dem ersten Byte). Liefert `stop_when`
+    True, wird die Verbindung geschlossen und None zurückgegeben – z. B. sobald
+    der <head> eine Paywall verrät.
+    """
+    raw = _fetch_raw(url, timeout, None, stop_when, max_bytes)
+    return None if raw is None else _decode_body(*raw)
+
+
+def fetch_bytes(url: str, timeout: int = TIMEOUT, ttl: float | None = None) -> bytes:
+    """Wie `fetch_html()`, liefert aber die (entpackten) Roh‑Bytes, z. B. für XML‑Parser."""
+    body, _ = _fetch_raw(url, timeout, ttl)
+    return body
+
+
+def _fetch_raw(url: str, timeout: int, ttl: float | None,
+               stop_when: StopWhen | None = None,
+               max_bytes: int = MAX_BODY_BYTES) -> tuple[bytes, str | None] | None:
+    entry = HTTP_CACHE.lookup(url) if HTTP_CACHE else None
+    if entry is not None and ttl is not None and entry.age < ttl:
+        METRICS.add("cache_hits")
+        _record(url, _gunzip(entry.body), entry.encoding)
+        return _gunzip(entry.body), entry.encoding
+
+    host = urlsplit(url).netloc
+    RATE_LIMITER.acquire(host)
+    started = time.monotonic()
+    try:
+        resp = SESSION.get(_wire_url(url), timeout=timeout, stream=True,
+                           headers=HttpCache.validators(entry))
+    except Exception:
+        RATE_LIMITER.release(host, time.monotonic() - started, None)
+        METRICS.response(None, time.monotonic() - started)
+        raise
+    latency = time.monotonic() - started
+    RATE_LIMITER.release(host, latency, _observed_status(resp),
+                         parse_retry_after(resp.headers.get("Retry-After")))
+    METRICS.response(resp.status_code, latency)
+    retries = getattr(resp.raw, "retries", None)
+    if getattr(retries, "history", None):
+        METRICS.add("retries", len(retries.history))
+
+    with resp:
+        content_type = resp.headers.get("Content-Type", "")
+        if resp.status_code == 304 and entry is not None:
+            HTTP_CACHE.refresh(url)
+            _record(url, _gunzip(entry.body), entry.encoding, content_type)
+            return _gunzip(entry.body), entry.encoding
+        resp.raise_for_status()
+
+        reader = _BoundedReader(url, resp.headers, stop_when, max_bytes)
+        for chunk in resp.iter_content(STREAM_CHUNK):
+            if reader.feed(chunk):
+                METRICS.add("bytes", len(reader.buf))
+                _record(url, bytes(reader.buf), resp.encoding, content_type)
+                return None
+        body = reader.finish()
+        METRICS.add("bytes", len(body))
+
+    _record(url, body, resp.encoding, content_type)
+    if HTTP_CACHE:
+        HTTP_CACHE.store(url, resp.headers, body, resp.encoding,
+                         keep_without_validators=ttl is not None)
+    return body, resp.encoding
+
+
+def _observed_status(resp: requests.Response) -> int:
+    """
+    Status für den Rate‑Limiter. urllib3 wiederholt 429/503 intern – dann
+    zählt der gedrosselte Versuch, nicht erst die finale Antwort.
+    """
+    retries = getattr(resp.raw, "retries", None)
+    for hist in getattr(retries, "history", None) or ():
+        if hist.status in THROTTLE_STATUS:
+            return hist.status
+    return resp.status_code
+
+
+class _BoundedReader:
+    """Sammelt Body‑Blöcke mit Größenlimit, inkrementellem Gunzip und Stop‑Prädikat."""
+
+    def __init__(self, url: str, headers: Any, stop_when: StopWhen | None,
+                 max_bytes: int) -> None:
+        length = headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > max_bytes:
+            raise BodyTooLarge(f"{url}: {int(length)} Bytes > {max_bytes}")
+        self.url = url
+        self.stop_when = stop_when
+        self.max_bytes = max_bytes
+        self.buf = bytearray()
+        self.inflate: Any = None
+        self.first = True
+
+    def feed(self, chunk: bytes) -> bool:
+        """Nimmt einen Block auf; True ⇒ Aufrufer soll abbrechen (Stop‑Prädikat)."""
+        if self.first:
+            self.first = False
+            if self.url.endswith(".gz") and chunk[:2] == b"\x1f\x8b":
+                self.inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self.inflate is not None:
+            chunk = self.inflate.decompress(chunk)
+        self.buf += chunk
+        if len(self.buf) > self.max_bytes:
+            raise BodyTooLarge(f"{self.url}: mehr als {self.max_bytes} Bytes")
+        if self.stop_when is not None:
+            verdict = self.stop_when(self.buf)
+            if verdict:
+                return True
+            if verdict is None:
+                self.stop_when = None
+        return False
+
+    def finish(self) -> bytes:
+        if self.inflate is not None:
+            self.buf += self.inflate.flush()
+        return bytes(self.buf)
+
+
+def _gunzip(body: bytes) -> bytes:
+    """Cache‑Einträge älterer Läufe enthalten .gz‑Sitemaps noch gepackt."""
+    return gzip.decompress(body) if body[:2] == b"\x1f\x8b" else body
+
+
+def _decode_body(body: bytes, encoding: str | None) -> str:
+    return body.decode(encoding or "utf-8", errors="replace")
+
+# ---------------------------------------------------------------------------#
+# Streaming‑Sitemap‑Parser (lxml.iterparse)                                  #
+# ---------------------------------------------------------------------------#
+
+SITEMAP_PATIENCE = 50  # so viele alte Einträge in Folge beenden einen Chunk
+
+
+def parse_lastmod(text: str | None) -> datetime | None:
+    """ISO‑Datum aus <lastmod>; Angaben ohne Zeitzone gelten als UTC."""
+    if not text:
+        return None
+    try:
+        dt = datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def iter_sitemap(data: bytes, tag: str = "url") -> Iterator[tuple[str, str | None]]:
+    """
+    Liefert (loc, lastmod_text) für jeden <url>‑ (bzw. <sitemap>‑)Eintrag, ohne
+    den ganzen Baum aufzubauen: bereits gelesene Elemente werden sofort
+    freigegeben, der Speicherbedarf bleibt unabhängig von der Sitemap‑Größe.
+    """
+    context = etree.iterparse(BytesIO(data), events=("end",), tag=f"{{*}}{tag}",
+                              recover=True, huge_tree=True)
+    for _, elem in context:
+        loc = lastmod = None
+        for child in elem:
+            name = etree.QName(child).localname
+            if name == "loc":
+                loc = (child.text or "").strip()
+            elif name == "lastmod":
+                lastmod = child.text
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+        if loc:
+            yield loc, lastmod
+
+
+def collect_sitemap_links(chunk_urls: Iterable[str],
+                          days_back: int = 7,
+                          limit: int | None = None,
+                          patience: int = SITEMAP_PATIENCE,
+                          prefetched: Dict[str, bytes] | None = None) -> List[tuple[str, str]]:
+    """
+    Gemeinsame Link‑Sammlung aller `get_recent_article_links()`:
+    streamt jeden Chunk, behält Einträge im `days_back`‑Fenster und liefert
+    (url, lastmod_iso)-Tupel ohne Duplikate in Fundreihenfolge.
+
+    Ein Chunk wird abgebrochen, sobald nach Treffern im Fenster `patience`
+    Einträge in Folge außerhalb liegen – bei absteigend sortierten Sitemaps
+    ist der Rest dann ebenfalls zu alt (patience=0 liest immer alles).
+    Bereits geladene Chunks (`prefetched`, z. B. aus der Chunk‑Auswahl) werden
+    nicht erneut angefragt.
     """
-    resp = SESSION.get(url, timeout=timeout, stream=True)
-    resp.raise_for_status()
+    prefetched = prefetched or {}
+    cutoff = crawl_now() - timedelta(days=days_back)
+    seen: set[str] = set()
+    links: list[tuple[str, str]] = []
+
+    for chunk_url in chunk_urls:
+        in_window = False
+        stale = 0
+        body = prefetched.get(chunk_url) or fetch_bytes(chunk_url)
+        for loc, last_text in iter_sitemap(body):
+            art_dt = parse_lastmod(last_text)
+            if art_dt is None:
+                continue
+            if art_dt < cutoff:
+                stale += 1
+                if in_window and patience and stale >= patience:
+                    break
+                continue
+            in_window, stale = True, 0
+            if loc not in seen:
+                seen.add(loc)
+                links.append((loc, art_dt.isoformat()))
 
-    if url.endswith(".gz"):
-        raw = BytesIO(resp.content)
-        with gzip.GzipFile(fileobj=raw) as gz:
-            return gz.read().decode("utf‑8", errors="ignore")
-    return resp.text
+        if limit and len(links) >= limit:
+            break
+
+    return links[:limit] if limit else links
+
+# ---------------------------------------------------------------------------#
+# Auswahl der Sitemap‑Chunks nach Zeitfenster                                #
+# ---------------------------------------------------------------------------#
+
+class SitemapSelection(NamedTuple):
+    """Ausgewählte Chunks (neueste zuerst) plus beim Proben bereits geladene Bodies."""
+    chunks: List[str]
+    skipped: int
+    prefetched: Dict[str, bytes]
+
+
+def select_sitemap_chunks(index_xml: str | bytes,
+                          match: Callable[[str], bool],
+                          days_back: int = 7,
+                          max_chunks: int | None = None,
+                          source: str = "sitemap") -> SitemapSelection:
+    """
+    Wählt aus einem Sitemap‑Index nur die Chunks, die das `days_back`‑Fenster
+    überlappen können.
+
+    - Mit <lastmod> im Index: Chunks, deren lastmod vor dem Cutoff liegt,
+      enthalten nichts Neueres und werden übersprungen.
+    - Ohne <lastmod>: Die Chunks gelten als nach Datum sortiert (auf‑ oder
+      absteigend, wird an den Rändern geprobt). Per Binärsuche wird die Grenze
+      gefunden, ab der der jüngste Eintrag eines Chunks vor dem Cutoff liegt –
+      es werden nur O(log n) Chunks zum Proben geladen.
+
+    `max_chunks` begrenzt optional zusätzlich die Anzahl.
+    """
+    data = index_xml.encode("utf-8") if isinstance(index_xml, str) else index_xml
+    cutoff = crawl_now() - timedelta(days=days_back)
+    entries = [(loc, parse_lastmod(lm)) for loc, lm in iter_sitemap(data, tag="sitemap")
+               if match(loc)]
+    prefetched: Dict[str, bytes] = {}
+
+    if any(lm is not None for _, lm in entries):
+        newest_first = datetime.max.replace(tzinfo=timezone.utc)
+        chosen = [(lm or newest_first, loc) for loc, lm in entries
+                  if lm is None or lm >= cutoff]
+        chosen.sort(key=lambda t: t[0], reverse=True)
+        chunks = [loc for _, loc in chosen]
+        mode = "lastmod"
+    else:
+        chunks = _probe_sitemap_chunks([loc for loc, _ in entries], cutoff, prefetched)
+        mode = f"Binärsuche, {len(prefetched)} Chunks geprobt"
+
+    if max_chunks:
+        chunks = chunks[:max_chunks]
+    skipped = len(entries) - len(chunks)
+    print(f"[{source}] {len(chunks)}/{len(entries)} Sitemap-Chunks im Zeitfenster "
+          f"({mode}) – {skipped} übersprungen")
+    return SitemapSelection(chunks, skipped, prefetched)
+
+
+def _probe_sitemap_chunks(locs: List[str],
+                          cutoff: datetime,
+                          prefetched: Dict[str, bytes]) -> List[str]:
+    """Binärsuche über datumssortierte Chunks ohne lastmod im Index."""
+    newest: Dict[int, datetime | None] = {}
+
+    def newest_entry(i: int) -> datetime | None:
+        if i not in newest:
+            body = prefetched.setdefault(locs[i], fetch_bytes(locs[i]))
+            dates = (parse_lastmod(lm) for _, lm in iter_sitemap(body))
+            newest[i] = max((d for d in dates if d is not None), default=None)
+        return newest[i]
+
+    if not locs:
+        return []
+    order = list(range(len(locs)))
+    first, last = newest_entry(0), newest_entry(len(locs) - 1)
+    if first is not None and last is not None and first < last:
+        order.reverse()  # Index aufsteigend sortiert → neueste zuerst
+
+    # Erste Position (neueste zuerst), deren jüngster Eintrag vor dem Cutoff liegt
+    lo, hi = 0, len(order)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        dt = newest_entry(order[mid])
+        if dt is not None and dt < cutoff:
+            hi = mid
+        else:
+            lo = mid + 1
+    return [locs[i] for i in order[:lo]]
+
+# ---------------------------------------------------------------------------#
+# Link‑Ermittlung über RSS/Atom‑Feeds (Fallback: Sitemaps)                   #
+# ---------------------------------------------------------------------------#
+
+# False ⇒ Feeds ignorieren, Links immer über die Sitemaps sammeln
+FEED_DISCOVERY = True
+FEED_TTL = 15 * 60     # Feeds höchstens alle 15 Minuten neu laden
+FEED_MAX_PAGES = 5     # WordPress: /feed/?paged=N, solange das Fenster nicht abgedeckt ist
+
+
+def _feed_date(text: str | None) -> datetime | None:
+    """RSS‑pubDate (RFC 822) oder Atom‑Datum (ISO 8601)."""
+    if not text:
+        return None
+    try:
+        dt = parsedate_to_datetime(text.strip())
+    except (TypeError, ValueError):
+        return parse_lastmod(text)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def iter_feed(data: bytes) -> Iterator[tuple[str, datetime | None, datetime | None]]:
+    """
+    Liefert (link, veröffentlicht, zuletzt geändert) für jedes <item> (RSS 2.0)
+    bzw. <entry> (Atom) in Dokument‑Reihenfolge – bei beiden üblicherweise
+    neueste zuerst, sortiert nach Veröffentlichung. „Geändert“ kommt aus
+    <updated> (Atom, atom:updated, dcterms:modified) und ist None, wenn der
+    Feed es nicht angibt – pubDate ändert sich bei Korrekturen nicht.
+    """
+    context = etree.iterparse(BytesIO(data), events=("end",), recover=True,
+                              tag=("{*}item", "{*}entry"))
+    for _, elem in context:
+        link = published = updated = None
+        for child in elem:
+            name = etree.QName(child).localname
+            if name == "link":
+                # RSS: Text; Atom: href, bevorzugt rel="alternate"
+                href = child.get("href")
+                if href is None:
+                    link = link or (child.text or "").strip()
+                elif child.get("rel", "alternate") == "alternate":
+                    link = href.strip()
+            elif name in ("pubDate", "published", "date"):
+                published = child.text
+            elif name in ("updated", "modified"):
+                updated = child.text
+        elem.clear(keep_tail=True)
+        if link:
+            yield link, _feed_date(published), _feed_date(updated)
+
+
+def _feed_page(feed_url: str, page: int) -> str:
+    if page == 1:
+        return feed_url
+    parts = urlsplit(feed_url)
+    query = parse_qsl(parts.query) + [("paged", str(page))]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def collect_feed_links(feed_url: str,
+                       days_back: int = 7,
+                       limit: int | None = None,
+                       max_pages: int = FEED_MAX_PAGES) -> List[tuple[str, str]] | None:
+    """
+    (url, lastmod_iso)-Tupel aus einem Feed – gleiches Format wie
+    `collect_sitemap_links()`. Fenster und Abbruch richten sich nach dem
+    Veröffentlichungsdatum (danach ist der Feed sortiert), als Lastmod dient
+    wie in der Sitemap das Änderungsdatum. Der Feed deckt das Fenster ab,
+    sobald ein Eintrag vor dem Cutoff veröffentlicht wurde oder es keine
+    weitere Seite gibt (404 auf ?paged=N); sonst – oder wenn der Feed nicht
+    lesbar ist – kommt None zurück.
+    """
+    cutoff = crawl_now() - timedelta(days=days_back)
+    seen: set[str] = set()
+    links: list[tuple[str, str]] = []
+
+    for page in range(1, max_pages + 1):
+        try:
+            body = fetch_bytes(_feed_page(feed_url, page), ttl=FEED_TTL)
+        except requests.HTTPError as exc:
+            if page > 1 and exc.response is not None and exc.response.status_code == 404:
+                return links[:limit] if limit else links  # Ende des Feeds erreicht
+            return None
+        except Exception:
+            return None
+
+        added = 0
+        covered = False
+        for loc, published, updated in iter_feed(body):
+            published = published or updated
+            if published is None:
+                continue
+            if published < cutoff:
+                covered = True
+                continue
+            if loc not in seen:
+                seen.add(loc)
+                links.append((loc, (updated or published).isoformat()))
+                added += 1
+        if covered or (limit and len(links) >= limit):
+            return links[:limit] if limit else links
+        if not added:
+            return None  # leere Seite oder Paging wird ignoriert – Abdeckung unklar
+    return None
+
+
+def discover_links(feed_url: str | None,
+                   sitemap_links: Callable[[], List[tuple[str, str]]],
+                   days_back: int = 7,
+                   limit: int | None = None,
+                   source: str = "feed") -> List[tuple[str, str]]:
+    """
+    Gemeinsamer Einstieg der `get_recent_article_links()`: erst der Feed
+    (ein bis wenige Requests), dann – wenn er das Fenster nicht abdeckt –
+    `sitemap_links()` (Index plus bis zu Dutzende Chunks).
+    """
+    if feed_url and FEED_DISCOVERY:
+        links = collect_feed_links(feed_url, days_back=days_back, limit=limit)
+        if links is not None:
+            print(f"[{source}] {len(links)} Links aus dem Feed {feed_url}")
+            return links
+        print(f"[{source}] Feed deckt {days_back} Tage nicht ab – nutze Sitemaps")
+    return sitemap_links()
+
+# ---------------------------------------------------------------------------#
+# WordPress‑REST‑API: bis zu 100 Artikel pro Request statt je einer Seite    #
+# ---------------------------------------------------------------------------#
+
+# True ⇒ WordPress‑Quellen holen Artikel über /wp-json/wp/v2/posts (crawl_all --wp-api)
+WP_API_INGEST = False
+WP_PER_PAGE = 100      # Maximum der API
+WP_MAX_PAGES = 20
+WP_FIELDS = "link,date_gmt,modified_gmt,title,content,yoast_head_json,_links,_embedded"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _wp_text(rendered: str) -> str:
+    return htmllib.unescape(_TAG_RE.sub("", rendered or "")).strip()
+
+
+def _wp_author(post: Dict[str, Any]) -> str:
+    authors = (post.get("_embedded") or {}).get("author") or []
+    if authors and isinstance(authors[0], dict) and authors[0].get("name"):
+        return authors[0]["name"]
+    return ((post.get("yoast_head_json") or {}).get("author") or "").strip()
+
+
+def wp_post_html(post: Dict[str, Any]) -> str:
+    """
+    Baut aus einem API‑Post eine minimale Artikelseite (og:title, author,
+    <article>). So wertet der unveränderte `parse_article` der Quelle sie aus
+    – inklusive Absatzfiltern – und das Datensatz‑Schema bleibt identisch.
+    """
+    title = htmllib.escape(_wp_text(post["title"]["rendered"]))
+    author = htmllib.escape(_wp_author(post))
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title><meta property=\"og:title\" content=\"{title}\">"
+        f"<meta name=\"author\" content=\"{author}\"></head>"
+        f"<body><article><h1>{title}</h1>{post['content']['rendered']}</article></body></html>"
+    )
+
+
+def collect_wp_posts(api_url: str,
+                     days_back: int = 7,
+                     limit: int | None = None,
+                     max_pages: int = WP_MAX_PAGES) -> Dict[str, tuple[str, str]] | None:
+    """
+    Blättert durch `api_url` (…/wp-json/wp/v2/posts) und liefert
+    {url: (modified_iso, html)} für alle Posts im Fenster, neueste zuerst.
+    Das Fenster richtet sich nach `date_gmt` (wie `after=`), als Lastmod für
+    Zustand und Parser dient – wie in der Sitemap – `modified_gmt`.
+    None, wenn die API fehlt, gesperrt ist oder keinen Inhalt liefert –
+    der Aufrufer fällt dann auf Sitemaps und HTML zurück.
+    """
+    cutoff = crawl_now() - timedelta(days=days_back)
+    after = cutoff.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    posts: Dict[str, tuple[str, str]] = {}
+
+    for page in range(1, max_pages + 1):
+        query = urlencode({"after": after, "per_page": WP_PER_PAGE, "page": page,
+                           "orderby": "date", "order": "desc",
+                           "_embed": "author", "_fields": WP_FIELDS})
+        try:
+            batch = json.loads(fetch_bytes(f"{api_url}?{query}", ttl=FEED_TTL))
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if page > 1 and status == 400:  # rest_post_invalid_page_number: Ende erreicht
+                break
+            return None
+        except Exception:
+            return None
+        if not isinstance(batch, list):
+            return None
+
+        for post in batch:
+            try:
+                url, rendered = post["link"], post["content"]["rendered"]
+                published = datetime.fromisoformat(post["date_gmt"]).replace(tzinfo=timezone.utc)
+                modified = datetime.fromisoformat(post.get("modified_gmt") or post["date_gmt"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if rendered and published >= cutoff:
+                lastmod = modified.replace(tzinfo=timezone.utc).isoformat()
+                posts.setdefault(url, (lastmod, wp_post_html(post)))
+        if len(batch) < WP_PER_PAGE or (limit and len(posts) >= limit):
+            break
+
+    if not posts and page == 1 and batch:
+        return None  # Posts ohne Inhalt (z. B. content per Plugin ausgeblendet)
+    if limit:
+        posts = dict(list(posts.items())[:limit])
+    return posts
+
+
+def crawl_wp_posts(source: str,
+                   api_url: str,
+                   parse: Callable[[str, str, str], Dict[str, Any] | None],
+                   days_back: int = 7,
+                   limit: int | None = None,
+                   **opts: Any) -> List[Dict[str, Any]] | None:
+    """
+    WordPress‑Variante von Link‑Sammlung plus `crawl_links()`: die Artikel
+    kommen seitenweise aus der REST‑API, `crawl_links()` parst sie ohne
+    weiteren Request (Journal, Zustand, Budget, Sink & Co. gelten wie gewohnt;
+    nur das HTML‑Archiv bleibt außen vor, da es keine echten Seiten gibt).
+    None, wenn `WP_API_INGEST` aus ist oder die API nicht nutzbar ist.
+    """
+    if not WP_API_INGEST:
+        return None
+    token = CURRENT_SOURCE.set(source)
+    try:
+        posts = collect_wp_posts(api_url, days_back=days_back, limit=limit)
+    finally:
+        CURRENT_SOURCE.reset(token)
+    if posts is None:
+        print(f"[{source}] WordPress-API nicht nutzbar – crawle HTML")
+        return None
+    print(f"[{source}] {len(posts)} Artikel über die WordPress-API")
+
+    links = [(url, lastmod) for url, (lastmod, _) in posts.items()]
+    pages = {url: page for url, (_, page) in posts.items()}
+    opts = {**opts, "concurrency": 0}  # nichts mehr zu laden, nur noch parsen
+    opts.pop("archive", None)  # nachgebautes Markup gehört nicht ins HTML‑Archiv
+    return crawl_links(source, links, parse, fetch=pages.get, **opts)
+
+# ---------------------------------------------------------------------------#
+# Async‑Fetch‑Engine (httpx) mit globalem und per‑Host‑Limit                 #
+# ---------------------------------------------------------------------------#
+
+MAX_CONCURRENCY = 16       # gleichzeitige Requests insgesamt
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchResult(NamedTuple):
+    """
+    Ergebnis eines Batch‑Fetches: entweder `text` oder `error` ist gesetzt –
+    oder keins von beiden, wenn `stop_when` den Download abgebrochen hat.
+    """
+    url: str
+    text: str | None
+    error: Exception | None
+
+
+async def _afetch_one(client: httpx.AsyncClient,
+                      url: str,
+                      timeout: float,
+                      stop_when: StopWhen | None = None,
+                      max_bytes: int = MAX_BODY_BYTES,
+                      per_host: int = PER_HOST_CONCURRENCY,
+                      retries: int = 5,
+                      backoff: float = 1.5) -> str | None:
+    """
+    Einzelner GET mit demselben Retry‑, Cache‑ und Streaming‑Verhalten wie
+    `fetch_stream`. Jeder Versuch wartet erst auf den Host‑Slot des
+    Rate‑Limiters.
+    """
+    entry = HTTP_CACHE.lookup(url) if HTTP_CACHE else None
+    headers = HttpCache.validators(entry)
+    host = urlsplit(url).netloc
+    for attempt in range(retries + 1):
+        if attempt:
+            METRICS.add("retries")
+        await RATE_LIMITER.aacquire(host, per_host)
+        released = False
+        retry_after = None
+        started = time.monotonic()
+        try:
+            async with client.stream("GET", _wire_url(url), timeout=timeout,
+                                     headers=headers) as resp:
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                latency = time.monotonic() - started
+                RATE_LIMITER.release(host, latency, resp.status_code, retry_after)
+                METRICS.response(resp.status_code, latency)
+                released = True
+                content_type = resp.headers.get("Content-Type", "")
+                if resp.status_code == 304 and entry is not None:
+                    HTTP_CACHE.refresh(url)
+                    _record(url, _gunzip(entry.body), entry.encoding, content_type)
+                    return _decode_body(_gunzip(entry.body), entry.encoding)
+                if resp.status_code not in RETRY_STATUS or attempt >= retries:
+                    resp.raise_for_status()
+                    reader = _BoundedReader(url, resp.headers, stop_when, max_bytes)
+                    async for chunk in resp.aiter_bytes(STREAM_CHUNK):
+                        if reader.feed(chunk):
+                            METRICS.add("bytes", len(reader.buf))
+                            _record(url, bytes(reader.buf), resp.charset_encoding, content_type)
+                            return None
+                    body = reader.finish()
+                    METRICS.add("bytes", len(body))
+                    _record(url, body, resp.charset_encoding, content_type)
+                    if HTTP_CACHE:
+                        HTTP_CACHE.store(url, resp.headers, body, resp.charset_encoding)
+                    return _decode_body(body, resp.charset_encoding)
+        except httpx.TransportError:
+            if attempt >= retries:
+                raise
+        finally:
+            if not released:
+                RATE_LIMITER.release(host, time.monotonic() - started, None)
+                METRICS.response(None, time.monotonic() - started)
+        # Mit Retry-After sperrt der Limiter den Host bereits lange genug
+        if retry_after is None:
+            await asyncio.sleep(backoff * 2 ** attempt)
+    raise RuntimeError("unreachable")
+
+
+async def afetch_many(urls: Iterable[str],
+                      concurrency: int = MAX_CONCURRENCY,
+                      per_host: int = PER_HOST_CONCURRENCY,
+                      timeout: float = TIMEOUT,
+                      stop_when: StopWhen | None = None,
+                      max_bytes: int = MAX_BODY_BYTES) -> AsyncIterator[FetchResult]:
+    """
+    Lädt `urls` mit `concurrency` Workern und liefert `FetchResult`s in
+    Fertigstellungs‑Reihenfolge; pro Host regelt `RATE_LIMITER` Rate und
+    Parallelität (höchstens `per_host`). Bodies werden gestreamt (siehe
+    `fetch_stream`); abgebrochene Downloads kommen mit text=None.
+
+    Die URLs laufen über eine begrenzte Queue, und jeder Worker holt die
+    nächste erst, wenn er sein Ergebnis abgeben konnte: holt der Aufrufer
+    nichts mehr ab, ruht auch der Download (Backpressure). `urls` wird erst
+    nach Bedarf gelesen.
+    """
+    todo: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    done: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    finished = object()
+
+    async def feed() -> None:
+        for url in urls:
+            await todo.put(url)
+        for _ in range(concurrency):
+            await todo.put(finished)
+
+    async def worker() -> None:
+        while (url := await todo.get()) is not finished:
+            try:
+                text = await _afetch_one(client, url, timeout, stop_when, max_bytes,
+                                         per_host=per_host)
+                await done.put(FetchResult(url, text, None))
+            except Exception as exc:
+                await done.put(FetchResult(url, None, exc))
+        await done.put(finished)
+
+    limits = httpx.Limits(max_connections=concurrency,
+                          max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits,
+                                 follow_redirects=True) as client:
+        tasks = [asyncio.create_task(feed())]
+        tasks += [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            running = concurrency
+            while running:
+                res = await done.get()
+                if res is finished:
+                    running -= 1
+                    continue
+                yield res
+            await tasks[0]  # Fehler beim Lesen von `urls` weiterreichen
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fetch_many(urls: Iterable[str],
+               concurrency: int = MAX_CONCURRENCY,
+               per_host: int = PER_HOST_CONCURRENCY,
+               timeout: float = TIMEOUT,
+               stop_when: StopWhen | None = None,
+               max_bytes: int = MAX_BODY_BYTES) -> Iterator[FetchResult]:
+    """
+    Synchrone Fassade um `afetch_many()` für die (synchronen) Crawler.
+    Die Event‑Loop läuft in einem Hintergrund‑Thread; Ergebnisse kommen über
+    eine begrenzte Queue, sobald sie fertig sind – ist sie voll, stehen auch
+    die Worker von `afetch_many()` still. `urls` wird erst im Loop‑Thread
+    nach Bedarf gelesen. Bricht der Aufrufer die Iteration ab, werden offene
+    Requests abgebrochen.
+    """
+    out: queue.Queue = queue.Queue(maxsize=concurrency)
+    stop = threading.Event()
+    done = object()
+
+    def put(item: Any) -> None:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    async def produce() -> None:
+        try:
+            async for res in afetch_many(urls, concurrency, per_host, timeout,
+                                         stop_when, max_bytes):
+                await asyncio.to_thread(put, res)
+                if stop.is_set():
+                    break
+        finally:
+            put(done)
+
+    # Kontext (u. a. CURRENT_SOURCE für die Metriken) in den Loop‑Thread mitnehmen
+    ctx = contextvars.copy_context()
+    thread = threading.Thread(target=ctx.run, args=(asyncio.run, produce()), daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = out.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+# ---------------------------------------------------------------------------#
+# Gemeinsame Download/Parse‑Schleife der crawl_*‑Funktionen                  #
+# ---------------------------------------------------------------------------#
+
+PARSE_TIMEOUT = 30.0  # Sekunden pro Dokument im Parser‑Pool
+PARSE_QUEUE = 32      # max. Dokumente, die gleichzeitig auf einen Parser warten
+
+
+def crawl_links(source: str,
+                links: List[tuple[str, str]],
+                parse: Callable[[str, str, str], Dict[str, Any] | None],
+                fetch: Callable[[str], str | None] = fetch_html,
+                sleep: float = 0.0,
+                concurrency: int = 0,
+                per_host: int = PER_HOST_CONCURRENCY,
+                stop_when: StopWhen | None = None,
+                state: CrawlState | None = None,
+                parse_pool: Executor | None = None,
+                parse_timeout: float = PARSE_TIMEOUT,
+                parse_queue: int = PARSE_QUEUE,
+                sink: Callable[[Dict[str, Any]], None] | None = None,
+                journal: CrawlJournal | None = None,
+                budget: CrawlBudget | None = None,
+                archive: HtmlArchive | None = None) -> List[Dict[str, Any]]:
+    """
+    Lädt alle (url, lastmod)-Links und parst sie mit `parse(html, url, lastmod)`.
+
+    - concurrency=0: sequentiell über `fetch`.
+    - concurrency>0: Async‑Engine (`fetch_many`) mit globalem und per‑Host‑Limit.
+
+    Das Tempo pro Host bestimmt in beiden Modi `RATE_LIMITER`. `sleep` ist
+    nur noch eine Obergrenze: höchstens 1/sleep Requests pro Sekunde.
+
+    `parse` darf None liefern (z. B. Paywall), der Link wird dann übersprungen.
+    Dasselbe gilt, wenn `fetch` None liefert bzw. in der Async‑Engine
+    `stop_when` den Download abbricht – die Seite wird dann gar nicht geparst.
+    Die Datensätze kommen unabhängig vom Modus in Link‑Reihenfolge zurück.
+
+    Mit `state` wird inkrementell gecrawlt: Links mit unverändertem Lastmod
+    werden gar nicht geladen, und zurückgegeben werden nur neue oder inhaltlich
+    geänderte Datensätze.
+
+    Mit `parse_pool` (z. B. ProcessPoolExecutor) laufen Download und Parsing
+    entkoppelt: der Fetcher lädt nur Bytes, die Worker parsen auf allen Kernen.
+    Höchstens `parse_queue` Dokumente warten gleichzeitig auf einen Worker;
+    ein Dokument, das länger als `parse_timeout` Sekunden braucht, wird verworfen.
+
+    Mit `sink` (z. B. `SnapshotWriter.write`) geht jeder Datensatz sofort nach
+    dem Parsen dorthin, in Fertigstellungs‑Reihenfolge; nichts wird im
+    Speicher gesammelt und die Rückgabe bleibt leer.
+
+    Mit `journal` (crawl_all --resume) werden bereits erledigte Links
+    übersprungen und jede fertig bearbeitete Seite sofort vermerkt; Fetch‑ und
+    Parse‑Fehler werden nicht vermerkt und beim Fortsetzen erneut versucht.
+
+    Mit `budget` (crawl_all --budget) werden die Links nach erwartetem Nutzen
+    sortiert geladen, auch mit `concurrency` (die Worker holen sie der Reihe
+    nach). Ist die Deadline erreicht, wird kein Link mehr angefangen, die
+    Schleife endet nach dem aktuellen Dokument, offene Requests werden
+    verworfen und die übrigen Links im Budget als übersprungen vermerkt.
+
+    Mit `archive` landet jedes geladene HTML vor dem Parsen im HTML‑Archiv
+    (Neuauswertung ohne Netz über scripts/reextract.py).
+    """
+    token = CURRENT_SOURCE.set(source)  # Metriken aus fetch_* landen bei dieser Quelle
+    try:
+        if journal is not None:
+            pending = [(url, lm) for url, lm in links if not journal.done(source, url)]
+            if len(pending) < len(links):
+                print(f"[{source}] {len(links) - len(pending)} Links laut Journal bereits erledigt")
+            links = pending
+
+        if state is not None:
+            fresh = [(url, lm) for url, lm in links if state.needs_fetch(url, lm)]
+            state.skip(source, len(links) - len(fresh))
+            print(f"[{source}] {len(links) - len(fresh)} unveränderte Links übersprungen")
+            links = fresh
+
+        if budget is not None:
+            links = budget.order(source, links, crawl_now())
+
+        hosts = {urlsplit(url).netloc for url, _ in links}
+        if sleep:
+            for host in hosts:
+                RATE_LIMITER.configure(host, max_rate=1.0 / sleep)
+
+        lastmods = dict(links)
+        position = {url: pos for pos, (url, _) in enumerate(links)}
+
+        urls: Iterable[str] = lastmods
+        if budget is not None:
+            # Links werden erst nach Bedarf in Score‑Reihenfolge nachgeschoben
+            # (auch in die Worker‑Queue von `fetch_many`) – nach Ablauf keine mehr
+            urls = takewhile(lambda _: not budget.expired, urls)
+        if concurrency:
+            results: Iterable[FetchResult] = fetch_many(
+                urls, concurrency=concurrency, per_host=per_host, stop_when=stop_when
+            )
+        else:
+            results = (_fetch_sequential(fetch, url) for url in urls)
+        results = _log_progress(source, results, len(lastmods))
+        if archive is not None:
+            results = _archive_pages(archive, source, results, lastmods)
+
+        if parse_pool is not None:
+            outcomes = _parse_pooled(parse_pool, parse, results, lastmods,
+                                     parse_timeout, parse_queue)
+        else:
+            outcomes = _parse_inline(parse, results, lastmods)
+
+        records: list[tuple[int, Dict[str, Any]]] = []
+        handled: set[str] = set()
+        for url, parsed, error in outcomes:
+            handled.add(url)
+            if budget is not None and budget.expired and len(handled) < len(lastmods):
+                outcomes.close()  # offene Downloads/Parser verwerfen
+                results.close()
+            try:
+                if error is not None:
+                    raise error
+                if state is not None and state.delta(url, parsed) == "unchanged":
+                    state.record(source, url, lastmods[url], parsed)
+                    METRICS.add("records_unchanged")
+                    if journal is not None:
+                        journal.mark(source, url, None)
+                    continue
+                if parsed is None:
+                    if state is not None:
+                        state.record(source, url, lastmods[url], parsed)
+                    METRICS.add("records_dropped")
+                    if journal is not None:
+                        journal.mark(source, url, None)
+                    continue
+                if sink is not None:
+                    sink(parsed)
+                else:
+                    records.append((position[url], parsed))
+                if state is not None:
+                    # erst nach dem Sink: scheitert er, gilt die Seite beim nächsten Lauf als neu
+                    state.record(source, url, lastmods[url], parsed)
+                if journal is not None:
+                    journal.mark(source, url, parsed)  # erst nach dem Sink: lieber doppelt als verloren
+                METRICS.add("records_emitted")
+            except Exception as exc:
+                METRICS.add("records_failed")
+                print(f"[{source}] ✖ Fehler bei {url}: {exc}", file=sys.stderr)
+
+        if budget is not None and len(handled) < len(lastmods):
+            left = [(url, lm) for url, lm in lastmods.items() if url not in handled]
+            budget.skip(source, left, crawl_now())
+            METRICS.add("links_skipped", len(left))
+            print(f"[{source}] ⏱ Zeitbudget erschöpft – {len(left)} Links übersprungen")
+
+        for host, (rate, parallel, latency) in sorted(RATE_LIMITER.snapshot().items()):
+            if host in hosts:
+                print(f"[{source}] Tempo {host}: {rate:.1f} req/s, {parallel} parallel, "
+                      f"Ø {latency * 1000:.0f} ms")
+
+        records.sort(key=lambda t: t[0])
+        return [rec for _, rec in records]
+    finally:
+        CURRENT_SOURCE.reset(token)
+
+
+ParseOutcome = tuple[str, Dict[str, Any] | None, Exception | None]
+
+
+def _log_progress(source: str, results: Iterable[FetchResult], total: int) -> Iterator[FetchResult]:
+    for idx, res in enumerate(results, 1):
+        print(f"[{source}] [{idx}/{total}] {res.url}")
+        yield res
+
+
+def _archive_pages(archive: HtmlArchive, source: str, results: Iterable[FetchResult],
+                   lastmods: Dict[str, str]) -> Iterator[FetchResult]:
+    for res in results:
+        if res.text is not None:
+            try:
+                archive.add(source, res.url, res.text, lastmods.get(res.url))
+            except (OSError, sqlite3.Error) as exc:  # Archiv ist Beiwerk, der Crawl läuft weiter
+                print(f"[{source}] ⚠ Archivieren fehlgeschlagen ({res.url}): {exc}", file=sys.stderr)
+        yield res
+
+
+def _parse_inline(parse: Callable[[str, str, str], Dict[str, Any] | None],
+                  results: Iterable[FetchResult],
+                  lastmods: Dict[str, str]) -> Iterator[ParseOutcome]:
+    for url, html, error in results:
+        if error is not None or html is None:
+            yield url, None, error
+            continue
+        started = time.perf_counter()
+        try:
+            parsed = parse(html, url, lastmods[url])
+        except Exception as exc:
+            yield url, None, exc
+            continue
+        finally:
+            METRICS.parsed(time.perf_counter() - started)
+        yield url, parsed, None
+
+
+def _parse_pooled(pool: Executor,
+                  parse: Callable[[str, str, str], Dict[str, Any] | None],
+                  results: Iterable[FetchResult],
+                  lastmods: Dict[str, str],
+                  timeout: float,
+                  max_pending: int) -> Iterator[ParseOutcome]:
+    """
+    Reicht geladene Dokumente an den Pool weiter. Ist die Warteschlange voll,
+    wird erst auf fertige Worker gewartet; solange werden keine Ergebnisse
+    von `fetch_many` abgeholt, und dessen Worker laden nichts Neues
+    (höchstens gut 3 × concurrency Dokumente Vorlauf).
+    """
+    pending: Dict[Future, tuple[str, float]] = {}
+
+    def drain() -> Iterator[ParseOutcome]:
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            # Der Worker reagiert nicht auf SIGALRM (z. B. hängt in C‑Code):
+            # ältestes Dokument aufgeben, damit der Lauf weitergeht.
+            fut = min(pending, key=lambda f: pending[f][1])
+            if time.monotonic() - pending[fut][1] > 3 * timeout:
+                url, _ = pending.pop(fut)
+                fut.cancel()
+                yield url, None, TimeoutError(f"Parser antwortet nicht (> {3 * timeout:.0f}s)")
+            return
+        for fut in done:
+            url, _ = pending.pop(fut)
+            try:
+                parsed, secs = fut.result()
+            except Exception as exc:
+                yield url, None, exc
+                continue
+            METRICS.parsed(secs)
+            yield url, parsed, None
+
+    try:
+        for url, html, error in results:
+            if error is not None or html is None:
+                yield url, None, error
+                continue
+            fut = pool.submit(_parse_with_timeout, parse, html, url, lastmods[url], timeout)
+            pending[fut] = (url, time.monotonic())
+            while len(pending) >= max_pending:
+                yield from drain()
+        while pending:
+            yield from drain()
+    finally:
+        for fut in pending:  # Abbruch durch den Aufrufer (z. B. Zeitbudget)
+            fut.cancel()
+
+
+def _parse_with_timeout(parse: Callable[[str, str, str], Dict[str, Any] | None],
+                        html: str, url: str, lastmod: str,
+                        timeout: float) -> tuple[Dict[str, Any] | None, float]:
+    """
+    Läuft im Worker‑Prozess; bricht per SIGALRM nach `timeout` Sekunden ab.
+    Liefert (Datensatz, Parse‑Sekunden) – die Zeit geht in die Metriken.
+    """
+    started = time.perf_counter()
+    if not timeout or not hasattr(signal, "setitimer"):
+        return parse(html, url, lastmod), time.perf_counter() - started
+
+    def on_alarm(signum: int, frame: Any) -> None:
+        raise TimeoutError(f"Parsen dauerte länger als {timeout:.0f}s")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parse(html, url, lastmod), time.perf_counter() - started
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _fetch_sequential(fetch: Callable[[str], str | None], url: str) -> FetchResult:
+    try:
+        return FetchResult(url, fetch(url), None)
+    except Exception as exc:
+        return FetchResult(url, None, exc)
 
 # ---------------------------------------------------------------------------#
 # Text‑Helfer                                                                #
@@ -88,6 +1192,85 @@ def extract_article_text(article_tag: Tag) -> str:
     paragraphs = [p.get_text(" ", strip=True) for p in article_tag.find_all("p")]
     return clean_text(" ".join(paragraphs))
 
+# ---------------------------------------------------------------------------#
+# Extraktions‑Engine: ein lxml‑Parse pro Seite, deklarative Selektoren       #
+# ---------------------------------------------------------------------------#
+
+class ArticleSelectors(NamedTuple):
+    """
+    Deklarative Beschreibung, wo eine Quelle Titel, Autor und Text ablegt.
+
+    containers: Tag‑Namen ("article") oder Klassen (".entry-content"); alle <p>
+                darin bilden den Text – verschachtelte Treffer zählen nur einmal.
+    first_container_only: nur den ersten Treffer auswerten (wie soup.find()).
+    title_meta / author_meta: <meta property|name=…> in Prioritätsreihenfolge;
+                Titel fällt auf <title> zurück.
+    paragraph_filter: optionales Prädikat, um Absätze zu verwerfen.
+    """
+    containers: tuple[str, ...] = ("article",)
+    first_container_only: bool = False
+    title_meta: tuple[str, ...] = ("og:title",)
+    author_meta: tuple[str, ...] = ("author",)
+    paragraph_filter: Callable[[str], bool] | None = None
+
+
+def _selector_xpath(selector: str) -> str:
+    if selector.startswith("."):
+        return ("//*[contains(concat(' ', normalize-space(@class), ' '), "
+                f"' {selector[1:]} ')]")
+    return f"//{selector}"
+
+
+@lru_cache(maxsize=None)
+def _compile_selectors(sel: ArticleSelectors) -> tuple[etree.XPath, etree.XPath, etree.XPath]:
+    containers = " | ".join(_selector_xpath(c) for c in sel.containers)
+    if sel.first_container_only:
+        containers = f"({containers})[1]"
+    # Alle <meta> in einem Durchlauf; die Priorität regelt _first_meta()
+    metas = "//meta[@property or @name]"
+    return etree.XPath(metas), etree.XPath("//title"), etree.XPath(f"({containers})//p")
+
+
+def _first_meta(metas: Dict[str, str], names: tuple[str, ...]) -> str:
+    return next((metas[n] for n in names if metas.get(n)), "")
+
+
+def extract_article(html: str | bytes, selectors: ArticleSelectors) -> Dict[str, str]:
+    """
+    Parst `html` genau einmal mit lxml und liefert {"title", "author", "text"}.
+    Ersetzt die mehrfachen find/select/find_all‑Durchläufe über BeautifulSoup.
+    """
+    try:
+        root = lxml.html.fromstring(html)
+    except ValueError:  # str mit <?xml encoding=…?>‑Deklaration
+        root = lxml.html.fromstring(html.encode("utf-8") if isinstance(html, str) else html)
+    except etree.ParserError:  # leeres Dokument
+        return {"title": "", "author": "", "text": ""}
+
+    meta_xp, title_xp, para_xp = _compile_selectors(selectors)
+
+    metas: Dict[str, str] = {}
+    for el in meta_xp(root):
+        key = el.get("property") or el.get("name")
+        metas.setdefault(key, el.get("content") or "")
+
+    title = _first_meta(metas, selectors.title_meta)
+    if not title:
+        titles = title_xp(root)
+        title = titles[0].text_content() if titles else ""
+
+    paragraphs = []
+    for p in para_xp(root):
+        para = " ".join(t.strip() for t in p.itertext() if t.strip())
+        if selectors.paragraph_filter is None or selectors.paragraph_filter(para):
+            paragraphs.append(para)
+
+    return {
+        "title": clean_text(title),
+        "author": _first_meta(metas, selectors.author_meta).strip(),
+        "text": clean_text("\n".join(paragraphs)),
+    }
+
 # ---------------------------------------------------------------------------#
 # Bulk‑JSON speichern                                                        #
 # ---------------------------------------------------------------------------#
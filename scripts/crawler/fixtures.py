@@ -0,0 +1,193 @@
+"""
+Record & Replay für Offline‑Benchmarks der Crawler.
+
+Aufnahme: Ist `base.RECORD_ARCHIVE` gesetzt (crawl_all --record DIR), legt
+jeder Fetch – Sitemaps wie Artikelseiten – den (entpackten) Body im Archiv ab:
+
+  DIR/meta.json          – Aufnahmezeitpunkt und Zeitfenster (days_back)
+  DIR/index.jsonl        – eine Zeile pro Response (URL, Status, Content‑Type, Datei)
+  DIR/bodies/<sha1>.bin  – Bodies
+
+Wiedergabe: `ReplayServer` liefert die Aufnahme über einen lokalen
+HTTP‑Server aus, optional mit künstlicher Latenz und Fehlerinjektion. Die
+Crawler merken davon nichts – `base.REPLAY_URL` leitet nur die Requests um,
+URLs, Cache‑Schlüssel und Rate‑Limits bleiben die der Original‑Hosts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "fixtures"
+
+
+class Fixture(NamedTuple):
+    url: str
+    status: int
+    content_type: str
+    encoding: str | None
+    file: str
+
+
+class FixtureArchive:
+    """Verzeichnis mit aufgezeichneten Responses (thread‑sicher beschreibbar)."""
+
+    def __init__(self, root: Path, days_back: int | None = None) -> None:
+        self.root = Path(root)
+        self.bodies = self.root / "bodies"
+        self.bodies.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: Dict[str, Fixture] = {}
+
+        meta_fp = self.root / "meta.json"
+        if meta_fp.exists():
+            self.meta: Dict[str, Any] = json.loads(meta_fp.read_text(encoding="utf-8"))
+        else:
+            self.meta = {"recorded_at": datetime.now(timezone.utc).isoformat(),
+                         "days_back": days_back}
+            meta_fp.write_text(json.dumps(self.meta), encoding="utf-8")
+
+        index_fp = self.root / "index.jsonl"
+        if index_fp.exists():
+            for line in index_fp.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    fx = Fixture(**json.loads(line))
+                    self._index[fx.url] = fx
+
+    @property
+    def recorded_at(self) -> datetime:
+        return datetime.fromisoformat(self.meta["recorded_at"])
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # -------------------------------------------------------------- Aufnahme
+    def add(self, url: str, body: bytes, encoding: str | None,
+            content_type: str = "", status: int = 200) -> None:
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest() + ".bin"
+        fx = Fixture(url, status, content_type, encoding, name)
+        with self._lock:
+            (self.bodies / name).write_bytes(body)
+            with open(self.root / "index.jsonl", "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(fx._asdict()) + "\n")
+            self._index[url] = fx
+
+    # ------------------------------------------------------------ Wiedergabe
+    def lookup(self, url: str) -> tuple[Fixture, bytes] | None:
+        fx = self._index.get(url)
+        if fx is None:
+            return None
+        return fx, (self.bodies / fx.file).read_bytes()
+
+
+class ReplayStats:
+    """Zähler pro Original‑Host: Requests, ausgelieferte Bytes, injizierte Fehler, 404."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.bytes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.missing: Counter = Counter()
+
+    def count(self, host: str, size: int = 0, error: bool = False, missing: bool = False) -> None:
+        with self._lock:
+            self.requests[host] += 1
+            self.bytes[host] += size
+            self.errors[host] += error
+            self.missing[host] += missing
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Lokaler HTTP‑Server über einem `FixtureArchive`.
+
+    - latency/jitter: Sekunden Verzögerung pro Response (gleichverteilt ± jitter)
+    - error_rate: Anteil der Requests, die mit `error_status` beantwortet werden
+      (bei 429 mit `Retry-After: 1`)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, archive: FixtureArchive,
+                 port: int = 0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_status: int = 503,
+                 seed: int | None = None) -> None:
+        super().__init__(("127.0.0.1", port), _ReplayHandler)
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self.stats = ReplayStats()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        srv = self.server
+        url = parse_qs(urlsplit(self.path).query).get("url", [""])[0]
+        host = urlsplit(url).netloc
+
+        delay = srv.latency + srv.rng.uniform(-srv.jitter, srv.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if srv.error_rate and srv.rng.random() < srv.error_rate:
+            srv.stats.count(host, error=True)
+            self.send_response(srv.error_status)
+            if srv.error_status == 429:
+                self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        hit = srv.archive.lookup(url)
+        if hit is None:
+            srv.stats.count(host, missing=True)
+            self.send_error(404, "nicht aufgezeichnet")
+            return
+
+        fx, body = hit
+        srv.stats.count(host, len(body))
+        self.send_response(fx.status)
+        content_type = fx.content_type or "application/octet-stream"
+        if fx.encoding and "charset" not in content_type:
+            content_type += f"; charset={fx.encoding}"
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
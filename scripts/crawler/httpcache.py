@@ -0,0 +1,143 @@
+"""
+Persistenter HTTP‑Cache für `fetch_html()` und die Async‑Engine in base.py.
+
+Pro URL liegen zwei Dateien im Cache‑Verzeichnis:
+  <sha1>.body  – Response‑Body (.gz‑Sitemaps bereits entpackt)
+  <sha1>.json  – Metadaten (URL, ETag, Last‑Modified, Encoding, Zeitstempel)
+
+Beim nächsten Abruf werden `If-None-Match` / `If-Modified-Since` mitgeschickt;
+ein 304 liefert den gespeicherten Body ohne erneuten Download. Für Sitemap‑
+Indizes kann zusätzlich eine TTL angegeben werden, innerhalb derer gar kein
+Request nötig ist. Überschreitet der Cache `max_bytes`, werden die am längsten
+nicht genutzten Einträge (mtime der Metadatei) gelöscht.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, NamedTuple
+
+
+class CacheEntry(NamedTuple):
+    url: str
+    body: bytes
+    encoding: str | None
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class HttpCache:
+    """Dateibasierter Cache mit Revalidierung, TTL und größenbasierter Eviction."""
+
+    def __init__(self, root: Path, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None  # wird beim ersten store() ermittelt
+
+    # ------------------------------------------------------------------ Pfade
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json", self.root / f"{key}.body"
+
+    # ----------------------------------------------------------------- Lesen
+    def lookup(self, url: str) -> CacheEntry | None:
+        meta_fp, body_fp = self._paths(url)
+        try:
+            meta = json.loads(meta_fp.read_text(encoding="utf-8"))
+            body = body_fp.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        os.utime(meta_fp)  # LRU‑Zeitstempel für die Eviction
+        return CacheEntry(url, body, meta.get("encoding"), meta.get("etag"),
+                          meta.get("last_modified"), meta.get("stored_at", 0.0))
+
+    @staticmethod
+    def validators(entry: CacheEntry | None) -> Dict[str, str]:
+        """Header für einen Conditional GET gegen einen vorhandenen Eintrag."""
+        headers: Dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # -------------------------------------------------------------- Schreiben
+    def store(self, url: str, headers: Mapping[str, str], body: bytes,
+              encoding: str | None, keep_without_validators: bool = False) -> None:
+        """
+        Legt einen Response ab. Ohne ETag/Last‑Modified lohnt sich das nur, wenn
+        der Eintrag über eine TTL genutzt werden soll (`keep_without_validators`).
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified or keep_without_validators):
+            return
+
+        meta_fp, body_fp = self._paths(url)
+        old_size = body_fp.stat().st_size if body_fp.exists() else 0
+        meta: Dict[str, Any] = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": encoding,
+            "stored_at": time.time(),
+        }
+        _atomic_write(body_fp, body)
+        _atomic_write(meta_fp, json.dumps(meta).encode("utf-8"))
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(body) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def refresh(self, url: str) -> None:
+        """Setzt nach einem 304 den TTL‑Zeitstempel des Eintrags zurück."""
+        meta_fp, _ = self._paths(url)
+        try:
+            meta = json.loads(meta_fp.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        meta["stored_at"] = time.time()
+        _atomic_write(meta_fp, json.dumps(meta).encode("utf-8"))
+
+    # --------------------------------------------------------------- Eviction
+    def _scan_size(self) -> int:
+        return sum(fp.stat().st_size for fp in self.root.glob("*.body"))
+
+    def _evict(self) -> None:
+        """Löscht LRU‑Einträge, bis der Cache auf 90 % von max_bytes geschrumpft ist."""
+        target = int(self.max_bytes * 0.9)
+        metas = sorted(self.root.glob("*.json"), key=lambda fp: fp.stat().st_mtime)
+        for meta_fp in metas:
+            if self._size is None or self._size <= target:
+                break
+            body_fp = meta_fp.with_suffix(".body")
+            size = body_fp.stat().st_size if body_fp.exists() else 0
+            meta_fp.unlink(missing_ok=True)
+            body_fp.unlink(missing_ok=True)
+            self._size -= size
+
+
+def _atomic_write(fp: Path, data: bytes) -> None:
+    tmp = fp.with_name(f"{fp.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, fp)
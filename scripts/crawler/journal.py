@@ -0,0 +1,135 @@
+"""
+Checkpoint‑Journal für `crawl_all --resume`.
+
+Während eines Laufs hält das Journal pro Quelle fest, welche Artikel‑URLs
+fertig bearbeitet sind, samt dem geparsten Datensatz (zlib‑komprimiertes JSON;
+None für verworfene Seiten wie Paywall). Abgeschlossene Quellen werden
+zusätzlich markiert. Jeder Eintrag wird sofort committet – bricht der Lauf ab
+(Strg+C, Absturz, Netzwerk weg), ist höchstens die gerade laufende Seite
+verloren.
+
+Ablauf:
+1. `crawl_all` öffnet das Journal; ohne --resume wird es geleert
+2. `crawl_links()` überspringt URLs, für die `done()` True liefert, und ruft
+   nach jedem Parse‑Ergebnis `mark()` auf (Fehler werden nicht vermerkt und
+   beim Fortsetzen erneut versucht)
+3. Beim Fortsetzen spielt `crawl_all` die Datensätze aus `records()` zuerst in
+   den neuen Snapshot, abgeschlossene Quellen werden gar nicht mehr gecrawlt
+4. Nach einem fehlerfreien Lauf wird das Journal geleert
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Set
+
+JOURNAL_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "state" / "crawl_journal.sqlite"
+
+
+class CrawlJournal:
+    """Thread‑sicheres Journal eines (unterbrochenen) Crawl‑Laufs."""
+
+    def __init__(self, path: Path = JOURNAL_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """CREATE TABLE IF NOT EXISTS pages (
+                   source   TEXT NOT NULL,
+                   url      TEXT NOT NULL,
+                   done_at  TEXT,
+                   record_z BLOB,
+                   PRIMARY KEY (source, url)
+               );
+               CREATE TABLE IF NOT EXISTS sources (
+                   source      TEXT PRIMARY KEY,
+                   finished_at TEXT
+               );
+               CREATE TABLE IF NOT EXISTS meta (
+                   key   TEXT PRIMARY KEY,
+                   value TEXT
+               );"""
+        )
+        self._done: Dict[str, Set[str]] = {}
+        for source, url in self._db.execute("SELECT source, url FROM pages"):
+            self._done.setdefault(source, set()).add(url)
+
+    # ---------------------------------------------------------------- Laufdaten
+    @property
+    def meta(self) -> Dict[str, Any]:
+        with self._lock:
+            return {k: json.loads(v) for k, v in self._db.execute("SELECT key, value FROM meta")}
+
+    def start(self, **meta: Any) -> None:
+        """Beginnt einen neuen Lauf: alte Einträge weg, Laufparameter merken."""
+        with self._lock:
+            self._db.executescript("DELETE FROM pages; DELETE FROM sources; DELETE FROM meta;")
+            meta.setdefault("started_at", datetime.now(timezone.utc).isoformat())
+            self._db.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                 [(k, json.dumps(v)) for k, v in meta.items()])
+            self._db.commit()
+            self._done.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.executescript("DELETE FROM pages; DELETE FROM sources; DELETE FROM meta;")
+            self._db.commit()
+            self._done.clear()
+
+    # ------------------------------------------------------------------- Seiten
+    def done(self, source: str, url: str) -> bool:
+        with self._lock:
+            return url in self._done.get(source, ())
+
+    def mark(self, source: str, url: str, record: Dict[str, Any] | None) -> None:
+        """Seite als erledigt vermerken; `record=None` für verworfene Seiten."""
+        blob = None if record is None else zlib.compress(
+            json.dumps(record, ensure_ascii=False).encode("utf-8"), 6)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (source, url, done_at, record_z) VALUES (?, ?, ?, ?)",
+                (source, url, datetime.now(timezone.utc).isoformat(), blob),
+            )
+            self._db.commit()
+            self._done.setdefault(source, set()).add(url)
+
+    def records(self, source: str) -> Iterator[Dict[str, Any]]:
+        """Bereits geparste Datensätze einer Quelle (ohne verworfene Seiten)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT record_z FROM pages WHERE source = ? AND record_z IS NOT NULL "
+                "ORDER BY done_at", (source,)
+            ).fetchall()
+        for (blob,) in rows:
+            yield json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    # ------------------------------------------------------------------ Quellen
+    def finish(self, source: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sources (source, finished_at) VALUES (?, ?)",
+                (source, datetime.now(timezone.utc).isoformat()),
+            )
+            self._db.commit()
+
+    def finished(self, source: str) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM sources WHERE source = ?", (source,)
+            ).fetchone() is not None
+
+    def pages(self, source: str) -> int:
+        with self._lock:
+            return len(self._done.get(source, ()))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,194 @@
+"""
+Crawl‑Metriken pro Quelle: Requests, Statuscodes, Retries, Bytes,
+Fetch‑ und Parse‑Latenz, ausgegebene und verworfene Datensätze.
+
+Welche Quelle gerade arbeitet, steht in der ContextVar `CURRENT_SOURCE`
+(gesetzt von `crawl_all._run_source()` bzw. `crawl_links()`); sie wandert mit
+in Threads der Async‑Engine und in asyncio‑Tasks. `fetch_html()` & Co. müssen
+die Quelle daher nicht kennen.
+
+Am Ende von `crawl_all` schreibt `METRICS` einen JSON‑Report und eine
+Prometheus‑Textdatei (für den node_exporter‑Textfile‑Collector).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+CURRENT_SOURCE: ContextVar[str] = ContextVar("crawl_source", default="unknown")
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROM_PREFIX = "newsletter_crawl"
+
+# Zähler mit Beschreibung (Prometheus‑HELP)
+COUNTERS = {
+    "requests": "HTTP-Requests (inkl. 304 und Fehlern)",
+    "retries": "wiederholte Requests nach 429/5xx/Verbindungsfehlern",
+    "bytes": "empfangene Body-Bytes (entpackt)",
+    "cache_hits": "Antworten direkt aus dem HTTP-Cache (TTL)",
+    "records_emitted": "ausgegebene Datensätze",
+    "records_dropped": "verworfene Seiten (Paywall, Parser liefert None, abgebrochen)",
+    "records_failed": "Fetch- oder Parse-Fehler",
+    "records_unchanged": "Datensätze ohne inhaltliche Änderung (inkrementell)",
+    "links_skipped": "wegen Zeitbudget nicht geladene Links",
+}
+
+
+class Histogram:
+    """Kumulatives Histogramm mit festen Grenzen (wie Prometheus)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # letzter Eintrag: +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Obere Bucket‑Grenze, unter der `q` der Werte liegen (grobe Schätzung)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {str(b): n for b, n in zip(self.bounds + ("+Inf",), self.counts)},
+        }
+
+
+class SourceMetrics:
+    def __init__(self) -> None:
+        self.counters: Counter = Counter()
+        self.status: Counter = Counter()
+        self.fetch_latency = Histogram()
+        self.parse_latency = Histogram()
+
+
+class CrawlMetrics:
+    """Thread‑sichere Metrik‑Sammlung für einen Crawl‑Lauf."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sources: Dict[str, SourceMetrics] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sources.clear()
+
+    def _get(self, source: str | None) -> SourceMetrics:
+        source = source or CURRENT_SOURCE.get()
+        m = self._sources.get(source)
+        if m is None:
+            m = self._sources[source] = SourceMetrics()
+        return m
+
+    # ------------------------------------------------------------- Erfassen
+    def add(self, counter: str, n: int = 1, source: str | None = None) -> None:
+        with self._lock:
+            self._get(source).counters[counter] += n
+
+    def response(self, status: int | None, latency: float, source: str | None = None) -> None:
+        """Ein Request‑Ergebnis; status=None steht für einen Verbindungsfehler."""
+        with self._lock:
+            m = self._get(source)
+            m.counters["requests"] += 1
+            m.status["error" if status is None else str(status)] += 1
+            m.fetch_latency.observe(latency)
+
+    def parsed(self, latency: float, source: str | None = None) -> None:
+        with self._lock:
+            self._get(source).parse_latency.observe(latency)
+
+    # ------------------------------------------------------------- Ausgabe
+    def report(self, extra: Dict[str, Dict[str, Any]] | None = None) -> Dict[str, Any]:
+        """Alle Quellen als Dict; `extra` ergänzt Felder pro Quelle (z. B. Wall‑Time)."""
+        with self._lock:
+            out: Dict[str, Any] = {}
+            for name in sorted(set(self._sources) | set(extra or {})):
+                m = self._sources.get(name) or SourceMetrics()
+                out[name] = {
+                    **{c: m.counters.get(c, 0) for c in COUNTERS},
+                    "status": dict(sorted(m.status.items())),
+                    "fetch_latency_s": m.fetch_latency.as_dict(),
+                    "parse_latency_s": m.parse_latency.as_dict(),
+                    **(extra or {}).get(name, {}),
+                }
+            return out
+
+    def write_json(self, path: Path, extra: Dict[str, Dict[str, Any]] | None = None,
+                   run: Dict[str, Any] | None = None) -> Path:
+        payload = {"run": run or {}, "sources": self.report(extra)}
+        _atomic_write(path, json.dumps(payload, ensure_ascii=False, indent=2))
+        return path
+
+    def write_prometheus(self, path: Path,
+                         extra: Dict[str, Dict[str, float]] | None = None) -> Path:
+        """Textformat 0.0.4; `extra` wird als Gauges `<prefix>_<name>` je Quelle ausgegeben."""
+        lines: List[str] = []
+        with self._lock:
+            sources = sorted(self._sources.items())
+            for counter, help_text in COUNTERS.items():
+                metric = f"{PROM_PREFIX}_{counter}_total"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                lines += [f'{metric}{{source="{name}"}} {m.counters.get(counter, 0)}'
+                          for name, m in sources]
+
+            metric = f"{PROM_PREFIX}_responses_total"
+            lines += [f"# HELP {metric} Responses je Statuscode", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{source="{name}",status="{status}"}} {n}'
+                      for name, m in sources for status, n in sorted(m.status.items())]
+
+            for attr, help_text in (("fetch_latency", "Zeit bis zu den Response-Headern"),
+                                    ("parse_latency", "Parse-Zeit pro Dokument")):
+                metric = f"{PROM_PREFIX}_{attr}_seconds"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for name, m in sources:
+                    hist: Histogram = getattr(m, attr)
+                    cumulative = 0
+                    for bound, n in zip(hist.bounds + (float("inf"),), hist.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{metric}_bucket{{source="{name}",le="{le}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{source="{name}"}} {hist.sum:.6f}')
+                    lines.append(f'{metric}_count{{source="{name}"}} {hist.count}')
+
+        for key in sorted({k for values in (extra or {}).values() for k in values}):
+            metric = f"{PROM_PREFIX}_{key}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines += [f'{metric}{{source="{name}"}} {values[key]}'
+                      for name, values in sorted((extra or {}).items()) if key in values]
+
+        _atomic_write(path, "\n".join(lines) + "\n")
+        return path
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+METRICS = CrawlMetrics()
@@ -8,76 +8,60 @@ fetch_html(), clean_text(), save_bulk_json().
 """
 
 from __future__ import annotations
-import sys
-import time
-from datetime import datetime, timedelta, timezone
-from pathlib import Path
+from datetime import datetime, timezone
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup, Tag
 
-# base importierbar machen
-sys.path.append(str(Path(__file__).resolve().parent))
-from base import fetch_html, clean_text, save_bulk_json
+from scripts.crawler.base import (
+    fetch_html, fetch_bytes, save_bulk_json, crawl_links,
+    collect_sitemap_links, select_sitemap_chunks, SitemapSelection, SITEMAP_INDEX_TTL,
+    discover_links,
+    ArticleSelectors, extract_article,
+)
 
 SOURCE = "netzpolitik"
 SITEMAP_INDEX_URL = "https://netzpolitik.org/sitemap.xml"
+FEED_URL = "https://netzpolitik.org/feed/"
 
 # ---------------------------------------------------------------------------
 # Sitemap-Handling
 # ---------------------------------------------------------------------------
 def extract_article_sitemaps(
-    index_xml: str, max_chunks: int = 5, days_back: int = 7
-) -> list[str]:
+    index_xml: bytes, max_chunks: int | None = None, days_back: int = 7
+) -> SitemapSelection:
     """
-    Sammelt bis zu max_chunks Sitemaps mit 'posttype-post' unabhängig von Sitemap-Lastmod.
+    Sammelt die 'posttype-post'-Sitemaps, die das days_back-Fenster überlappen –
+    per Sitemap-Lastmod oder, falls keiner vorhanden, per Binärsuche.
     """
-    soup = BeautifulSoup(index_xml, "xml")
-    all_sitemaps = [
-        sm.loc.text.strip()
-        for sm in soup.find_all("sitemap")
-        if "sitemap-posttype-post" in sm.loc.text
-    ]
-    # Neueste zuerst, da index meist absteigend gelistet
-    return all_sitemaps[:max_chunks]
+    return select_sitemap_chunks(
+        index_xml, lambda loc: "sitemap-posttype-post" in loc,
+        days_back=days_back, max_chunks=max_chunks, source="netzpolitik",
+    )
 
-def get_recent_article_links(
+def get_sitemap_links(
     days_back: int = 7, limit: int | None = None
 ) -> List[tuple[str, str]]:
     """
     Durchsucht die ausgewählten Sitemaps, liefert Liste von (url, lastmod_iso).
     """
-    idx_xml = fetch_html(SITEMAP_INDEX_URL)
-    sitemap_urls = extract_article_sitemaps(idx_xml, days_back=days_back)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days_back)
-    links: list[tuple[str, str]] = []
+    idx_xml = fetch_bytes(SITEMAP_INDEX_URL, ttl=SITEMAP_INDEX_TTL)
+    selection = extract_article_sitemaps(idx_xml, days_back=days_back)
+    return collect_sitemap_links(selection.chunks, days_back=days_back, limit=limit,
+                                 prefetched=selection.prefetched)
 
-    for sm_url in sitemap_urls:
-        xml = fetch_html(sm_url)
-        soup = BeautifulSoup(xml, "xml")
-        for url_tag in soup.find_all("url"):
-            loc = url_tag.loc.text.strip()
-            last_text = url_tag.lastmod.text
-            try:
-                art_dt = datetime.fromisoformat(last_text.replace("Z", "+00:00"))
-            except ValueError:
-                continue
-            if art_dt >= cutoff:
-                links.append((loc, art_dt.isoformat()))
-        if limit and len(links) >= limit:
-            break
 
-    # Duplikate entfernen, Reihenfolge erhalten
-    seen = set()
-    unique: list[tuple[str, str]] = []
-    for loc, lm in links:
-        if loc not in seen:
-            seen.add(loc)
-            unique.append((loc, lm))
-    return unique[:limit] if limit else unique
+def get_recent_article_links(days_back: int = 7,
+                             limit: int | None = None) -> List[tuple[str, str]]:
+    """(url, published_iso) über den Feed, falls er das Fenster abdeckt, sonst über die Sitemaps."""
+    return discover_links(FEED_URL, lambda: get_sitemap_links(days_back, limit),
+                          days_back=days_back, limit=limit, source="netzpolitik")
 
 # ---------------------------------------------------------------------------
 # Artikel-Fetching & Parsing
 # ---------------------------------------------------------------------------
+SELECTORS = ArticleSelectors(
+    containers=("article", ".entry-content", ".content", ".post-content"),
+)
+
 def fetch_article(url: str) -> str:
     return fetch_html(url)
 
@@ -85,30 +69,14 @@ def parse_article(html: str, url: str, sitemap_lastmod: str) -> Dict[str, Any]:
     """
     Extrahiert Titel, Autor, Text und Metadaten aus dem HTML-Dokument.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    title_tag = soup.find("meta", property="og:title") or soup.find("title")
-    title = clean_text(title_tag.get("content") if title_tag else "")
-
-    published = sitemap_lastmod
-
-    author_tag = soup.find("meta", {"name": "author"})
-    author = author_tag["content"].strip() if author_tag and author_tag.get("content") else ""
-
-    # Suche typische Content-Container
-    paragraphs = []
-    for sel in ("article", ".entry-content", ".content", ".post-content"):
-        for container in soup.select(sel):
-            paragraphs.extend(
-                p.get_text(" ", strip=True) for p in container.find_all("p") if isinstance(p, Tag)
-            )
-    text = clean_text("\n".join(paragraphs))
+    fields = extract_article(html, SELECTORS)
 
     return {
         "url": url,
-        "title": title,
-        "published": published,
-        "author": author,
-        "text": text,
+        "title": fields["title"],
+        "published": sitemap_lastmod,
+        "author": fields["author"],
+        "text": fields["text"],
         "source": SOURCE,
         "crawled_at": datetime.now(timezone.utc).isoformat(),
     }
@@ -117,22 +85,14 @@ def parse_article(html: str, url: str, sitemap_lastmod: str) -> Dict[str, Any]:
 # Haupt-Crawler-Funktion
 # ---------------------------------------------------------------------------
 def crawl_netzpolitik(
-    days_back: int = 7, limit: int = 0, sleep: float = 0.0
+    days_back: int = 7, limit: int = 0, sleep: float = 0.0, **opts
 ) -> List[Dict[str, Any]]:
     print(f"[netzpolitik] Sammle Artikel der letzten {days_back} Tage …")
     links = get_recent_article_links(days_back=days_back, limit=limit or None)
     print(f"[netzpolitik] {len(links)} Links gefunden – starte Parsing")
 
-    records: List[Dict[str, Any]] = []
-    for idx, (loc, lm) in enumerate(links, 1):
-        try:
-            print(f"[netzpolitik] [{idx}/{len(links)}] {loc}")
-            html = fetch_article(loc)
-            records.append(parse_article(html, loc, lm))
-            time.sleep(sleep)
-        except Exception as exc:
-            print(f"[netzpolitik] ✖ Fehler bei {loc}: {exc}")
-    return records
+    return crawl_links("netzpolitik", links, parse_article, fetch=fetch_article,
+                       sleep=sleep, **opts)
 
 if __name__ == "__main__":
     articles = crawl_netzpolitik()
@@ -0,0 +1,264 @@
+"""
+Adaptiver Rate‑Limiter pro Host für alle Fetches in base.py.
+
+Jeder Host bekommt einen Token‑Bucket (Requests pro Sekunde) und ein Limit
+für gleichzeitige Requests. Beides wird AIMD‑artig nachgeregelt:
+
+- additive increase: jede schnelle, fehlerfreie Antwort erhöht Rate und
+  Parallelität ein Stück,
+- multiplicative decrease: 429/503, Serverfehler, Verbindungsfehler oder
+  deutlich langsamere Antworten halbieren beides (höchstens einmal pro
+  Antwortzeit, damit ein Schwall paralleler Fehler nicht auf das Minimum
+  durchschlägt). Ein `Retry-After` sperrt den Host für die angegebene Zeit.
+
+So läuft jeder Host so schnell, wie er es verträgt – ohne feste Pausen.
+Wartende Requests eines Hosts werden in Ankunftsreihenfolge bedient und
+von `release()` bzw. einem Timer zum nächsten fälligen Token geweckt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Deque, Dict
+
+THROTTLE_STATUS = {429, 503}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """`Retry-After` als Sekunden (Zahl oder HTTP‑Datum); None, wenn nicht lesbar."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Waiter(ABC):
+    """Ein wartender Request; `wake()` und `call_later()` dürfen aus jedem Thread kommen."""
+    __slots__ = ("max_inflight", "granted")
+
+    def __init__(self, max_inflight: int | None) -> None:
+        self.max_inflight = max_inflight
+        self.granted = False
+
+    @abstractmethod
+    def wake(self) -> None:
+        """Weckt den Wartenden; er ist jetzt an der Reihe."""
+
+    @abstractmethod
+    def call_later(self, delay: float, fn: Callable[[str], None], host: str) -> None:
+        """Plant `fn(host)` nach `delay` Sekunden ein (Timer‑Thread bzw. Event‑Loop)."""
+
+
+class _SyncWaiter(_Waiter):
+    __slots__ = ("event",)
+
+    def __init__(self, max_inflight: int | None) -> None:
+        super().__init__(max_inflight)
+        self.event = threading.Event()
+
+    def wake(self) -> None:
+        self.event.set()
+
+    def call_later(self, delay: float, fn: Callable[[str], None], host: str) -> None:
+        timer = threading.Timer(delay, fn, args=(host,))
+        timer.daemon = True
+        timer.start()
+
+
+class _AsyncWaiter(_Waiter):
+    __slots__ = ("loop", "future")
+
+    def __init__(self, max_inflight: int | None, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(max_inflight)
+        self.loop = loop
+        self.future: asyncio.Future = loop.create_future()
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+    def wake(self) -> None:
+        self.loop.call_soon_threadsafe(self._resolve)
+
+    def call_later(self, delay: float, fn: Callable[[str], None], host: str) -> None:
+        self.loop.call_soon_threadsafe(self.loop.call_later, delay, fn, host)
+
+
+class _Bucket:
+    __slots__ = ("rate", "max_rate", "limit", "tokens", "stamp", "inflight",
+                 "blocked_until", "last_cut", "latency", "waiters", "timer_owner")
+
+    def __init__(self, rate: float, max_rate: float, limit: float) -> None:
+        self.rate = rate
+        self.max_rate = max_rate
+        self.limit = limit
+        self.tokens = 1.0
+        self.stamp = time.monotonic()
+        self.inflight = 0
+        self.blocked_until = 0.0
+        self.last_cut = 0.0
+        self.latency = 0.0  # EWMA der Antwortzeit
+        self.waiters: Deque[_Waiter] = deque()
+        self.timer_owner: _Waiter | None = None  # Wartender, für den ein Timer läuft
+
+
+class HostRateLimiter:
+    """Thread‑sicherer AIMD‑Token‑Bucket je Host (sync und async nutzbar)."""
+
+    def __init__(self,
+                 rate: float = 2.0,
+                 min_rate: float = 0.2,
+                 max_rate: float = 20.0,
+                 concurrency: float = 2.0,
+                 max_concurrency: int = 8,
+                 step: float = 0.25,
+                 slow_latency: float = 2.0) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.step = step
+        self.slow_latency = slow_latency
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.rate, self.max_rate, self.concurrency)
+        return bucket
+
+    def configure(self, host: str, max_rate: float) -> None:
+        """Obergrenze für einen Host, z. B. aus dem alten `--sleep` (1 / sleep)."""
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.max_rate = max(self.min_rate, max_rate)
+            bucket.rate = min(bucket.rate, bucket.max_rate)
+            self._dispatch(host, bucket)
+
+    # ------------------------------------------------------------- Anfordern
+    def _take(self, b: _Bucket, now: float, max_inflight: int | None) -> float | None:
+        """
+        Belegt einen Slot (0.0) oder liefert die Wartezeit bis zum nächsten
+        Token bzw. Ende der Sperre; None, wenn das Parallelitäts‑Limit
+        blockiert (dann geht es erst mit `release()` weiter).
+        """
+        if now < b.blocked_until:
+            return b.blocked_until - now
+        b.tokens = min(max(1.0, b.rate), b.tokens + (now - b.stamp) * b.rate)
+        b.stamp = now
+        limit = int(b.limit)
+        if max_inflight:
+            limit = min(limit, max_inflight)
+        if b.inflight >= max(1, limit):
+            return None
+        if b.tokens < 1.0:
+            return (1.0 - b.tokens) / b.rate
+        b.tokens -= 1.0
+        b.inflight += 1
+        return 0.0
+
+    def _dispatch(self, host: str, b: _Bucket) -> None:
+        """
+        Bedient Wartende strikt in Ankunftsreihenfolge (unter `_lock`). Fehlt
+        nur ein Token oder ist der Host gesperrt, weckt ein Timer den ersten
+        Wartenden zur fälligen Zeit – gepollt wird nicht.
+        """
+        while b.waiters:
+            head = b.waiters[0]
+            delay = self._take(b, time.monotonic(), head.max_inflight)
+            if delay is None:
+                return
+            if delay > 0:
+                if b.timer_owner is not head:
+                    b.timer_owner = head
+                    head.call_later(delay, self._tick, host)
+                return
+            b.waiters.popleft()
+            head.granted = True
+            head.wake()
+
+    def _tick(self, host: str) -> None:
+        with self._lock:
+            b = self._bucket(host)
+            b.timer_owner = None
+            self._dispatch(host, b)
+
+    def acquire(self, host: str, max_inflight: int | None = None) -> None:
+        with self._lock:
+            b = self._bucket(host)
+            if not b.waiters and self._take(b, time.monotonic(), max_inflight) == 0.0:
+                return
+            waiter = _SyncWaiter(max_inflight)
+            b.waiters.append(waiter)
+            self._dispatch(host, b)
+        waiter.event.wait()
+
+    async def aacquire(self, host: str, max_inflight: int | None = None) -> None:
+        with self._lock:
+            b = self._bucket(host)
+            if not b.waiters and self._take(b, time.monotonic(), max_inflight) == 0.0:
+                return
+            waiter = _AsyncWaiter(max_inflight, asyncio.get_running_loop())
+            b.waiters.append(waiter)
+            self._dispatch(host, b)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:  # Slot schon zugeteilt, aber nie benutzt
+                    b.inflight = max(0, b.inflight - 1)
+                    b.tokens = min(max(1.0, b.rate), b.tokens + 1.0)
+                else:
+                    b.waiters.remove(waiter)
+                if b.timer_owner is waiter:
+                    b.timer_owner = None
+                self._dispatch(host, b)
+            raise
+
+    # ---------------------------------------------------------- Rückmeldung
+    def release(self, host: str, latency: float, status: int | None,
+                retry_after: float | None = None) -> None:
+        """
+        Gibt den Slot frei und regelt nach. `status=None` steht für einen
+        Verbindungsfehler, `latency` ist die Zeit bis zu den Response‑Headern.
+        """
+        now = time.monotonic()
+        with self._lock:
+            b = self._bucket(host)
+            b.inflight = max(0, b.inflight - 1)
+            slow = b.latency > 0 and latency > max(self.slow_latency, 3 * b.latency)
+            b.latency = latency if b.latency == 0 else 0.8 * b.latency + 0.2 * latency
+
+            if status in THROTTLE_STATUS and retry_after is not None:
+                b.blocked_until = max(b.blocked_until, now + retry_after)
+            if status is None or status in THROTTLE_STATUS or status >= 500 or slow:
+                if now - b.last_cut > max(latency, 1.0 / b.rate):
+                    b.rate = max(self.min_rate, b.rate / 2)
+                    b.limit = max(1.0, b.limit / 2)
+                    b.tokens = min(b.tokens, 0.0)
+                    b.last_cut = now
+            elif status < 400:
+                b.rate = min(b.max_rate, b.rate + self.step)
+                b.limit = min(float(self.max_concurrency), b.limit + 1.0 / b.limit)
+            self._dispatch(host, b)
+
+    def snapshot(self) -> Dict[str, tuple[float, int, float]]:
+        """Aktueller Stand je Host: (Rate req/s, Parallelität, Ø Antwortzeit s)."""
+        with self._lock:
+            return {h: (b.rate, int(b.limit), b.latency) for h, b in self._buckets.items()}
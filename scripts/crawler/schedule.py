@@ -0,0 +1,133 @@
+"""
+Zeitbudget und Priorisierung für `crawl_all --budget`.
+
+Ohne Budget lädt `crawl_all` alles im Zeitfenster – wie lange das dauert,
+hängt an Spiegel & Co. Mit Budget wird stattdessen nach erwartetem Nutzen
+geladen und beim Ablauf sauber aufgehört:
+
+- Quellen starten in der Reihenfolge `SOURCE_PRIORITY` (Banking/Fintech zuerst)
+- Links einer Quelle werden nach `link_score()` sortiert: Quellen‑Priorität,
+  Aktualität (Lastmod aus der Sitemap) und Stichwörter im URL‑Slug – die Slugs
+  aller Quellen enthalten die Überschrift, ein Seitenabruf ist dafür nicht nötig
+- Ist die Deadline erreicht, bricht `crawl_links()` ab, offene Requests werden
+  verworfen; übrig gebliebene Links und nicht gestartete Quellen merkt sich
+  `CrawlBudget` für den Bericht am Ende
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+# Gewicht je Quelle (0–1); unbekannte Quellen liegen in der Mitte
+SOURCE_PRIORITY: Dict[str, float] = {
+    "bankingclub": 1.0,
+    "paymentandbanking": 1.0,
+    "financefwd": 0.9,
+    "derbankblog": 0.9,
+    "itfinanzmagazin": 0.8,
+    "cio": 0.6,
+    "netzpolitik": 0.4,
+    "spiegel": 0.4,
+    "ifun": 0.2,
+    "iphonetricks": 0.2,
+}
+DEFAULT_PRIORITY = 0.5
+
+# Stichwörter im URL‑Slug (Teilstring eines Slug‑Worts genügt: "bank" trifft "neobanken")
+KEYWORDS: Dict[str, float] = {
+    "bank": 1.0, "fintech": 1.0, "payment": 0.8, "zahlung": 0.8, "sparkasse": 0.8,
+    "volksbank": 0.8, "bafin": 0.8, "ezb": 0.6, "zins": 0.6, "kredit": 0.6,
+    "krypto": 0.6, "crypto": 0.6, "bitcoin": 0.6, "blockchain": 0.6, "stablecoin": 0.6,
+    "euro": 0.4, "regulier": 0.4, "dora": 0.4, "wallet": 0.4, "boerse": 0.4,
+    "ki": 0.4, "ai": 0.4, "digital": 0.3, "cloud": 0.2, "cyber": 0.3,
+}
+
+RECENCY_HALF_LIFE = 36.0  # Stunden, nach denen der Aktualitäts‑Anteil halbiert ist
+
+_SLUG_SPLIT = re.compile(r"[^a-z0-9äöüß]+")
+
+
+def source_priority(source: str) -> float:
+    return SOURCE_PRIORITY.get(source, DEFAULT_PRIORITY)
+
+
+def keyword_score(url: str) -> float:
+    """Summe der Stichwort‑Gewichte im Pfad, gedeckelt bei 1."""
+    words = [w for w in _SLUG_SPLIT.split(urlsplit(url).path.lower()) if w]
+    score = 0.0
+    for kw, weight in KEYWORDS.items():
+        if len(kw) <= 3:  # Kürzel nur als ganzes Wort ("ki", nicht "kino")
+            hit = kw in words
+        else:
+            hit = any(kw in w for w in words)
+        score += weight if hit else 0.0
+    return min(score, 1.0)
+
+
+def link_score(source: str, url: str, lastmod: str | None, now: datetime) -> float:
+    """Erwarteter Nutzen eines Links: 2·Priorität + Aktualität (0–1) + Stichwörter (0–1)."""
+    recency = 0.0
+    if lastmod:
+        try:
+            age_h = max(0.0, (now - datetime.fromisoformat(lastmod)).total_seconds() / 3600)
+            recency = math.pow(0.5, age_h / RECENCY_HALF_LIFE)
+        except (TypeError, ValueError):
+            pass
+    return 2 * source_priority(source) + recency + keyword_score(url)
+
+
+class CrawlBudget:
+    """Globale Deadline eines Laufs plus Buchführung über Übersprungenes (thread‑sicher)."""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        self._lock = threading.Lock()
+        self.skipped: Dict[str, List[tuple[float, str]]] = {}
+        self.not_started: List[str] = []
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def order(self, source: str, links: List[tuple[str, str]], now: datetime) -> List[tuple[str, str]]:
+        """Links nach `link_score()` absteigend (stabil, Gleichstand in Sitemap‑Reihenfolge)."""
+        return sorted(links, key=lambda l: -link_score(source, l[0], l[1], now))
+
+    def skip(self, source: str, links: List[tuple[str, str]], now: datetime) -> None:
+        scored = [(link_score(source, url, lm, now), url) for url, lm in links]
+        with self._lock:
+            self.skipped.setdefault(source, []).extend(scored)
+
+    def skip_source(self, source: str) -> None:
+        with self._lock:
+            self.not_started.append(source)
+
+    @property
+    def total_skipped(self) -> int:
+        with self._lock:
+            return sum(len(v) for v in self.skipped.values())
+
+    def report(self, top: int = 3) -> List[str]:
+        """Zeilen für die Zusammenfassung: je Quelle Anzahl und die wertvollsten verpassten Links."""
+        lines: List[str] = []
+        with self._lock:
+            for source, items in sorted(self.skipped.items(), key=lambda kv: -len(kv[1])):
+                if not items:
+                    continue
+                lines.append(f"  {source:<18} {len(items):>5} Links übersprungen")
+                for score, url in sorted(items, reverse=True)[:top]:
+                    lines.append(f"      {score:4.2f}  {url}")
+            if self.not_started:
+                lines.append(f"  nicht gestartet: {', '.join(self.not_started)}")
+        return lines
@@ -0,0 +1,121 @@
+"""
+Streamende Roh‑Snapshots als JSON Lines (optional gzip‑ oder zstd‑komprimiert).
+
+Statt alle Datensätze im Speicher zu sammeln und am Ende ein großes
+JSON‑Array zu schreiben, hängt `SnapshotWriter.write()` jeden Artikel sofort
+als eine Zeile an:
+
+    data/raw/articles_raw_YYYYMMDDTHHMMSS.jsonl.gz
+
+Jede Zeile wird direkt geflusht; bricht ein Lauf ab, ist alles bis zur
+letzten vollständigen Zeile lesbar. `iter_records()` liest Snapshots Zeile
+für Zeile (auch abgeschnittene) und versteht zusätzlich die alten
+`.json`‑Arrays.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator
+
+try:
+    import zstandard  # optional, nur für compression="zstd"
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst", "none": ".jsonl"}
+DEFAULT_COMPRESSION = "gzip"
+
+
+def snapshot_path(raw_dir: Path, prefix: str, compression: str = DEFAULT_COMPRESSION) -> Path:
+    """data/raw/<prefix>_raw_YYYYMMDDTHHMMSS.jsonl[.gz|.zst]"""
+    ts = datetime.now().strftime("%Y%m%dT%H%M%S")
+    return raw_dir / f"{prefix}_raw_{ts}{COMPRESSIONS[compression]}"
+
+
+class SnapshotWriter:
+    """Thread‑sicherer JSONL‑Writer; als Context‑Manager oder mit `close()` nutzen."""
+
+    def __init__(self, path: Path, compression: str = DEFAULT_COMPRESSION) -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unbekannte Kompression: {compression}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._raw = open(path, "wb")
+        self._zstd: Any = None
+        if compression == "gzip":
+            self._out: IO[bytes] = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif compression == "zstd":
+            if zstandard is None:
+                raise RuntimeError("compression='zstd' benötigt das Paket `zstandard`")
+            self._zstd = zstandard.ZstdCompressor(level=3).stream_writer(self._raw)
+            self._out = self._zstd
+        else:
+            self._out = self._raw
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            self._out.write(line)
+            if self._zstd is not None:
+                self._zstd.flush(zstandard.FLUSH_BLOCK)
+            else:
+                self._out.flush()  # gzip: Sync‑Flush, Zeile ist sofort lesbar
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._out is not self._raw:
+                self._out.close()
+            if not self._raw.closed:
+                self._raw.close()
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _open_lines(path: Path) -> IO[bytes]:
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path.name}: zum Lesen wird das Paket `zstandard` benötigt")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"),
+                                                                            closefd=True))
+    return open(path, "rb")
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Liest einen Snapshot Datensatz für Datensatz. Alte `.json`‑Arrays werden
+    komplett geladen; bei JSONL bleibt der Speicherbedarf konstant. Eine
+    abgeschnittene letzte Zeile (abgebrochener Lauf) wird übersprungen.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        yield from json.loads(path.read_text(encoding="utf-8"))
+        return
+
+    with _open_lines(path) as fh:
+        try:
+            for line in fh:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    print(f"[WARN] {path.name}: unvollständige Zeile übersprungen", file=sys.stderr)
+        except (EOFError, gzip.BadGzipFile):
+            # Lauf wurde abgebrochen, bevor der Stream sauber geschlossen war
+            print(f"[WARN] {path.name}: Snapshot endet abrupt", file=sys.stderr)
@@ -2,11 +2,12 @@
 """
 Crawler und Parser für SPIEGEL.de – holt alle Artikel der letzten 7 Tage
 
-1. `fetch_html(url)` lädt den Sitemap-Index https://www.spiegel.de/sitemap.xml.
+1. `fetch_bytes(url)` lädt den Sitemap-Index https://www.spiegel.de/sitemap.xml.
 2. `extract_article_sitemaps()` wählt die jüngsten *max_chunks* Article-Sitemaps (neueste zuerst).
 3. `get_recent_article_links()` durchsucht diese Sitemaps, sammelt URLs, deren `<lastmod>` im
    7-Tage-Fenster liegt, entfernt Duplikate und liefert (URL, ISO-Datum)-Tupel.
-4. Für jede URL lädt `fetch_article()` das HTML und `parse_article()` extrahiert
+4. Für jede URL lädt `fetch_article()` das HTML gestreamt (Paywall-Artikel werden
+   schon nach dem <head> abgebrochen) und `parse_article()` extrahiert
    Titel, Autor, Text; `clean_text()` normalisiert Leerzeichen.
 5. `save_bulk_json()` legt alle Datensätze gemeinsam unter
    data/raw/spiegel_raw_YYYYMMDDTHHMMSSZ.json ab.
@@ -18,19 +19,19 @@ Crawler und Parser für SPIEGEL.de – holt alle Artikel der letzten 7 Tage
 from __future__ import annotations
 
 # --- utilities aus base.py ----------------------------------------------------
-from scripts.crawler.base import fetch_html, clean_text, save_bulk_json
+from scripts.crawler.base import (
+    fetch_bytes, fetch_stream, save_bulk_json, crawl_links,
+    collect_sitemap_links, select_sitemap_chunks, SitemapSelection, SITEMAP_INDEX_TTL,
+    discover_links,
+    ArticleSelectors, extract_article,
+)
 
 import argparse
-import json
 import re
-import sys
-import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any
-import itertools
 
-from bs4 import BeautifulSoup, Tag
 
 # ---------------------------------------------------------------------------
 # Globale Einstellungen
@@ -40,64 +41,42 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 RAW_DIR = BASE_DIR / "data" / "raw"
 
 SITEMAP_INDEX_URL = "https://www.spiegel.de/sitemap.xml"
+# Die Schlagzeilen-RSS reicht nur wenige Stunden zurück, daher nur Sitemaps
+FEED_URL = None
 
 # ---------------------------------------------------------------------------
 # Sitemap-Handling  (neu)
 # ---------------------------------------------------------------------------
 
-def extract_article_sitemaps(index_xml: str, max_chunks: int = 50) -> List[str]:
+def extract_article_sitemaps(index_xml: bytes,
+                             max_chunks: int | None = None,
+                             days_back: int = 7) -> SitemapSelection:
     """
-    Liefert die neuesten `max_chunks` Article-Sitemaps aus dem Index. (bis max. letzte 7 Tage)
-    Der Index ist aufsteigend sortiert – wir drehen die Reihenfolge um.
+    Liefert die Article-Sitemaps, die das days_back-Fenster überlappen (neueste zuerst).
+    Der Index ist aufsteigend sortiert; ohne lastmod findet eine Binärsuche die Grenze.
     """
-    soup = BeautifulSoup(index_xml, "xml")
-    all_chunks = [
-        sm.loc.text.strip()
-        for sm in soup.find_all("sitemap")
-        if sm.loc and "/sitemaps/article/" in sm.loc.text
-    ]
-    all_chunks.reverse()                    # neueste zuerst
-    return all_chunks[:max_chunks]
+    return select_sitemap_chunks(
+        index_xml, lambda loc: "/sitemaps/article/" in loc,
+        days_back=days_back, max_chunks=max_chunks, source="spiegel",
+    )
 
 
-def get_recent_article_links(days_back: int = 7,
-                             limit: int | None = None) -> List[tuple[str, str]]:
+def get_sitemap_links(days_back: int = 7,
+                      limit: int | None = None) -> List[tuple[str, str]]:
     """
     Liefert eine Liste von Tupeln  (url, sitemap_lastmod_iso).
     """
-    idx_xml = fetch_html(SITEMAP_INDEX_URL)
-    chunk_urls = extract_article_sitemaps(idx_xml)
-
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days_back)
-    links: list[tuple[str, str]] = []
-
-    for chunk_url in chunk_urls:
-        chunk_xml = fetch_html(chunk_url)
-        soup = BeautifulSoup(chunk_xml, "xml")
+    idx_xml = fetch_bytes(SITEMAP_INDEX_URL, ttl=SITEMAP_INDEX_TTL)
+    selection = extract_article_sitemaps(idx_xml, days_back=days_back)
+    return collect_sitemap_links(selection.chunks, days_back=days_back, limit=limit,
+                                 prefetched=selection.prefetched)
 
-        for url_tag in soup.find_all("url"):
-            loc = url_tag.loc.text.strip()
-            last_text = url_tag.lastmod.text
-            try:
-                art_dt = datetime.fromisoformat(last_text.replace("Z", "+00:00"))
-            except ValueError:
-                continue
 
-            if art_dt >= cutoff:
-                links.append((loc, art_dt.isoformat()))
-
-        if limit and len(links) >= limit:
-            break
-
-    # Duplikate entfernen, Reihenfolge behalten
-    seen = set()
-    ordered: list[tuple[str, str]] = []
-    for loc, lm in links:
-        if loc not in seen:
-            seen.add(loc)
-            ordered.append((loc, lm))
-
-    return ordered[:limit] if limit else ordered
+def get_recent_article_links(days_back: int = 7,
+                             limit: int | None = None) -> List[tuple[str, str]]:
+    """(url, published_iso) über den Feed, falls er das Fenster abdeckt, sonst über die Sitemaps."""
+    return discover_links(FEED_URL, lambda: get_sitemap_links(days_back, limit),
+                          days_back=days_back, limit=limit, source="spiegel")
 
 
 # ---------------------------------------------------------------------------
@@ -105,40 +84,51 @@ def get_recent_article_links(days_back: int = 7,
 # ---------------------------------------------------------------------------
 
 
-def fetch_article(url: str) -> str:
-    return fetch_html(url)
+SELECTORS = ArticleSelectors(
+    containers=("article",),
+    first_container_only=True,
+)
 
 
-def parse_article(html: str, url: str, sitemap_lastmod: str) -> dict | None:
-    soup = BeautifulSoup(html, "html.parser")
+# og:title im <head> – Attributreihenfolge variiert
+_OG_TITLE = re.compile(
+    rb'<meta[^>]+(?:property="og:title"[^>]*content="([^"]*)"'
+    rb'|content="([^"]*)"[^>]*property="og:title")',
+    re.I,
+)
 
-    title_tag = soup.find("meta", property="og:title") or soup.find("title")
-    title = clean_text(title_tag.get("content") if title_tag else "")
 
-    # Paywall-Artikel überspringen (Titel beginnt mit "(S+)")
-    if title.startswith("(S+)"):
+def _paywall_head(buf: bytearray) -> bool | None:
+    """
+    Stop‑Prädikat für `fetch_stream`: bricht den Download ab, sobald der
+    og:title im <head> mit "(S+)" beginnt – der Artikel‑Body wird dann gar
+    nicht erst geladen. None, sobald feststeht, dass keine Paywall vorliegt.
+    """
+    m = _OG_TITLE.search(buf)
+    if m:
+        return (m.group(1) or m.group(2) or b"").lstrip().startswith(b"(S+)") or None
+    if b"</head>" in buf:
         return None
+    return False
 
-    # Veröffentlichungsdatum direkt aus der Sitemap übernehmen
-    published = sitemap_lastmod
 
-    author_tag = soup.find("meta", {"name": "author"})
-    author = author_tag["content"].strip() if author_tag and author_tag.get("content") else ""
+def fetch_article(url: str) -> str | None:
+    return fetch_stream(url, stop_when=_paywall_head)
 
-    article_tag = soup.find("article")
-    paragraphs = (
-        [p.get_text(" ", strip=True) for p in article_tag.find_all("p") if isinstance(p, Tag)]
-        if article_tag
-        else []
-    )
-    text = clean_text("\n".join(paragraphs))
+
+def parse_article(html: str, url: str, sitemap_lastmod: str) -> dict | None:
+    fields = extract_article(html, SELECTORS)
+
+    # Paywall-Artikel überspringen (Titel beginnt mit "(S+)")
+    if fields["title"].startswith("(S+)"):
+        return None
 
     return {
         "url": url,
-        "title": title,
-        "published": published,
-        "author": author,
-        "text": text,
+        "title": fields["title"],
+        "published": sitemap_lastmod,
+        "author": fields["author"],
+        "text": fields["text"],
         "crawled_at": datetime.now(timezone.utc).isoformat(),
     }
 
@@ -148,31 +138,21 @@ def parse_article(html: str, url: str, sitemap_lastmod: str) -> dict | None:
 
 def crawl_spiegel(days_back: int = 7,
                   limit: int = 0,
-                  sleep: float = 0.0) -> List[Dict[str, Any]]:
+                  sleep: float = 0.0,
+                  **opts) -> List[Dict[str, Any]]:
     """
     Crawlt SPIEGEL‑Artikel der letzten *days_back* Tage,
     gibt eine Liste von Datensätzen (Dict) zurück, speichert aber NICHT.
     So kann der Crawler von anderen Skripten (z. B. crawl_all.py) wiederverwendet
     werden, ohne sofort eine eigene JSON‑Datei zu schreiben.
+    Weitere Optionen (z. B. `concurrency`) reicht `crawl_links()` durch.
     """
     print(f"[INFO] Sammle Artikel der letzten {days_back} Tage …")
     links = get_recent_article_links(days_back=days_back, limit=limit or None)
     print(f"[INFO] {len(links)} Links gefunden – starte Download/Parsing")
 
-    records: list[dict] = []
-    for idx, (link, lastmod) in enumerate(links, 1):
-        try:
-            print(f"[spiegel] [{idx}/{len(links)}] {link}")
-            html = fetch_article(link)
-            parsed = parse_article(html, link, lastmod)
-            if parsed is None:
-                # Paywall-Artikel – nicht in die Liste aufnehmen
-                continue
-            records.append(parsed)
-            time.sleep(sleep)
-        except Exception as exc:
-            print(f"      ✖ Fehler bei {link}: {exc}", file=sys.stderr)
-    return records
+    return crawl_links("spiegel", links, parse_article, fetch=fetch_article,
+                       sleep=sleep, stop_when=_paywall_head, **opts)
 
 # ---------------------------------------------------------------------------
 # CLI
@@ -186,7 +166,7 @@ def build_argparser() -> argparse.ArgumentParser:
     )
     parser.add_argument("--days", type=int, default=7, help="Zeitraum in Tagen (Standard: 7)")
     parser.add_argument("--limit", type=int, default=0, help="Max. Artikel (0 = unbegrenzt)")
-    parser.add_argument("--sleep", type=float, default=0, help="Pause zwischen Requests (s)")
+    parser.add_argument("--sleep", type=float, default=0, help="Min. Abstand zwischen Requests pro Host (s)")
     return parser
 
 
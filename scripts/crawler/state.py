@@ -0,0 +1,194 @@
+"""
+Persistenter Crawl‑Zustand für inkrementelles Crawlen.
+
+Pro kanonischer URL werden Lastmod (Sitemap oder Feed), Inhalts‑Hash und Crawl‑Zeitpunkt
+in einer SQLite‑Datenbank gehalten. Vor der Datenbank sitzt ein Bloom‑Filter:
+URLs, die er nicht kennt, sind garantiert neu und brauchen keinen DB‑Lookup –
+bei Millionen URLs trifft der Großteil der Sitemap‑Einträge also nur den
+Speicher‑Filter.
+
+Ablauf in `crawl_links()`:
+1. `needs_fetch(url, lastmod)` – False, wenn URL bekannt und Lastmod nicht neuer
+   als der gespeicherte (verglichen als Zeitpunkt, nicht als Text)
+2. `delta(url, record)` – "new", "changed", "unchanged" (Lastmod neu, Inhalt
+   aber gleich) oder "dropped" (Parser hat die Seite verworfen), ohne zu speichern
+3. `record(source, url, lastmod, record)` – speichert den neuen Stand (erst wenn
+   der Datensatz sicher geschrieben ist) und liefert denselben Status
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def canonical_url(url: str) -> str:
+    """Normalisiert eine URL (Host klein, ohne Fragment/Tracking, ohne Slash am Ende)."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def _lastmod_utc(value: str | None) -> datetime | None:
+    """ISO‑Lastmod als UTC‑Zeitpunkt (ohne Zeitzone gilt UTC); None, wenn nicht lesbar."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).astimezone(timezone.utc)
+
+
+def content_hash(record: Dict[str, Any] | None) -> str:
+    """Hash über Titel + Text; leerer String für verworfene Seiten (z. B. Paywall)."""
+    if record is None:
+        return ""
+    payload = f"{record.get('title', '')}\n{record.get('text', '')}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Bloom‑Filter
+# ---------------------------------------------------------------------------
+
+class BloomFilter:
+    """Kompakter Mengen‑Test ohne False Negatives (Double Hashing über BLAKE2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def full(self) -> bool:
+        return self.count > self.capacity
+
+
+# ---------------------------------------------------------------------------
+# SQLite‑Store
+# ---------------------------------------------------------------------------
+
+class CrawlState:
+    """Zustand je kanonischer URL plus Delta‑Statistik je Quelle für den aktuellen Lauf."""
+
+    def __init__(self, path: Path, capacity: int = 1_000_000) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS crawl_state (
+                   url          TEXT PRIMARY KEY,
+                   lastmod      TEXT,
+                   content_hash TEXT,
+                   crawled_at   TEXT
+               )"""
+        )
+        self._bloom = self._build_bloom(capacity)
+        self.stats: Dict[str, Counter] = {}
+
+    def _build_bloom(self, capacity: int) -> BloomFilter:
+        (rows,) = self._db.execute("SELECT COUNT(*) FROM crawl_state").fetchone()
+        bloom = BloomFilter(max(capacity, 2 * rows))
+        for (url,) in self._db.execute("SELECT url FROM crawl_state"):
+            bloom.add(url)
+        return bloom
+
+    def needs_fetch(self, url: str, lastmod: str) -> bool:
+        """
+        True für neue URLs und solche, deren Lastmod neuer ist als der
+        gespeicherte. Verglichen wird als Zeitpunkt: Sitemap und Feed schreiben
+        dasselbe Datum verschieden, und ein Feed‑Datum (im Zweifel pubDate)
+        liegt nie nach dem Sitemap‑Lastmod – ein Wechsel der Link‑Quelle löst
+        so keinen Komplett‑Crawl aus. Nicht lesbare Angaben zählen bei jeder
+        Abweichung als geändert.
+        """
+        key = canonical_url(url)
+        with self._lock:
+            if key not in self._bloom:
+                return True
+            row = self._db.execute(
+                "SELECT lastmod FROM crawl_state WHERE url = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] == lastmod:
+            return row is None
+        new, old = _lastmod_utc(lastmod), _lastmod_utc(row[0])
+        return new is None or old is None or new > old
+
+    def skip(self, source: str, count: int) -> None:
+        self.stats.setdefault(source, Counter())["skipped"] += count
+
+    @staticmethod
+    def _status(row: tuple | None, record: Dict[str, Any] | None, digest: str) -> str:
+        if record is None:
+            return "dropped"
+        return "new" if row is None else "changed" if row[0] != digest else "unchanged"
+
+    def delta(self, url: str, record: Dict[str, Any] | None) -> str:
+        """Status, den `record()` liefern würde – ohne etwas zu speichern."""
+        key = canonical_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash FROM crawl_state WHERE url = ?", (key,)
+            ).fetchone()
+        return self._status(row, record, content_hash(record))
+
+    def record(self, source: str, url: str, lastmod: str,
+               record: Dict[str, Any] | None) -> str:
+        key = canonical_url(url)
+        digest = content_hash(record)
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash FROM crawl_state WHERE url = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT INTO crawl_state (url, lastmod, content_hash, crawled_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                "lastmod = excluded.lastmod, content_hash = excluded.content_hash, "
+                "crawled_at = excluded.crawled_at",
+                (key, lastmod, digest, now),
+            )
+            self._db.commit()
+            if row is None:
+                self._bloom.add(key)
+                if self._bloom.full:
+                    self._bloom = self._build_bloom(2 * self._bloom.capacity)
+            status = self._status(row, record, digest)
+            self.stats.setdefault(source, Counter())[status] += 1
+        return status
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
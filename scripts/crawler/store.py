@@ -0,0 +1,209 @@
+"""
+SQLite‑Artikelspeicher statt vieler zeitgestempelter Roh‑JSONs.
+
+Eine Zeile pro URL; wiederholte Crawls aktualisieren den vorhandenen Eintrag
+(Upsert), statt den Artikel erneut in einer weiteren Datei abzulegen. Der Text
+liegt zlib‑komprimiert als BLOB vor, Quelle / Veröffentlichungs‑ und
+Crawl‑Zeitpunkt sind indiziert – Abfragen wie „alle bankingclub‑Artikel der
+letzten 3 Tage“ sind damit Index‑Lookups:
+
+    store = ArticleStore(ARTICLE_STORE_PATH)
+    store.iter_articles(source="bankingclub", published_since=now - timedelta(days=3))
+
+Vorhandene Snapshots lassen sich übernehmen:
+
+> python -m scripts.crawler.store --import data/raw/articles_raw_*.json*
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from urllib.parse import urlsplit
+
+from scripts.crawler.snapshot import iter_records
+from scripts.crawler.state import content_hash
+
+ARTICLE_STORE_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "store" / "articles.sqlite"
+
+_COLUMNS = ("url", "source", "title", "author", "published", "crawled_at", "text")
+
+
+def source_of(record: Dict[str, Any]) -> str:
+    """Quelle eines Datensatzes; ältere Snapshots haben sie nicht überall → aus dem Host ableiten."""
+    if record.get("source"):
+        return record["source"]
+    host = urlsplit(record["url"]).netloc.split(":")[0]
+    labels = host.split(".")
+    return (labels[-2] if len(labels) >= 2 else host).replace("-", "")
+
+
+def _utc(value: datetime | str | None) -> str | None:
+    """
+    Zeitpunkt als UTC‑ISO‑String. Die Sitemaps liefern gemischte Offsets
+    (+02:00 / +00:00), verglichen wird im Index daher nur die UTC‑Form.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+class ArticleStore:
+    """Thread‑sicherer Artikelspeicher (WAL, ein Eintrag pro URL)."""
+
+    def __init__(self, path: Path = ARTICLE_STORE_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.count = 0  # Upserts in diesem Lauf
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """CREATE TABLE IF NOT EXISTS articles (
+                   url          TEXT PRIMARY KEY,
+                   source       TEXT NOT NULL,
+                   title        TEXT,
+                   author       TEXT,
+                   published    TEXT,
+                   published_utc TEXT,
+                   crawled_at   TEXT,
+                   first_seen   TEXT,
+                   content_hash TEXT,
+                   text_z       BLOB
+               );
+               CREATE INDEX IF NOT EXISTS idx_articles_source     ON articles(source, published_utc);
+               CREATE INDEX IF NOT EXISTS idx_articles_published  ON articles(published_utc);
+               CREATE INDEX IF NOT EXISTS idx_articles_crawled_at ON articles(crawled_at);"""
+        )
+
+    # -------------------------------------------------------------- Schreiben
+    def upsert(self, source: str, record: Dict[str, Any], commit: bool = True) -> None:
+        """Legt einen Artikel an oder aktualisiert ihn; `first_seen` bleibt erhalten."""
+        text = record.get("text", "") or ""
+        row = (
+            record["url"], source, record.get("title", ""), record.get("author", ""),
+            record.get("published"), _utc(record.get("published")), record.get("crawled_at"),
+            record.get("crawled_at") or datetime.now(timezone.utc).isoformat(),
+            content_hash(record), zlib.compress(text.encode("utf-8"), 6),
+        )
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO articles (url, source, title, author, published, published_utc, "
+                "crawled_at, first_seen, content_hash, text_z) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET source = excluded.source, "
+                "title = excluded.title, author = excluded.author, "
+                "published = excluded.published, published_utc = excluded.published_utc, "
+                "crawled_at = excluded.crawled_at, "
+                "content_hash = excluded.content_hash, text_z = excluded.text_z "
+                "WHERE excluded.crawled_at >= articles.crawled_at OR articles.crawled_at IS NULL",
+                row,
+            )
+            if commit:
+                self._db.commit()
+            self.count += 1
+
+    def import_snapshot(self, path: Path) -> int:
+        """Übernimmt einen Roh‑Snapshot (JSONL oder JSON); ältere Stände überschreiben keine neueren."""
+        n = 0
+        for record in iter_records(path):
+            self.upsert(source_of(record), record, commit=False)
+            n += 1
+        with self._lock:
+            self._db.commit()
+        return n
+
+    # ------------------------------------------------------------------ Lesen
+    def iter_articles(self,
+                      source: str | None = None,
+                      published_since: datetime | str | None = None,
+                      crawled_since: datetime | str | None = None,
+                      limit: int | None = None) -> Iterator[Dict[str, Any]]:
+        """
+        Artikel als Dicts im Snapshot‑Format (inkl. `source`), neueste zuerst.
+        Alle Filter laufen über die Indizes; der Text wird erst beim Lesen entpackt.
+        """
+        where: List[str] = []
+        params: List[Any] = []
+        if source is not None:
+            where.append("source = ?")
+            params.append(source)
+        if published_since is not None:
+            where.append("published_utc >= ?")
+            params.append(_utc(published_since))
+        if crawled_since is not None:
+            where.append("crawled_at >= ?")
+            params.append(crawled_since if isinstance(crawled_since, str)
+                          else crawled_since.astimezone(timezone.utc).isoformat())
+        sql = "SELECT url, source, title, author, published, crawled_at, text_z FROM articles"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY published_utc DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            cur = self._db.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cur.fetchmany(256)
+            if not rows:
+                return
+            for *fields, text_z in rows:
+                record = dict(zip(_COLUMNS, fields))
+                record["text"] = zlib.decompress(text_z).decode("utf-8") if text_z else ""
+                yield record
+
+    def get(self, url: str) -> Dict[str, Any] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, source, title, author, published, crawled_at, text_z "
+                "FROM articles WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(_COLUMNS, row[:-1]))
+        record["text"] = zlib.decompress(row[-1]).decode("utf-8") if row[-1] else ""
+        return record
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT source, COUNT(*) FROM articles GROUP BY source ORDER BY source"
+            ).fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Artikelspeicher verwalten")
+    p.add_argument("--db", type=Path, default=ARTICLE_STORE_PATH, help="Pfad zur SQLite-Datei")
+    p.add_argument("--import", dest="imports", type=Path, nargs="*", default=[],
+                   help="Roh-Snapshots (JSON/JSONL) übernehmen")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    store = ArticleStore(args.db)
+    for fp in sorted(args.imports):
+        print(f"[store] {fp.name}: {store.import_snapshot(fp)} Datensätze")
+    for name, n in store.stats().items():
+        print(f"  {name:<18} {n:>6} Artikel")
+    store.close()
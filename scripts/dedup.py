@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate-Erkennung vor dem Chunking (MinHash + LSH-Banding).
+
+Fachportale wie financefwd, paymentandbanking oder it-finanzmagazin übernehmen
+oft nahezu wortgleiche Pressemitteilungen. Ohne diese Stufe wird jede Kopie
+gechunkt, eingebettet und konkurriert in `ask_rag` um die Top-n-Plätze.
+
+Ablauf:
+1. Text normalisieren, in Wort-Shingles (5-Gramme) zerlegen
+2. MinHash-Signatur mit `NUM_PERM` Hashfunktionen (vektorisiert mit numpy)
+3. LSH: Signatur in `BANDS` Bänder teilen; Artikel, die in mindestens einem
+   Band übereinstimmen, sind Kandidaten – kein paarweiser Vergleich aller Artikel
+4. Kandidaten über den Signatur-Anteil (≈ Jaccard) prüfen und per Union-Find
+   zu Gruppen zusammenfassen
+5. Pro Gruppe bleibt ein kanonischer Datensatz (frühestes `published`, bei
+   Gleichstand der längste Text); die übrigen URLs landen in `alt_urls`
+
+Speicher pro Artikel: eine Signatur mit NUM_PERM uint32 (512 Byte bei 128).
+
+> python -m scripts.dedup data/raw/articles_raw_….jsonl.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from scripts.crawler.snapshot import iter_records
+
+NUM_PERM = 128        # Hashfunktionen pro Signatur
+BANDS = 16            # LSH-Bänder à NUM_PERM / BANDS Zeilen (Schwelle ≈ (1/16)^(1/8) ≈ 0.71)
+SHINGLE_SIZE = 5      # Wörter pro Shingle
+THRESHOLD = 0.8       # geschätzte Jaccard-Ähnlichkeit ab der zwei Artikel Duplikate sind
+
+# Primzahl knapp unter 2^32: a·x + b bleibt für x, a, b < P in uint64 ohne Überlauf
+_PRIME = np.uint64(4_294_967_291)
+_WORD_RE = re.compile(r"\w+")
+
+_rng = np.random.default_rng(20250605)  # fester Seed ⇒ Signaturen sind über Läufe vergleichbar
+_PERM_A = _rng.integers(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+
+# ---------------------------------------------------------------------------
+# MinHash
+# ---------------------------------------------------------------------------
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """32-Bit-Hashes aller Wort-`size`-Gramme (einmal CRC32 pro Wort, Rest vektorisiert)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return np.empty(0, dtype=np.uint64)
+    h = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words),
+                    dtype=np.uint64, count=len(words))
+    n = len(words) - size + 1
+    acc = np.zeros(n, dtype=np.uint64)
+    for j in range(size):  # Polynom-Hash über das Fenster, modulo 2^32
+        acc = (acc * np.uint64(1_000_003) + h[j:j + n]) & np.uint64(0xFFFFFFFF)
+    return np.unique(acc)
+
+
+def minhash_signature(text: str, num_perm: int = NUM_PERM) -> np.ndarray | None:
+    """MinHash-Signatur (uint32[num_perm]); None, wenn der Text zu kurz ist."""
+    shingles = shingle_hashes(text)
+    if shingles.size == 0:
+        return None
+    a, b = _PERM_A[:num_perm], _PERM_B[:num_perm]
+    # (a·x + b) mod p für alle Shingles × Hashfunktionen, dann Minimum je Funktion
+    hashed = (np.outer(shingles % _PRIME, a) + b) % _PRIME
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+# ---------------------------------------------------------------------------
+# LSH-Index
+# ---------------------------------------------------------------------------
+
+
+class MinHashLSH:
+    """Band-Index über MinHash-Signaturen; liefert Kandidaten in O(Bänder) pro Artikel."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm muss durch bands teilbar sein")
+        self.rows = num_perm // bands
+        self.bands = bands
+        self._tables: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+
+    def _keys(self, sig: np.ndarray) -> Iterable[tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, sig: np.ndarray) -> set[int]:
+        found: set[int] = set()
+        for band, key in self._keys(sig):
+            found.update(self._tables[band].get(key, ()))
+        return found
+
+    def add(self, key: int, sig: np.ndarray) -> None:
+        for band, bkey in self._keys(sig):
+            self._tables[band][bkey].append(key)
+
+
+# ---------------------------------------------------------------------------
+# Zusammenfassen
+# ---------------------------------------------------------------------------
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _canonical_rank(rec: Dict[str, Any]) -> tuple[str, int]:
+    # Frühestes published (Original der Pressemitteilung), dann der längste Text
+    return rec.get("published") or "9999", -len(rec.get("text", ""))
+
+
+def collapse_near_duplicates(records: Iterable[Dict[str, Any]],
+                             threshold: float = THRESHOLD,
+                             num_perm: int = NUM_PERM,
+                             bands: int = BANDS) -> List[Dict[str, Any]]:
+    """
+    Fasst nahezu gleiche Artikel zu je einem kanonischen Datensatz zusammen.
+    Der kanonische Datensatz bekommt `alt_urls` (URLs der übrigen Kopien samt
+    deren `alt_urls`); die Reihenfolge der Ausgabe folgt dem ersten Auftreten
+    der Gruppe.
+    """
+    lsh = MinHashLSH(num_perm, bands)
+    recs: List[Dict[str, Any]] = []
+    sigs: List[np.ndarray | None] = []
+    parent: List[int] = []
+
+    for rec in records:
+        i = len(recs)
+        recs.append(rec)
+        parent.append(i)
+        sig = minhash_signature(rec.get("text", ""), num_perm)
+        sigs.append(sig)
+        if sig is None:
+            continue
+        for j in lsh.query(sig):
+            if np.count_nonzero(sig == sigs[j]) / num_perm >= threshold:
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+        lsh.add(i, sig)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(recs)):
+        groups[_find(parent, i)].append(i)
+
+    out: List[Dict[str, Any]] = []
+    for root in sorted(groups):
+        members = [recs[i] for i in groups[root]]
+        if len(members) == 1:
+            out.append(members[0])
+            continue
+        canonical = min(members, key=_canonical_rank)
+        alt = {m["url"] for m in members} | {u for m in members for u in m.get("alt_urls", [])}
+        alt.discard(canonical["url"])
+        out.append({**canonical, "alt_urls": sorted(alt)})
+
+    dropped = len(recs) - len(out)
+    if dropped:
+        print(f"[INFO] {dropped} Near-Duplicates in {sum(len(g) > 1 for g in groups.values())} "
+              f"Gruppen zusammengefasst ({len(recs)} → {len(out)} Artikel).")
+    return out
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Near-Duplicates in einem Roh-Snapshot anzeigen")
+    p.add_argument("raw", type=Path, help="Roh-Snapshot (.jsonl.gz oder .json)")
+    p.add_argument("--threshold", type=float, default=THRESHOLD,
+                   help=f"Ähnlichkeitsschwelle (Standard: {THRESHOLD})")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    for rec in collapse_near_duplicates(iter_records(args.raw), threshold=args.threshold):
+        if rec.get("alt_urls"):
+            print(f"- {rec['title']}\n  {rec['url']}")
+            for url in rec["alt_urls"]:
+                print(f"    ≈ {url}")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Persistenter Embedding-Cache für `run_preprocess`.
+
+Ein Großteil der Chunks ist von Lauf zu Lauf identisch (das 7-Tage-Fenster
+verschiebt sich nur um einen Tag). Statt sie jedes Mal neu durch
+`SentenceTransformer.encode` zu schicken, liegen die Vektoren hier:
+
+  data/vectorstore/embcache/<modell>/vectors.<gen>.f32  – float32-Matrix, zeilenweise angehängt,
+                                                          gelesen per np.memmap
+  data/vectorstore/embcache/<modell>/keys.<gen>.bin     – SHA-1 (20 Byte) je Zeile, gleiche Reihenfolge
+  data/vectorstore/embcache/<modell>/meta.json          – Modellname, Dimension, aktuelle Generation
+
+Schlüssel ist der Hash über (Modellname, normalisierter Chunk-Text). Beim
+Öffnen wird aus keys.bin das Hash→Zeile-Dict gebaut; eine nach einem Abbruch
+halb geschriebene letzte Zeile wird ignoriert.
+
+Zeilen, die der aktuelle Index nicht mehr nutzt, bleiben zunächst liegen
+(ein älterer Snapshot kann sie wieder brauchen). Übersteigen sie
+`COMPACT_RATIO` × genutzte Zeilen, schreibt `compact()` Matrix und Schlüssel
+ohne sie als neue Generation und schaltet meta.json atomar um. Nur ein
+Prozess darf gleichzeitig schreiben.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, List, Set
+
+import numpy as np
+
+EMB_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "vectorstore" / "embcache"
+
+KEY_BYTES = 20          # SHA-1
+COMPACT_RATIO = 1.0     # kompaktieren, sobald mehr tote als genutzte Zeilen vorliegen
+COMPACT_MIN_ROWS = 1000  # kleine Caches nie kompaktieren
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_chunk(text: str) -> str:
+    """Unicode-NFC und Whitespace vereinheitlichen – Grundlage des Cache-Schlüssels."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def chunk_key(model_name: str, text: str) -> bytes:
+    return hashlib.sha1(f"{model_name}\0{normalize_chunk(text)}".encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """Append-only Vektor-Cache für genau ein Modell."""
+
+    def __init__(self, model_name: str, root: Path = EMB_CACHE_DIR) -> None:
+        self.model_name = model_name
+        self.dir = root / re.sub(r"[^A-Za-z0-9._-]+", "__", model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._meta_fp = self.dir / "meta.json"
+
+        self.dim: int | None = None
+        self.generation = 0
+        if self._meta_fp.exists():
+            meta = json.loads(self._meta_fp.read_text(encoding="utf-8"))
+            self.dim, self.generation = meta["dim"], meta.get("generation", 0)
+        self._rows: Dict[bytes, int] = {}
+        self._matrix: np.ndarray | None = None
+        self._load()
+
+    # ---------------------------------------------------------------- Laden
+    @property
+    def _vec_fp(self) -> Path:
+        return self.dir / f"vectors.{self.generation}.f32"
+
+    @property
+    def _key_fp(self) -> Path:
+        return self.dir / f"keys.{self.generation}.bin"
+
+    def _write_meta(self) -> None:
+        tmp = self._meta_fp.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"model": self.model_name, "dim": self.dim,
+                                   "generation": self.generation}), encoding="utf-8")
+        os.replace(tmp, self._meta_fp)
+
+    def _load(self) -> None:
+        keys = self._key_fp.read_bytes() if self._key_fp.exists() else b""
+        n = len(keys) // KEY_BYTES
+        if self.dim and self._vec_fp.exists():
+            n = min(n, self._vec_fp.stat().st_size // (4 * self.dim))
+        else:
+            n = 0
+        self._rows = {keys[i * KEY_BYTES:(i + 1) * KEY_BYTES]: i for i in range(n)}
+        self._truncate(n)
+        self._matrix = (np.memmap(self._vec_fp, dtype=np.float32, mode="r", shape=(n, self.dim))
+                        if n else None)
+
+    def _truncate(self, n: int) -> None:
+        """Halb geschriebene Zeilen nach einem Abbruch abschneiden."""
+        if self._key_fp.exists() and self._key_fp.stat().st_size != n * KEY_BYTES:
+            os.truncate(self._key_fp, n * KEY_BYTES)
+        if self.dim and self._vec_fp.exists() and self._vec_fp.stat().st_size != n * 4 * self.dim:
+            os.truncate(self._vec_fp, n * 4 * self.dim)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # --------------------------------------------------------------- Zugriff
+    def embed(self, texts: List[str],
+              encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Vektoren für `texts` in derselben Reihenfolge. Nur Cache-Misses
+        (einmal je Text) gehen an `encode`; ihre Ergebnisse werden angehängt.
+        """
+        keys = [chunk_key(self.model_name, t) for t in texts]
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self._rows and key not in missing:
+                missing[key] = text
+
+        print(f"[INFO] Embedding-Cache: {len(texts) - sum(k in missing for k in keys)} Treffer, "
+              f"{len(missing)} neu zu berechnen")
+        if missing:
+            self._append(list(missing), np.asarray(encode(list(missing.values())), dtype=np.float32))
+
+        if not texts:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        rows = np.fromiter((self._rows[k] for k in keys), dtype=np.int64, count=len(keys))
+        return np.ascontiguousarray(self._matrix[rows])
+
+    def _append(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            self._write_meta()
+        if vectors.shape != (len(keys), self.dim):
+            raise ValueError(f"Embedding-Form {vectors.shape} passt nicht zu dim={self.dim}")
+        # Erst die Vektoren, dann die Schlüssel: ein Abbruch dazwischen hinterlässt
+        # nur Zeilen ohne Schlüssel, die `_load()` abschneidet.
+        with open(self._vec_fp, "ab") as fh:
+            fh.write(vectors.tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        with open(self._key_fp, "ab") as fh:
+            fh.write(b"".join(keys))
+        self._load()
+
+    # ------------------------------------------------------------ Aufräumen
+    def compact(self, live: Set[bytes], force: bool = False) -> int:
+        """
+        Entfernt Zeilen, deren Schlüssel nicht in `live` stehen – nur wenn sich
+        das lohnt (siehe COMPACT_RATIO/COMPACT_MIN_ROWS) oder mit force=True.
+        Liefert die Anzahl entfernter Zeilen.
+        """
+        keep = [k for k in self._rows if k in live]
+        dead = len(self._rows) - len(keep)
+        if not dead or (not force and (len(self._rows) < COMPACT_MIN_ROWS
+                                       or dead <= COMPACT_RATIO * len(keep))):
+            return 0
+
+        keep.sort(key=self._rows.__getitem__)  # Reihenfolge der Datei beibehalten
+        rows = np.fromiter((self._rows[k] for k in keep), dtype=np.int64, count=len(keep))
+        old_vec, old_key = self._vec_fp, self._key_fp
+        self.generation += 1
+        with open(self._vec_fp, "wb") as fh:
+            for start in range(0, len(rows), 4096):
+                fh.write(np.ascontiguousarray(self._matrix[rows[start:start + 4096]]).tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._key_fp.write_bytes(b"".join(keep))
+        # Umschalten erst, wenn die neue Generation vollständig auf der Platte liegt
+        self._write_meta()
+        self._matrix = None
+        old_vec.unlink(missing_ok=True)
+        old_key.unlink(missing_ok=True)
+        self._load()
+        print(f"[INFO] Embedding-Cache kompaktiert: {dead} Zeilen entfernt, {len(keep)} behalten")
+        return dead
@@ -10,17 +10,25 @@ Zusätzlich generiert es über OpenAI (Modell: o4-mini) kurze Zusammenfassungen
 für die jeweils relevantesten Artikel-Chunks.
 
 Funktionen im Überblick:
-1. `load_records(path)` – lädt die Rohdaten (Liste von Dicts)
-2. `clean_and_chunk(recs)` – normalisiert Texte & erzeugt Chunks (~200 Wörter)
-3. `embed_chunks(chunks)` – erzeugt Vektoren mit Sentence-Transformers
+1. `load_records(path)` – lädt die Rohdaten (Liste von Dicts; `iter_records` streamt sie)
+2. `collapse_near_duplicates(recs)` – fasst wortgleiche Kopien (z. B. Pressemitteilungen) zusammen
+   `clean_and_chunk(recs)` – normalisiert Texte & erzeugt Chunks (~200 Wörter)
+3. `embed_chunks(chunks)` – erzeugt Vektoren mit Sentence-Transformers (nur für Chunks,
+   die noch nicht im Embedding-Cache liegen)
 4. `build_faiss(emb, meta)` – speichert Vektoren + Metadaten als FAISS-Index
+   (mit --incremental per Upsert in den bestehenden Index; Indextyp per --index:
+   flat, ivf, ivfpq oder hnsw, Kompression per --storage/--pca, siehe vecindex.py;
+   Vergleich mit bench_index.py)
 5. `_summarize(text)` – ruft das OpenAI-Modell o4-mini auf, um Chunks zu verdichten
 6. `ask_rag(query, n)` – sucht n relevante Chunks zu einer Query, liefert Titel/URL/Summary
+   (Modell, Index und Metadaten hält `Retriever` prozessweit im Speicher)
 
 Speicherorte:
-- Rohdaten:       data/raw/
+- Rohdaten:       data/raw/articles_raw_*.jsonl.gz (ältere Läufe: *.json)
+                  oder Artikelspeicher data/store/articles.sqlite (--store)
 - FAISS-Index:    data/vectorstore/articles.index
 - Metadaten:      data/vectorstore/articles.meta.pkl
+- Embedding-Cache: data/vectorstore/embcache/<modell>/
 """
 
 from __future__ import annotations
@@ -29,23 +37,29 @@ _os_.environ.setdefault("OMP_NUM_THREADS", "1")
 _os_.environ.setdefault("MKL_NUM_THREADS", "1")
 
 import argparse
-import json
+import hashlib
 import os
-import pickle
 import re
 import sys
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterable, Tuple
 import faiss  # type: ignore
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 import math
 
-import openai
 from openai import OpenAI
 
+from scripts.crawler.snapshot import iter_records
+from scripts.crawler.state import content_hash
+from scripts.crawler.store import ARTICLE_STORE_PATH, ArticleStore
+from scripts.dedup import collapse_near_duplicates
+from scripts.embcache import EmbeddingCache, chunk_key
+from scripts.vecindex import INDEX_KINDS, PCA_DIMS, STORAGES, IndexSpec, VectorIndex, check_spec
+
 # ---------------------------------------------------------------------------
 # Globale Einstellungen
 # ---------------------------------------------------------------------------
@@ -54,8 +68,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 RAW_DIR = BASE_DIR / "data" / "raw"
 PROC_DIR = BASE_DIR / "data" / "processed"
 VEC_DIR = BASE_DIR / "data" / "vectorstore"
+INDEX_PATH = VEC_DIR / "articles.index"
+META_PATH = VEC_DIR / "articles.meta.pkl"
 
 CHUNK_SIZE = 200        # ~Wörter pro Chunk
+INDEX_KIND = "flat"     # Standard-Indextyp (flat, ivf, ivfpq, hnsw)
+VECTOR_STORAGE = "f32"  # Speicherformat im Index (f32, f16, int8, binary)
 EMB_MODEL = "sentence-transformers/all-mpnet-base-v2"
 
 # ---------------------------------------------------------------------------
@@ -108,8 +126,8 @@ def _summarize(text: str, max_sentences: int = 1) -> str:
 
 
 def load_records(path: Path) -> List[Dict[str, Any]]:
-    """Lädt JSON‐Datei voller Artikel."""
-    return json.loads(path.read_text(encoding="utf-8"))
+    """Lädt einen Roh-Snapshot (JSONL, gzip/zstd oder altes JSON-Array) komplett."""
+    return list(iter_records(path))
 
 
 def _clean(text: str) -> str:
@@ -124,11 +142,18 @@ def _chunk(text: str, size: int = CHUNK_SIZE) -> List[str]:
     return [" ".join(words[i : i + size]) for i in range(0, len(words), size)]
 
 
-def clean_and_chunk(recs: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
+def article_digest(r: Dict[str, Any]) -> str:
+    """Hash über Inhalt und die im Index gespeicherten Metadaten eines Artikels."""
+    payload = "\n".join([content_hash(r), r.get("published") or "", *sorted(r.get("alt_urls", []))])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def clean_and_chunk(recs: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
     """Erzeugt Text-Chunks & parallele Metadaten‐Liste."""
     chunks, meta = [], []
     for r in recs:
-        for chunk in _chunk(_clean(r["text"])):
+        digest = article_digest(r)
+        for no, chunk in enumerate(_chunk(_clean(r["text"]))):
             chunks.append(chunk)
             meta.append(
                 {
@@ -136,45 +161,155 @@ def clean_and_chunk(recs: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict[st
                     "title": r["title"],
                     "published": r["published"],
                     "source": r.get("source", ""),  # ← neu
+                    "alt_urls": r.get("alt_urls", []),
                     "chunk": chunk,
+                    "content_hash": digest,
+                    "chunk_no": no,
                 }
             )
     return chunks, meta
 
 
-def embed_chunks(chunks: List[str], batch_size: int = 16) -> np.ndarray:
-    """Embeddings batchweise erzeugen, um Speicherprobleme zu vermeiden."""
-    model = SentenceTransformer(EMB_MODEL, device="cpu")
-    emb = model.encode(
-        chunks,
-        batch_size=min(batch_size, len(chunks)),
-        convert_to_numpy=True,
-        show_progress_bar=True,
-        normalize_embeddings=True,
-    )
-    return emb.astype("float32")
+def embed_chunks(chunks: List[str], batch_size: int = 16,
+                 cache: EmbeddingCache | None = None) -> np.ndarray:
+    """
+    Embeddings batchweise erzeugen, um Speicherprobleme zu vermeiden.
+    Mit `cache` gehen nur Chunks ohne Cache-Eintrag durch das Modell; sind alle
+    bekannt, wird das Modell gar nicht erst geladen.
+    """
+    def encode(texts: List[str]) -> np.ndarray:
+        return get_retriever().encode(texts, batch_size=batch_size, show_progress_bar=True)
 
+    if cache is None:
+        return encode(chunks)
+    return cache.embed(chunks, encode)
 
-def build_faiss(emb: np.ndarray, meta: List[Dict[str, Any]]) -> None:
-    """Schreibt Vektorindex + Metadaten mit FAISS."""
-    VEC_DIR.mkdir(parents=True, exist_ok=True)
 
-    faiss.normalize_L2(emb)
-    index = faiss.IndexFlatIP(emb.shape[1])
-    index.add(emb)
-    faiss.write_index(index, str(VEC_DIR / "articles.index"))
-    print(f"[INFO] FAISS-Index geschrieben ({index.ntotal} Vektoren).")
+def build_faiss(emb: np.ndarray, meta: List[Dict[str, Any]], index: VectorIndex | None = None,
+                retention: timedelta | None = None,
+                spec: IndexSpec = IndexSpec(INDEX_KIND, VECTOR_STORAGE)) -> VectorIndex:
+    """
+    Schreibt Vektorindex + Metadaten mit FAISS.
+    Ohne `index` wird neu aufgebaut; sonst ersetzt ein Upsert nur die Artikel aus
+    `meta`. Artikel, die älter als `retention` sind, werden zu Tombstones.
+    `spec` wählt Indextyp und Speicherformat; ein abweichender Index wird umgebaut.
+    """
+    if meta:
+        faiss.normalize_L2(emb)
+    if index is None:
+        index = VectorIndex(emb.shape[1], INDEX_PATH, META_PATH, spec=spec)
+    elif index.spec != spec:
+        print(f"[INFO] Indextyp {index.spec} → {spec}")
+        index.spec = spec  # compact() baut aus den Vollvektoren neu auf
+    index.upsert(emb, meta)
+    if retention is not None:
+        index.expire(datetime.now(timezone.utc) - retention)
+    index.compact()
+    index.save()
+    print(f"[INFO] FAISS-Index geschrieben ({index.built}, {len(index.chunks)} Vektoren, "
+          f"{len(meta)} neu, {len(index.tombstones)} Tombstones).")
+    return index
+
+
+def _load_vectors(index_path: Path = INDEX_PATH, meta_path: Path = META_PATH) -> VectorIndex:
+    """Lädt FAISS-Index + Metadaten (Chunk-ID → Metadaten; IDs ohne Eintrag sind Tombstones)."""
+    return (VectorIndex.load(index_path, meta_path)
+            or VectorIndex.load_legacy(index_path, meta_path))
+
+
+# ---------------------------------------------------------------------------
+# Retriever (prozessweit, von allen Streamlit-Sessions geteilt)
+# ---------------------------------------------------------------------------
+
 
-    with open(VEC_DIR / "articles.meta.pkl", "wb") as fh:
-        pickle.dump(meta, fh)
+class Retriever:
+    """
+    Hält Embedding-Modell, FAISS-Index und Metadaten zwischen Abfragen im Speicher.
 
+    Das Modell wird beim ersten Bedarf einmal geladen. Index und Metadaten werden
+    neu gelesen, sobald sich mtime/Größe einer der beiden Dateien ändert (nach
+    `build_faiss`) – ein Stat pro Abfrage. Eine Abfrage arbeitet immer auf einem
+    konsistenten (Index, Metadaten)-Paar; ein Reload tauscht beides zusammen aus.
+    Suchparameter (nprobe, ef_search) gelten pro Abfrage und ändern den Index nicht.
+    """
 
-def _load_vectors() -> Tuple[faiss.IndexFlatIP, List[Dict[str, Any]]]:
-    """Lädt FAISS-Index + Metadaten."""
-    with open(VEC_DIR / "articles.meta.pkl", "rb") as fh:
-        meta = pickle.load(fh)
-    index = faiss.read_index(str(VEC_DIR / "articles.index"))
-    return index, meta
+    def __init__(self, index_path: Path = INDEX_PATH, meta_path: Path = META_PATH,
+                 model_name: str = EMB_MODEL) -> None:
+        self.index_path = index_path
+        self.meta_path = meta_path
+        self.model_name = model_name
+        self._model: SentenceTransformer | None = None
+        self._model_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._vectors: VectorIndex | None = None
+        self._stamp: Tuple[Tuple[int, int], ...] | None = None
+
+    # ---------------------------------------------------------------- Modell
+    @property
+    def model(self) -> SentenceTransformer:
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+        return self._model
+
+    def encode(self, texts: List[str], batch_size: int = 16,
+               show_progress_bar: bool = False) -> np.ndarray:
+        """Normalisierte float32-Embeddings; serialisiert, da sich alle Threads ein Modell teilen."""
+        model = self.model
+        with self._model_lock:
+            emb = model.encode(
+                texts,
+                batch_size=max(1, min(batch_size, len(texts))),
+                convert_to_numpy=True,
+                show_progress_bar=show_progress_bar,
+                normalize_embeddings=True,
+            )
+        return emb.astype("float32")
+
+    # ----------------------------------------------------------------- Index
+    def _file_stamp(self) -> Tuple[Tuple[int, int], ...]:
+        stats = [p.stat() for p in (self.index_path, self.meta_path)]
+        return tuple((st.st_mtime_ns, st.st_size) for st in stats)
+
+    def vectors(self) -> VectorIndex:
+        """Aktueller Index samt Metadaten; lädt neu, wenn sich die Dateien geändert haben."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp or self._vectors is None:
+            with self._load_lock:
+                if stamp != self._stamp or self._vectors is None:
+                    # Stempel vor dem Lesen: ändert sich eine Datei währenddessen,
+                    # wird bei der nächsten Abfrage erneut geladen
+                    self._vectors = _load_vectors(self.index_path, self.meta_path)
+                    self._stamp = stamp
+                    print(f"[INFO] Retriever: Index geladen ({self._vectors.built}, "
+                          f"{len(self._vectors.chunks)} Chunks)")
+        return self._vectors
+
+    def search(self, query: str, k: int, nprobe: int | None = None,
+               ef_search: int | None = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """Bis zu k Chunks als (Score, Metadaten), absteigend nach Ähnlichkeit."""
+        index = self.vectors()
+        meta = index.chunks
+        k = min(k, index.index.ntotal)
+        if k <= 0:
+            return []
+        sims, idxs = index.search(self.encode([query]), k, nprobe=nprobe, ef_search=ef_search)
+        # -1 (kein Treffer) und Tombstones haben keine Metadaten
+        return [(float(s), meta[int(i)]) for s, i in zip(sims[0], idxs[0]) if int(i) in meta]
+
+
+_RETRIEVER: Retriever | None = None
+_RETRIEVER_LOCK = threading.Lock()
+
+
+def get_retriever() -> Retriever:
+    """Prozessweiter Retriever (Streamlit importiert das Modul nur einmal pro Server)."""
+    global _RETRIEVER
+    with _RETRIEVER_LOCK:
+        if _RETRIEVER is None:
+            _RETRIEVER = Retriever()
+        return _RETRIEVER
 
 
 # ---------------------------------------------------------------------------
@@ -182,33 +317,26 @@ def _load_vectors() -> Tuple[faiss.IndexFlatIP, List[Dict[str, Any]]]:
 # ---------------------------------------------------------------------------
 
 
-def ask_rag(query: str, n: int = 7, ratio: float = 0.33) -> List[Dict[str, Any]]:
+def ask_rag(query: str, n: int = 7, ratio: float = 0.33, nprobe: int | None = None,
+            ef_search: int | None = None) -> List[Dict[str, Any]]:
     """
     Liefert genau n eindeutige Artikel-Treffer (Titel, URL, published, summary, snippet).
     - ratio: Maximaler Anteil einer einzelnen Quelle (z. B. 0.33 ⇒ höchstens ein Drittel).
+    - nprobe / ef_search: Suchbreite für IVF- bzw. HNSW-Indizes (None = Standard des Index).
     """
     if not query:
         query = SYSTEM_PROMPT
 
-    vectors, meta = _load_vectors()
-    model = SentenceTransformer(EMB_MODEL, device="cpu")
-
-    # Query-Embedding
-    q_vec = model.encode([query], convert_to_numpy=True).astype("float32")
-    faiss.normalize_L2(q_vec)
-
     # Großzügig viele Chunks abrufen, um trotz Filter genügend Artikel zu sammeln
-    k = min(n * 30, vectors.ntotal)          # z. B. n=7 → 210
-    sims, idxs = vectors.search(q_vec, k)
-    sims, idxs = sims[0], idxs[0]
+    hits = get_retriever().search(query, k=n * 30,   # z. B. n=7 → 210
+                                  nprobe=nprobe, ef_search=ef_search)
 
     allowed_per_source = max(1, math.ceil(n * ratio))
     per_source_count: dict[str, int] = {}
     seen_urls: set[str] = set()
     results: List[Dict[str, Any]] = []
 
-    for score, idx in zip(sims, idxs):
-        m         = meta[idx]
+    for score, m in hits:
         url       = m["url"]
         src       = m.get("source", "unknown")
 
@@ -234,6 +362,7 @@ def ask_rag(query: str, n: int = 7, ratio: float = 0.33) -> List[Dict[str, Any]]
                 "url":       url,
                 "published": m["published"],
                 "source":    src,
+                "alt_urls":  m.get("alt_urls", []),
                 "summary":   summary,
                 "snippet":   snippet,
             }
@@ -250,29 +379,68 @@ def ask_rag(query: str, n: int = 7, ratio: float = 0.33) -> List[Dict[str, Any]]
 
 
 def _latest_raw_file() -> Path:
-    '''Gibt die neueste JSON-Datei aus dem Verzeichnis data/raw zurück,
-    die mit articles_raw_ beginnt, und bricht ab, wenn keine vorhanden ist.'''
-    files = sorted(RAW_DIR.glob("articles_raw_*.json"))
+    '''Gibt den neuesten Snapshot aus dem Verzeichnis data/raw zurück
+    (articles_raw_*.jsonl[.gz|.zst] oder ältere *.json) und bricht ab,
+    wenn keiner vorhanden ist.'''
+    files = sorted(RAW_DIR.glob("articles_raw_*.json*"))
     if not files:
         sys.exit("Keine Roh-JSON gefunden – bitte zuerst crawl_all.py ausführen.")
     return files[-1]  # neueste
 
 
-def run_preprocess(raw_path: Path) -> None:
-    """Kompletter Pre-Processing-Flow."""
-    dest_index = VEC_DIR / "articles.index"
-    if dest_index.exists():
+def _iter_input(raw_path: Path, days_back: int) -> Iterable[Dict[str, Any]]:
+    """Snapshot-Datei streamen oder – bei .sqlite – die letzten `days_back` Tage aus dem Artikelspeicher."""
+    if raw_path.suffix != ".sqlite":
+        yield from iter_records(raw_path)
+        return
+    since = datetime.now(timezone.utc) - timedelta(days=days_back)
+    store = ArticleStore(raw_path)
+    try:
+        yield from store.iter_articles(published_since=since)
+    finally:
+        store.close()  # auch bei vorzeitigem Abbruch des Konsumenten
+
+
+def run_preprocess(raw_path: Path, days_back: int = 7, dedup: bool = True,
+                   emb_cache: bool = True, incremental: bool = False,
+                   index_kind: str = INDEX_KIND, storage: str = VECTOR_STORAGE,
+                   pca: int | None = None) -> None:
+    """
+    Kompletter Pre-Processing-Flow (Snapshot oder Artikelspeicher als Quelle).
+    Mit dedup=True werden Near-Duplicates vor dem Chunking zusammengefasst.
+    Mit emb_cache=True werden nur neue Chunks eingebettet (siehe embcache.py).
+    Mit incremental=True werden nur neue/geänderte Artikel in den bestehenden
+    Index übernommen und Artikel älter als `days_back` entfernt (siehe vecindex.py).
+    `index_kind` wählt den FAISS-Indextyp (flat, ivf, ivfpq, hnsw), `storage` und
+    `pca` die Kompression der Vektoren im Index.
+    """
+    spec = check_spec(IndexSpec(index_kind, storage, pca))
+    index = VectorIndex.load(INDEX_PATH, META_PATH) if incremental else None
+    if incremental and index is None:
+        print("[INFO] Kein inkrementeller Index vorhanden – baue neu auf.")
+    elif index is None and INDEX_PATH.exists():
         print("[INFO] Überschreibe bestehenden Index.")
 
     print(f"[INFO] Lade Rohdaten aus {raw_path.name}")
-    records = load_records(raw_path)
-    filtered = records  # keine Keyword‑Filterung mehr
-    print(f"[INFO] Verarbeite {len(filtered)} Artikel (ohne Themenfilter).")
-
-    chunks, meta = clean_and_chunk(filtered)
+    records = _iter_input(raw_path, days_back)  # keine Keyword‑Filterung mehr, gestreamt
+    if dedup:
+        records = collapse_near_duplicates(records)
+    if index is not None:
+        records = (r for r in records if index.article_hash(r["url"]) != article_digest(r))
+
+    chunks, meta = clean_and_chunk(records)
+    print(f"[INFO] {len({m['url'] for m in meta})} Artikel verarbeitet (ohne Themenfilter).")
+    if not chunks and index is None:
+        print("[WARN] Keine Artikel – Index bleibt unverändert.")
+        return
     print(f"[INFO] {len(chunks)} Text-Chunks erzeugt – starte Embedding…")
-    emb = embed_chunks(chunks)
-    build_faiss(emb, meta)
+    cache = EmbeddingCache(EMB_MODEL) if emb_cache else None
+    emb = (embed_chunks(chunks, cache=cache) if chunks
+           else np.empty((0, index.dim), dtype=np.float32))
+    index = build_faiss(emb, meta, index=index, spec=spec,
+                        retention=timedelta(days=days_back) if incremental else None)
+    if cache is not None:
+        cache.compact({chunk_key(EMB_MODEL, m["chunk"]) for m in index.chunks.values()})
 
 
 def build_argparser() -> argparse.ArgumentParser:
@@ -280,7 +448,26 @@ def build_argparser() -> argparse.ArgumentParser:
     mit dem optional ein Pfad zur Rohdaten-JSON (--raw) und eine
     Testabfrage für die RAG-Funktion (--query) übergeben werden können.'''
     p = argparse.ArgumentParser(description="Pre-Processing & FAISS-Build")
-    p.add_argument("--raw", type=Path, help="Pfad zur Roh-JSON")
+    p.add_argument("--raw", type=Path, help="Pfad zum Roh-Snapshot (.jsonl.gz oder .json)")
+    p.add_argument("--store", action="store_true",
+                   help="Artikel aus dem SQLite-Artikelspeicher statt aus einem Snapshot lesen")
+    p.add_argument("--days", type=int, default=7,
+                   help="Mit --store: Artikel der letzten X Tage; mit --incremental zugleich "
+                        "das Aufbewahrungsfenster des Index (Standard: 7)")
+    p.add_argument("--no-dedup", action="store_true",
+                   help="Near-Duplicates nicht zusammenfassen")
+    p.add_argument("--no-emb-cache", action="store_true",
+                   help="Alle Chunks neu einbetten, Embedding-Cache nicht nutzen")
+    p.add_argument("--incremental", action="store_true",
+                   help="Nur neue/geänderte Artikel in den bestehenden Index übernehmen")
+    p.add_argument("--index", choices=INDEX_KINDS, default=INDEX_KIND,
+                   help="FAISS-Indextyp (Standard: flat = exakt)")
+    p.add_argument("--storage", choices=STORAGES, default=VECTOR_STORAGE,
+                   help="Vektoren im Index komprimieren (exakte Nachbewertung von der Platte)")
+    p.add_argument("--pca", type=int, choices=PCA_DIMS,
+                   help="Vektoren vorher per PCA auf so viele Dimensionen reduzieren")
+    p.add_argument("--nprobe", type=int, help="Mit --query: IVF-Listen pro Suche")
+    p.add_argument("--ef-search", type=int, help="Mit --query: HNSW-Suchbreite")
     p.add_argument("--query", type=str, help="Testabfrage für ask_rag()")
     return p
 
@@ -288,12 +475,14 @@ def build_argparser() -> argparse.ArgumentParser:
 def main(argv: List[str] | None = None) -> None:
     args = build_argparser().parse_args(argv)
 
-    raw_file = args.raw or _latest_raw_file()
-    run_preprocess(raw_file)
+    raw_file = args.raw or (ARTICLE_STORE_PATH if args.store else _latest_raw_file())
+    run_preprocess(raw_file, days_back=args.days, dedup=not args.no_dedup,
+                   emb_cache=not args.no_emb_cache, incremental=args.incremental,
+                   index_kind=args.index, storage=args.storage, pca=args.pca)
 
     if args.query:
         print("\n>>> ask_rag:", args.query)
-        for r in ask_rag(args.query):
+        for r in ask_rag(args.query, nprobe=args.nprobe, ef_search=args.ef_search):
             print(f"- {r['title']}  ({r['score']:.2f})\n  {r['url']}\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Wertet das HTML-Archiv (data/archive/, siehe crawler/archive.py) mit den
+aktuellen `parse_article`-Funktionen neu aus – ohne Netz, parallel auf allen
+Kernen. Gedacht für den Fall, dass eine Quelle ihr Markup ändert: Parser
+reparieren, neu auswerten, fertig.
+
+Pro URL wird der jüngste archivierte Stand geparst. Das Ergebnis geht in einen
+frischen Snapshot data/raw/articles_raw_<ts>.jsonl.gz oder mit --store per
+Upsert in den Artikelspeicher.
+
+> python -m scripts.reextract --days 7
+> python -m scripts.reextract --source spiegel --source cio --store
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from scripts.crawler.archive import HTML_ARCHIVE_DIR, ArchiveEntry, HtmlArchive, read_entry
+from scripts.crawler.base import RAW_DIR
+from scripts.crawler.snapshot import COMPRESSIONS, DEFAULT_COMPRESSION, SnapshotWriter, snapshot_path
+from scripts.crawler.store import ARTICLE_STORE_PATH, ArticleStore
+from scripts.crawl_all import SOURCES, _make_parse_pool
+
+BATCH_SIZE = 64  # Archiv-Einträge pro Worker-Aufgabe (weniger IPC-Overhead)
+
+Outcome = Tuple[str, str, Dict[str, Any] | None, str | None]  # (Quelle, URL, Datensatz, Fehler)
+
+
+def _parser_modules() -> Dict[str, str]:
+    """Quelle → Modul mit `parse_article` (z. B. "spiegel" → "scripts.crawler.spiegel")."""
+    return {name: crawl.__module__ for name, crawl in SOURCES}
+
+
+def _extract_batch(root: str, modules: Dict[str, str], entries: List[ArchiveEntry]) -> List[Outcome]:
+    """Läuft im Worker: liest die Einträge per Offset selbst und parst sie."""
+    out: List[Outcome] = []
+    for entry in entries:
+        try:
+            parse = importlib.import_module(modules[entry.source]).parse_article
+            html = read_entry(Path(root), entry)
+            out.append((entry.source, entry.url, parse(html, entry.url, entry.lastmod or ""), None))
+        except Exception as exc:
+            out.append((entry.source, entry.url, None, f"{type(exc).__name__}: {exc}"))
+    return out
+
+
+def run(days_back: int | None = None, sources: List[str] | None = None,
+        workers: int = os.cpu_count() or 1, store: bool = False,
+        compression: str = DEFAULT_COMPRESSION, root: Path = HTML_ARCHIVE_DIR) -> Path:
+    """Parst den jüngsten Stand jeder archivierten URL neu; liefert den Ausgabepfad."""
+    modules = _parser_modules()
+    unknown = set(sources or ()) - set(modules)
+    if unknown:
+        raise ValueError(f"Unbekannte Quelle(n): {', '.join(sorted(unknown))}")
+
+    archive = HtmlArchive(root)
+    since = datetime.now(timezone.utc) - timedelta(days=days_back) if days_back else None
+    entries = [e for e in archive.latest(fetched_since=since)
+               if e.source in modules and (not sources or e.source in sources)]
+    archive.close()
+    print(f"[reextract] {len(entries)} archivierte Seiten, {workers} Worker")
+
+    writer: SnapshotWriter | ArticleStore
+    if store:
+        writer = ArticleStore(ARTICLE_STORE_PATH)
+        write = writer.upsert
+    else:
+        writer = SnapshotWriter(snapshot_path(RAW_DIR, "articles", compression), compression)
+        write = lambda name, record: writer.write(record)
+
+    stats: Dict[str, Counter] = {}
+    start = time.perf_counter()
+    pool = _make_parse_pool(workers)
+    try:
+        batches = [entries[i:i + BATCH_SIZE] for i in range(0, len(entries), BATCH_SIZE)]
+        futures = [pool.submit(_extract_batch, str(root), modules, batch) for batch in batches]
+        for fut in as_completed(futures):
+            for source, url, record, error in fut.result():
+                counter = stats.setdefault(source, Counter())
+                if error is not None:
+                    counter["failed"] += 1
+                    print(f"[{source}] ✖ Fehler bei {url}: {error}", file=sys.stderr)
+                elif record is None:
+                    counter["dropped"] += 1
+                else:
+                    write(source, record)
+                    counter["records"] += 1
+    finally:
+        pool.shutdown(cancel_futures=True)
+        writer.close()
+
+    secs = time.perf_counter() - start
+    print("\n=== NEUAUSWERTUNG ===")
+    for source, counter in sorted(stats.items()):
+        print(f"  {source:<18} {counter['records']:>5} Artikel  {counter['dropped']:>4} verworfen  "
+              f"{counter['failed']:>4} Fehler")
+    rate = len(entries) / secs if secs else 0.0
+    print(f"  {'gesamt':<18} {writer.count:>5} Artikel  in {secs:.1f}s ({rate:.0f} Seiten/s)")
+    print(f"[INFO] Ergebnis in {writer.path}")
+    return writer.path
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="HTML-Archiv mit den aktuellen Parsern neu auswerten")
+    p.add_argument("--days", type=int, default=None,
+                   help="Nur Seiten, die in den letzten N Tagen geladen wurden (Standard: alle)")
+    p.add_argument("--source", dest="sources", action="append",
+                   help="Nur diese Quelle(n) auswerten (mehrfach möglich)")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                   help="Parser-Prozesse (Standard: alle Kerne)")
+    p.add_argument("--store", action="store_true",
+                   help="In den SQLite-Artikelspeicher schreiben statt in einen Snapshot")
+    p.add_argument("--compress", choices=sorted(COMPRESSIONS), default=DEFAULT_COMPRESSION,
+                   help="Kompression des JSONL-Snapshots (Standard: gzip)")
+    p.add_argument("--archive", type=Path, default=HTML_ARCHIVE_DIR, help="Archiv-Verzeichnis")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    run(days_back=args.days, sources=args.sources, workers=args.workers, store=args.store,
+        compression=args.compress, root=args.archive)
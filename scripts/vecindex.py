@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Inkrementell pflegbarer FAISS-Index für `run_preprocess`.
+
+Statt bei jedem Lauf einen neuen `IndexFlatIP` zu bauen, liegen die Vektoren
+unter stabilen Chunk-IDs im Index:
+
+    chunk_id = 63-Bit-Hash(url, content_hash, chunk_no)
+
+Ein unveränderter Artikel behält damit seine IDs und wird gar nicht erst
+eingebettet; ein geänderter bekommt neue IDs, die alten werden zu Tombstones.
+
+- upsert(emb, meta): ersetzt alle Chunks der in `meta` enthaltenen Artikel
+- remove(urls) / expire(cutoff): Artikel als Tombstone markieren – die
+  Metadaten verschwinden sofort (ask_rag überspringt IDs ohne Metadaten), die
+  Vektoren bleiben bis zur nächsten Kompaktierung im Index
+- compact(): entfernt alle Tombstones in einem `remove_ids`-Durchlauf, sobald
+  sie `COMPACT_RATIO` des Index ausmachen
+
+Indextypen (`INDEX_KINDS`, siehe `build_index`):
+
+  flat   – exakt, IndexIDMap2(IndexFlatIP); Standard für ein paar Wochen Daten
+  ivf    – IVF-Flat, nlist ≈ 4·√n, auf einer Stichprobe trainiert
+  ivfpq  – IVF mit Produktquantisierung (d/16 Bytes je Vektor)
+  hnsw   – Graph-Index (M=32); kann nicht löschen, Kompaktierung baut neu auf
+
+Speicherformat der Vektoren im Index (`STORAGES`, optional nach PCA auf 256
+bzw. 128 Dimensionen):
+
+  f32     – volle Genauigkeit (Standard)
+  f16     – halbe Genauigkeit, ½ Speicher
+  int8    – 8-Bit-Skalarquantisierung, ¼ Speicher
+  binary  – 1 Bit je Dimension (nur flat), 1/32 Speicher
+
+Die Vektoren liegen zusätzlich in voller Genauigkeit auf der Platte
+(articles.vectors.<gen>.f32, zeilenweise angehängt, per memmap gelesen). Bei
+komprimierten Formaten holt `search` `RESCORE_FACTOR`-mal so viele Kandidaten
+und bewertet sie daraus exakt nach. Aus derselben Datei wird neu trainiert bzw.
+aufgebaut, ohne erneut einzubetten. Reicht der Bestand fürs Training noch
+nicht, wird vorerst exakt (flat, ohne PCA) indexiert und später umgebaut.
+
+Gespeichert wird erst der Index, dann die Metadaten (articles.index,
+articles.meta.pkl). Passt die Vektoranzahl im Index nach einem Abbruch nicht
+zu den Metadaten, wird er beim Laden aus den Vollvektoren neu aufgebaut.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import pickle
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Set, Tuple
+
+import faiss  # type: ignore
+import numpy as np
+
+META_FORMAT = 4
+COMPACT_RATIO = 0.2         # Tombstones / Index-Größe, ab der kompaktiert wird
+VECTOR_COMPACT_MIN = 1000   # tote Zeilen der Vollvektor-Datei, ab denen sie neu geschrieben wird
+
+INDEX_KINDS = ("flat", "ivf", "ivfpq", "hnsw")
+STORAGES = ("f32", "f16", "int8", "binary")
+PCA_DIMS = (256, 128)
+MIN_TRAIN = {"ivf": 1000, "ivfpq": 10000}  # darunter wird (vorerst) flat indexiert
+MIN_TRAIN_PCA = 1000
+RESCORE_FACTOR = 4          # Kandidaten je Treffer bei komprimierten Vektoren
+TRAIN_SAMPLE = 50_000       # maximale Trainings-Stichprobe (IVF, PCA, int8, binary)
+RETRAIN_GROWTH = 4.0        # neu trainieren, wenn der Bestand so stark gewachsen ist
+DEFAULT_NPROBE = 16
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+DEFAULT_EF_SEARCH = 64
+ADD_BATCH = 10_000
+
+
+def chunk_id(url: str, digest: str, chunk_no: int) -> int:
+    raw = hashlib.blake2b(f"{url}\0{digest}\0{chunk_no}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(raw, "little") & (2**63 - 1)  # FAISS-IDs sind int64
+
+
+def _published_utc(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Index-Fabrik
+# ---------------------------------------------------------------------------
+
+
+def _nlist(n: int) -> int:
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def _pq_m(dim: int) -> int:
+    m = max(1, dim // 16)
+    while dim % m:
+        m -= 1
+    return m
+
+
+_CODECS = {"f32": "Flat", "f16": "SQfp16", "int8": "SQ8", "binary": "LSHt"}
+
+
+class IndexSpec(NamedTuple):
+    kind: str = "flat"
+    storage: str = "f32"
+    pca: int | None = None
+
+    def __str__(self) -> str:
+        return "/".join([self.kind, self.storage] + ([f"pca{self.pca}"] if self.pca else []))
+
+    @property
+    def compressed(self) -> bool:
+        """Scores sind nur Näherungen – Kandidaten werden exakt nachbewertet."""
+        return self.storage != "f32" or self.pca is not None
+
+
+def check_spec(spec: IndexSpec) -> IndexSpec:
+    if spec.kind not in INDEX_KINDS:
+        raise ValueError(f"Unbekannter Indextyp {spec.kind!r} (erlaubt: {', '.join(INDEX_KINDS)})")
+    if spec.storage not in STORAGES:
+        raise ValueError(f"Unbekanntes Speicherformat {spec.storage!r} (erlaubt: {', '.join(STORAGES)})")
+    if spec.pca is not None and spec.pca not in PCA_DIMS:
+        raise ValueError(f"PCA nur auf {' oder '.join(map(str, PCA_DIMS))} Dimensionen")
+    if spec.storage == "binary" and spec.kind != "flat":
+        raise ValueError("Binäre Codes gibt es nur mit dem Indextyp flat")
+    if spec.kind == "ivfpq" and spec.storage != "f32":
+        raise ValueError("ivfpq komprimiert bereits selbst – Speicherformat f32 verwenden")
+    return spec
+
+
+def effective_spec(spec: IndexSpec, n: int, dim: int) -> IndexSpec:
+    """Tatsächlich gebauter Index: IVF-Varianten und PCA erst ab genug Trainingsdaten."""
+    check_spec(spec)
+    if n == 0:
+        return IndexSpec()
+    kind = "flat" if n < MIN_TRAIN.get(spec.kind, 0) else spec.kind
+    pca = spec.pca if spec.pca and spec.pca < dim and n >= MIN_TRAIN_PCA else None
+    return IndexSpec(kind, spec.storage, pca)
+
+
+def _unwrap(index: faiss.Index) -> faiss.Index:
+    """Eigentlicher Suchindex unter IDMap2/PCA-Hülle."""
+    index = faiss.downcast_index(index)
+    while isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2, faiss.IndexPreTransform)):
+        index = faiss.downcast_index(index.index)
+    return index
+
+
+def build_index(spec: IndexSpec, vectors: np.ndarray, ids: np.ndarray, seed: int = 1234) -> faiss.Index:
+    """
+    Baut den Index zu `spec` über (vectors, ids) per `faiss.index_factory`; IVF,
+    PCA, int8 und binary werden auf einer Stichprobe trainiert. Mit PCA oder
+    binären Codes wird nach L2 gesucht (auf normierten Vektoren rangleich zu IP).
+    """
+    n, dim = vectors.shape
+    spec = effective_spec(spec, n, dim)
+    d = spec.pca or dim
+    codec = _CODECS[spec.storage]
+    if spec.kind == "flat":
+        body = codec
+    elif spec.kind == "hnsw":
+        body = f"HNSW{HNSW_M}" + ("" if spec.storage == "f32" else f"_{codec}")
+    elif spec.kind == "ivf":
+        body = f"IVF{_nlist(n)},{codec}"
+    else:
+        body = f"IVF{_nlist(n)},PQ{_pq_m(d)}x8"
+    parts = ([] if spec.kind in ("ivf", "ivfpq") else ["IDMap2"])  # IVF verwaltet IDs selbst
+    parts += [f"PCA{spec.pca}"] if spec.pca else []
+    metric = (faiss.METRIC_L2 if spec.pca or spec.storage == "binary"
+              else faiss.METRIC_INNER_PRODUCT)
+    index = faiss.index_factory(dim, ",".join(parts + [body]), metric)
+
+    inner = _unwrap(index)
+    if isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        inner.hnsw.efSearch = DEFAULT_EF_SEARCH
+    if not index.is_trained:
+        sample = np.random.default_rng(seed).choice(n, size=min(n, TRAIN_SAMPLE), replace=False)
+        index.train(np.ascontiguousarray(vectors[np.sort(sample)], dtype=np.float32))
+    if isinstance(inner, faiss.IndexIVF):
+        inner.nprobe = min(DEFAULT_NPROBE, inner.nlist)
+    for start in range(0, n, ADD_BATCH):
+        index.add_with_ids(np.ascontiguousarray(vectors[start:start + ADD_BATCH], dtype=np.float32),
+                           np.ascontiguousarray(ids[start:start + ADD_BATCH], dtype=np.int64))
+    return index
+
+
+def rescore(queries: np.ndarray, candidates: np.ndarray, k: int,
+            fetch: Callable[[List[int]], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exakte Skalarprodukte für die Kandidaten-IDs (-1 = leer) jeder Abfrage,
+    `fetch` liefert die Vollvektoren; Ergebnis wie `faiss.Index.search`.
+    """
+    sims = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    ids = np.full((len(queries), k), -1, dtype=np.int64)
+    for qi, (q, cand) in enumerate(zip(queries, candidates)):
+        cand = cand[cand >= 0]
+        if not len(cand):
+            continue
+        scores = fetch(cand.tolist()) @ q
+        top = np.argsort(-scores, kind="stable")[:k]
+        sims[qi, :len(top)], ids[qi, :len(top)] = scores[top], cand[top]
+    return sims, ids
+
+
+def search_params(index: faiss.Index, nprobe: int | None = None,
+                  ef_search: int | None = None) -> faiss.SearchParameters | None:
+    """Suchparameter pro Abfrage (thread-sicher, der Index selbst bleibt unverändert)."""
+    inner = _unwrap(index)
+    if nprobe is not None and isinstance(inner, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(nprobe=nprobe)
+    if ef_search is not None and isinstance(inner, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=ef_search)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Index mit Metadaten
+# ---------------------------------------------------------------------------
+
+
+class VectorIndex:
+    """FAISS-Index plus Metadaten je Chunk, Chunk-IDs je Artikel und Vollvektoren auf der Platte."""
+
+    def __init__(self, dim: int, index_path: Path, meta_path: Path,
+                 spec: IndexSpec = IndexSpec()) -> None:
+        self.dim = dim
+        self.spec = check_spec(spec)
+        self.index_path = index_path
+        self.meta_path = meta_path
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.built = IndexSpec()
+        self.trained_on = 0
+        self.chunks: Dict[int, Dict[str, Any]] = {}
+        self.articles: Dict[str, Dict[str, Any]] = {}  # url → {"hash", "ids", "published"}
+        self.tombstones: Set[int] = set()
+        self.rows: Dict[int, int] = {}                 # chunk_id → Zeile in der Vollvektor-Datei
+        existing = [int(fp.name.split(".")[-2]) for fp in self._vector_files()]
+        self.generation = max(existing, default=-1) + 1
+        self._matrix: np.ndarray | None = None
+
+    # ------------------------------------------------------- Laden/Speichern
+    @classmethod
+    def load(cls, index_path: Path, meta_path: Path) -> "VectorIndex | None":
+        """None, wenn kein Index existiert oder er in einem älteren Format vorliegt."""
+        if not (index_path.exists() and meta_path.exists()):
+            return None
+        with open(meta_path, "rb") as fh:
+            data = pickle.load(fh)
+        if not isinstance(data, dict) or data.get("format") != META_FORMAT:
+            return None
+        self = cls.__new__(cls)
+        self.index_path, self.meta_path = index_path, meta_path
+        for key in ("dim", "trained_on", "generation", "chunks", "articles", "rows"):
+            setattr(self, key, data[key])
+        self.spec, self.built = IndexSpec(*data["spec"]), IndexSpec(*data["built"])
+        self.tombstones = set(data["tombstones"])
+        self._matrix = None
+        self.index = faiss.read_index(str(index_path))
+
+        # Abbruch zwischen Index- und Metadaten-Schreiben: aus den Vollvektoren neu aufbauen
+        if self.index.ntotal != len(self.chunks) + len(self.tombstones):
+            print(f"[WARN] Index ({self.index.ntotal}) passt nicht zu den Metadaten "
+                  f"({len(self.chunks)} + {len(self.tombstones)} Tombstones) – baue neu auf")
+            self.rebuild()
+        return self
+
+    @classmethod
+    def load_legacy(cls, index_path: Path, meta_path: Path) -> "VectorIndex":
+        """Nur zum Suchen: älteres Format (Flat + Metadaten-Liste bzw. Format 2) ohne Vollvektoren."""
+        with open(meta_path, "rb") as fh:
+            data = pickle.load(fh)
+        self = cls.__new__(cls)
+        self.index_path, self.meta_path = index_path, meta_path
+        self.index = faiss.read_index(str(index_path))
+        self.dim, self.spec, self.built = self.index.d, IndexSpec(), IndexSpec()
+        self.trained_on, self.generation = self.index.ntotal, 0
+        # Metadaten-Liste: ID = Position im Flat-Index
+        self.chunks = dict(enumerate(data)) if isinstance(data, list) else data["chunks"]
+        self.articles, self.rows, self.tombstones = {}, {}, set()
+        self._matrix = None
+        return self
+
+    def save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_index = self.index_path.with_name(self.index_path.name + ".tmp")
+        faiss.write_index(self.index, str(tmp_index))
+        os.replace(tmp_index, self.index_path)
+
+        tmp_meta = self.meta_path.with_name(self.meta_path.name + ".tmp")
+        with open(tmp_meta, "wb") as fh:
+            pickle.dump({"format": META_FORMAT, "dim": self.dim, "spec": tuple(self.spec),
+                         "built": tuple(self.built), "trained_on": self.trained_on,
+                         "generation": self.generation, "chunks": self.chunks,
+                         "articles": self.articles, "rows": self.rows,
+                         "tombstones": sorted(self.tombstones)}, fh,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_meta, self.meta_path)
+
+        # Vollvektoren älterer Generationen werden erst jetzt nicht mehr referenziert
+        for fp in self._vector_files():
+            if fp != self._vec_fp:
+                fp.unlink(missing_ok=True)
+
+    # --------------------------------------------------------- Vollvektoren
+    @property
+    def _vec_fp(self) -> Path:
+        return self.index_path.with_name(f"{self.index_path.stem}.vectors.{self.generation}.f32")
+
+    def _vector_files(self) -> List[Path]:
+        return sorted(self.index_path.parent.glob(f"{self.index_path.stem}.vectors.*.f32"))
+
+    def _file_rows(self) -> int:
+        return self._vec_fp.stat().st_size // (4 * self.dim) if self._vec_fp.exists() else 0
+
+    def _matrix_view(self) -> np.ndarray:
+        if self._matrix is None:
+            n = self._file_rows()
+            self._matrix = (np.memmap(self._vec_fp, dtype=np.float32, mode="r", shape=(n, self.dim))
+                            if n else np.empty((0, self.dim), dtype=np.float32))
+        return self._matrix
+
+    def _append_vectors(self, vectors: np.ndarray) -> np.ndarray:
+        """Hängt Vektoren an (vor dem Index-Schreiben, damit `rebuild` immer alles findet)."""
+        self._vec_fp.parent.mkdir(parents=True, exist_ok=True)
+        start = self._file_rows()  # eine nach einem Abbruch halbe Zeile am Ende wird überschrieben
+        with open(self._vec_fp, "r+b" if self._vec_fp.exists() else "wb") as fh:
+            fh.seek(start * 4 * self.dim)
+            fh.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            fh.truncate()
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._matrix = None
+        return np.arange(start, start + len(vectors), dtype=np.int64)
+
+    def vectors(self, ids: Iterable[int]) -> np.ndarray:
+        """Vollvektoren (float32) zu den Chunk-IDs, in derselben Reihenfolge."""
+        rows = np.fromiter((self.rows[i] for i in ids), dtype=np.int64)
+        return np.asarray(self._matrix_view()[rows])
+
+    def _rewrite_vectors(self) -> None:
+        """Neue Generation der Vollvektor-Datei nur mit lebenden Zeilen (gilt ab `save`)."""
+        ids = sorted(self.rows, key=self.rows.__getitem__)
+        src = self._matrix_view()
+        self.generation += 1
+        self._vec_fp.unlink(missing_ok=True)  # Rest eines abgebrochenen Versuchs
+        rows: Dict[int, int] = {}
+        for start in range(0, len(ids), ADD_BATCH):
+            batch = ids[start:start + ADD_BATCH]
+            vecs = np.asarray(src[[self.rows[i] for i in batch]])
+            rows.update(zip(batch, self._append_vectors(vecs).tolist()))
+        print(f"[INFO] Vollvektoren neu geschrieben: {len(src) - len(ids)} tote Zeilen entfernt")
+        self.rows = rows
+
+    # ------------------------------------------------------------- Ändern
+    def article_hash(self, url: str) -> str | None:
+        entry = self.articles.get(url)
+        return entry["hash"] if entry else None
+
+    def upsert(self, emb: np.ndarray, meta: List[Dict[str, Any]]) -> int:
+        """
+        Fügt die Chunks aus (emb, meta) ein; vorhandene Chunks derselben Artikel
+        werden zu Tombstones. `meta` braucht url, content_hash und chunk_no.
+        Doppelte Chunks im Batch zählen einmal, bei mehreren Fassungen eines
+        Artikels gilt die letzte.
+        """
+        if not meta:
+            return 0
+        latest = {m["url"]: m["content_hash"] for m in meta}
+        keep: Dict[int, int] = {}  # chunk_id → Position in (emb, meta)
+        for pos, m in enumerate(meta):
+            if m["content_hash"] == latest[m["url"]]:
+                keep.setdefault(chunk_id(m["url"], m["content_hash"], m["chunk_no"]), pos)
+        self.remove(latest)
+        ids = np.fromiter(keep, dtype=np.int64, count=len(keep))
+        emb = np.ascontiguousarray(np.asarray(emb, dtype=np.float32)[list(keep.values())])
+        meta = [meta[pos] for pos in keep.values()]
+
+        # Artikel kommt in einer schon einmal indexierten Fassung zurück (A→B→A):
+        # die alte Kopie steckt noch als Tombstone im Index
+        revived = self.tombstones.intersection(keep)
+        rows = self._append_vectors(emb)
+        if revived and self.built.kind == "hnsw":
+            # HNSW kann nicht löschen – gleiche Chunk-ID heißt gleicher Text,
+            # also die alte Kopie wiederbeleben statt doppelt einzufügen
+            fresh = np.fromiter((cid not in revived for cid in keep), dtype=bool, count=len(keep))
+            self.index.add_with_ids(emb[fresh], ids[fresh])
+        else:
+            if revived:
+                self.index.remove_ids(np.fromiter(revived, dtype=np.int64, count=len(revived)))
+            self.index.add_with_ids(emb, ids)
+        self.tombstones -= revived
+        for cid, row, m in zip(ids.tolist(), rows.tolist(), meta):
+            self.chunks[cid] = m
+            self.rows[cid] = row
+            entry = self.articles.setdefault(
+                m["url"], {"hash": m["content_hash"], "ids": [], "published": m.get("published")})
+            entry["ids"].append(cid)
+        return len(meta)
+
+    def remove(self, urls: Iterable[str]) -> int:
+        """Markiert alle Chunks der Artikel als Tombstone; liefert die Anzahl der Chunks."""
+        n = 0
+        for url in urls:
+            entry = self.articles.pop(url, None)
+            if entry is None:
+                continue
+            for cid in entry["ids"]:
+                self.chunks.pop(cid, None)
+                self.rows.pop(cid, None)
+                self.tombstones.add(cid)
+            n += len(entry["ids"])
+        return n
+
+    def expire(self, cutoff: datetime) -> int:
+        """Entfernt Artikel, die vor `cutoff` veröffentlicht wurden (Aufbewahrungsfenster)."""
+        old = [url for url, entry in self.articles.items()
+               if (dt := _published_utc(entry.get("published"))) is not None and dt < cutoff]
+        n = self.remove(old)
+        if old:
+            print(f"[INFO] {len(old)} Artikel ({n} Chunks) außerhalb des Fensters entfernt")
+        return n
+
+    # ---------------------------------------------------------- Kompaktieren
+    def rebuild(self, spec: IndexSpec | None = None) -> None:
+        """Index aus den Vollvektoren neu aufbauen (neu trainieren, Tombstones verwerfen)."""
+        if spec is not None:
+            self.spec = check_spec(spec)
+        ids = np.fromiter(self.rows, dtype=np.int64, count=len(self.rows))
+        self.index = build_index(self.spec, self.vectors(ids.tolist()), ids)
+        self.built = effective_spec(self.spec, len(ids), self.dim)
+        self.trained_on = len(ids)
+        self.tombstones.clear()
+        print(f"[INFO] Index neu aufgebaut: {self.built}, {len(ids)} Vektoren")
+
+    def _needs_rebuild(self) -> bool:
+        n = len(self.rows)
+        if self.built != effective_spec(self.spec, n, self.dim):
+            return True  # Typ/Format gewechselt oder jetzt genug Daten fürs Training
+        trained = self.built.kind in ("ivf", "ivfpq") or self.built.pca or self.built.storage in ("int8", "binary")
+        if trained and n > RETRAIN_GROWTH * max(1, self.trained_on):
+            return True  # Zentroiden/Quantisierer passen nicht mehr zum Bestand
+        return self.built.kind == "hnsw" and len(self.tombstones) >= COMPACT_RATIO * max(1, n)
+
+    def compact(self, force: bool = False) -> int:
+        """
+        Tombstones physisch entfernen (ein `remove_ids`-Durchlauf; HNSW wird neu
+        aufgebaut) und die Vollvektor-Datei bei vielen toten Zeilen neu schreiben.
+        Liefert die Anzahl entfernter Tombstones.
+        """
+        removed = len(self.tombstones)
+        if self._needs_rebuild() or (force and removed and self.built.kind == "hnsw"):
+            self.rebuild()
+        elif removed and (force or removed >= COMPACT_RATIO * max(1, self.index.ntotal)):
+            self.index.remove_ids(np.fromiter(self.tombstones, dtype=np.int64, count=removed))
+            print(f"[INFO] Index kompaktiert: {removed} Tombstones entfernt")
+            self.tombstones.clear()
+        else:
+            removed = 0
+
+        dead = self._file_rows() - len(self.rows)
+        if dead >= VECTOR_COMPACT_MIN and (force or dead > len(self.rows)):
+            self._rewrite_vectors()
+        return removed
+
+    # ---------------------------------------------------------------- Suche
+    def search(self, queries: np.ndarray, k: int, nprobe: int | None = None,
+               ef_search: int | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (Scores, Chunk-IDs) wie `faiss.Index.search`. Ohne Kompression sind
+        Tombstones noch enthalten; komprimierte Treffer werden aus den
+        Vollvektoren exakt nachbewertet und enthalten nur lebende Chunks.
+        """
+        params = search_params(self.index, nprobe, ef_search)
+        if not (self.built.compressed and self.rows):
+            return self.index.search(queries, k, params=params)
+        fetch = min(k * RESCORE_FACTOR, self.index.ntotal)
+        _, cand = self.index.search(queries, fetch, params=params)
+        live = np.fromiter((int(i) in self.rows for i in cand.ravel()), dtype=bool, count=cand.size)
+        return rescore(queries, np.where(live.reshape(cand.shape), cand, -1), k, self.vectors)
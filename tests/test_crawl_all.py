@@ -0,0 +1,49 @@
+"""Deterministische Snapshot-Reihenfolge im parallelen Modus von scripts/crawl_all.py."""
+
+import random
+import threading
+import time
+
+from scripts.crawl_all import _OrderedWrite
+
+NAMES = ["spiegel", "ifun", "cio", "netzpolitik"]
+
+
+def _records(name: str) -> list[dict]:
+    return [{"source": name, "url": f"https://{name}.example/{i}", "text": "ä"} for i in range(20)]
+
+
+def test_parallel_sources_are_written_in_source_order():
+    out: list[tuple[str, dict]] = []
+    ordered = _OrderedWrite(NAMES, lambda name, record: out.append((name, record)))
+    rng = random.Random(7)
+    delays = {name: [rng.random() / 500 for _ in range(20)] for name in NAMES}
+
+    def crawl(name: str) -> None:
+        for record, delay in zip(_records(name), delays[name]):
+            time.sleep(delay)
+            ordered(name, record)
+
+    threads = {name: threading.Thread(target=crawl, args=(name,)) for name in NAMES}
+    for t in threads.values():
+        t.start()
+    for name in reversed(NAMES):  # fertig in umgekehrter Reihenfolge
+        threads[name].join()
+        ordered.finish(name)
+    ordered.close()
+
+    assert out == [(name, r) for name in NAMES for r in _records(name)]
+
+
+def test_head_source_streams_directly():
+    out: list[str] = []
+    ordered = _OrderedWrite(NAMES, lambda name, record: out.append(record["url"]))
+    ordered("spiegel", {"url": "a"})
+    ordered("ifun", {"url": "b"})
+    assert out == ["a"]  # ifun wartet, bis spiegel fertig ist
+    ordered.finish("cio")
+    ordered.finish("spiegel")
+    assert out == ["a", "b"]
+    ordered("ifun", {"url": "c"})
+    ordered.finish("ifun")
+    assert out == ["a", "b", "c"]
@@ -0,0 +1,73 @@
+"""Near-Duplicate-Erkennung (scripts/dedup.py)."""
+
+import random
+
+from scripts.dedup import collapse_near_duplicates, minhash_signature
+
+_WORDS = ("bank zahlung kunde plattform api konto karte kredit fintech daten "
+          "sicherheit regulierung markt partner produkt start digital mobil wallet "
+          "betrug analyse modell quartal umsatz wachstum team").split()
+
+
+def _text(seed: int, n: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _rec(url: str, text: str, published: str = "2026-10-01T08:00:00+00:00") -> dict:
+    return {"url": url, "title": url.rsplit("/", 1)[1], "text": text, "published": published}
+
+
+def test_near_copies_collapse_to_earliest_original():
+    press = _text(1)
+    copy = press.replace("bank", "Bank", 1) + " Quelle: Pressemitteilung"  # Groß/Klein zählt nicht
+    records = [
+        _rec("https://financefwd.example/kopie", copy, "2026-10-01T10:00:00+00:00"),
+        _rec("https://other.example/eigenes-thema", _text(2)),
+        _rec("https://paymentandbanking.example/original", press, "2026-10-01T08:00:00+00:00"),
+    ]
+    out = collapse_near_duplicates(records)
+    assert [r["url"] for r in out] == ["https://paymentandbanking.example/original",
+                                       "https://other.example/eigenes-thema"]
+    assert out[0]["alt_urls"] == ["https://financefwd.example/kopie"]
+    assert "alt_urls" not in out[1]
+
+
+def test_distinct_articles_are_kept_in_order():
+    records = [_rec(f"https://x.example/{i}", _text(100 + i)) for i in range(20)]
+    assert collapse_near_duplicates(records) == records
+
+
+def test_tie_on_published_keeps_longest_text():
+    text = _text(3)
+    short = _rec("https://a.example/kurz", text)
+    long = _rec("https://b.example/lang", text + " " + "ergänzung")
+    (out,) = collapse_near_duplicates([short, long])
+    assert out["url"] == "https://b.example/lang"
+    assert out["alt_urls"] == ["https://a.example/kurz"]
+
+
+def test_group_of_three_merges_alt_urls():
+    base = _text(4, 400).split()
+    a = " ".join(base)
+    b = " ".join(base[:-8] + _text(5, 8).split())     # leicht abgewandelt
+    c = " ".join(base[:-16] + _text(6, 16).split())
+    records = [_rec("https://a.example/1", a), _rec("https://b.example/1", b),
+               {**_rec("https://c.example/1", c), "alt_urls": ["https://c.example/amp"]}]
+    (out,) = collapse_near_duplicates(records)
+    assert sorted([out["url"]] + out["alt_urls"]) == sorted(
+        ["https://a.example/1", "https://b.example/1", "https://c.example/1", "https://c.example/amp"])
+
+
+def test_short_texts_are_never_merged():
+    records = [_rec("https://x.example/a", "kurz"), _rec("https://x.example/b", "kurz")]
+    assert minhash_signature("kurz") is None
+    assert collapse_near_duplicates(records) == records
+
+
+def test_threshold_separates_partial_overlap():
+    base = _text(7, 300).split()
+    half = " ".join(base[:150] + _text(8, 150).split())
+    records = [_rec("https://x.example/a", " ".join(base)), _rec("https://x.example/b", half)]
+    assert len(collapse_near_duplicates(records)) == 2
+    assert len(collapse_near_duplicates(records, threshold=0.2, bands=64)) == 1
@@ -0,0 +1,105 @@
+"""Backpressure der Async‑Fetch‑Engine in scripts/crawler/base.py."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.crawler import base
+from scripts.crawler.ratelimit import HostRateLimiter
+from scripts.crawler.schedule import CrawlBudget
+
+CONCURRENCY = 4
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+    paths: list[str] = []
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:
+        with self.lock:
+            type(self).hits += 1
+            self.paths.append(self.path)
+        body = f"<html><body>{self.path}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(base, "HTTP_CACHE", None)
+    monkeypatch.setattr(base, "RATE_LIMITER",
+                        HostRateLimiter(rate=1000.0, max_rate=1000.0, concurrency=8.0))
+    _Handler.hits = 0
+    _Handler.paths = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_many_returns_every_url(server):
+    urls = [f"{server}/a{i}" for i in range(40)]
+    results = list(base.fetch_many(urls, concurrency=CONCURRENCY))
+    assert sorted(r.url for r in results) == sorted(urls)
+    assert all(r.error is None and r.url.rsplit("/", 1)[1] in r.text for r in results)
+
+
+def test_slow_consumer_stops_downloads(server):
+    urls = [f"{server}/a{i}" for i in range(200)]
+    results = base.fetch_many(urls, concurrency=CONCURRENCY)
+    for _ in range(10):
+        next(results)
+    time.sleep(0.5)  # Verbraucher hängt: Worker dürfen nur den Puffer füllen
+    hits = _Handler.hits
+    results.close()
+    assert hits <= 10 + 3 * CONCURRENCY + 2
+
+
+def _parse(html: str, url: str, lastmod: str) -> dict:
+    return {"url": url, "published": lastmod, "content": html}
+
+
+def test_crawl_links_fetches_in_budget_order(server):
+    links = [(f"{server}/{name}", "2026-10-01") for name in
+             ("impressum", "ki-bank", "sport", "open-banking-api", "wetter")]
+    budget = CrawlBudget(60)
+    expected = [url for url, _ in budget.order("spiegel", links, base.crawl_now())]
+    records = base.crawl_links("spiegel", links, _parse, concurrency=1, budget=budget)
+    assert [f"{server}{path}" for path in _Handler.paths] == expected
+    assert [r["url"] for r in records] == expected
+
+
+def test_crawl_links_starts_nothing_after_budget_expired(server):
+    links = [(f"{server}/a{i}", "2026-10-01") for i in range(50)]
+    budget = CrawlBudget(0)
+    assert base.crawl_links("spiegel", links, _parse, concurrency=4, budget=budget) == []
+    assert _Handler.hits == 0
+    assert budget.total_skipped == 50
+
+
+def test_failed_sink_leaves_url_for_next_run(server, tmp_path):
+    from scripts.crawler.state import CrawlState
+
+    state = CrawlState(tmp_path / "state.sqlite")
+    links = [(f"{server}/ki-bank", "2026-10-01")]
+
+    def broken(record: dict) -> None:
+        raise OSError("Platte voll")
+
+    base.crawl_links("spiegel", links, _parse, sink=broken, state=state)
+    assert state.needs_fetch(*links[0])
+    stored: list[dict] = []
+    base.crawl_links("spiegel", links, _parse, sink=stored.append, state=state)
+    assert [r["url"] for r in stored] == [links[0][0]]
+    assert not state.needs_fetch(*links[0])
@@ -0,0 +1,140 @@
+"""Reihenfolge, Wecken und Nachregeln von scripts/crawler/ratelimit.HostRateLimiter."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from scripts.crawler.ratelimit import HostRateLimiter, parse_retry_after
+
+HOST = "example.org"
+
+
+def _fast(**kwargs) -> HostRateLimiter:
+    opts = {"rate": 1000.0, "max_rate": 1000.0, "concurrency": 1.0, **kwargs}
+    return HostRateLimiter(**opts)
+
+
+def test_waiters_are_served_in_arrival_order():
+    limiter = _fast(max_concurrency=1)
+    order: list[int] = []
+
+    async def request(i: int) -> None:
+        await limiter.aacquire(HOST)
+        order.append(i)
+        await asyncio.sleep(0.001)
+        limiter.release(HOST, 0.001, 200)
+
+    async def main() -> None:
+        tasks = []
+        for i in range(50):
+            tasks.append(asyncio.create_task(request(i)))
+            await asyncio.sleep(0)  # Ankunftsreihenfolge festlegen
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == list(range(50))
+
+
+def test_release_wakes_waiter_without_polling():
+    limiter = _fast()
+
+    async def main() -> float:
+        await limiter.aacquire(HOST)
+        waiter = asyncio.create_task(limiter.aacquire(HOST))
+        await asyncio.sleep(0.2)
+        assert not waiter.done()  # nur das Parallelitäts‑Limit blockiert
+        released = time.monotonic()
+        limiter.release(HOST, 0.01, 200)
+        await waiter
+        return time.monotonic() - released
+
+    assert asyncio.run(main()) < 0.05
+
+
+def test_sync_and_async_waiters_share_the_queue():
+    limiter = _fast()
+    limiter.acquire(HOST)
+    done = threading.Event()
+
+    def blocked() -> None:
+        limiter.acquire(HOST)
+        done.set()
+
+    thread = threading.Thread(target=blocked)
+    thread.start()
+    time.sleep(0.05)
+    assert not done.is_set()
+    limiter.release(HOST, 0.01, 200)
+    assert done.wait(1.0)
+    thread.join()
+
+
+def test_token_wait_is_timed_not_polled():
+    limiter = HostRateLimiter(rate=10.0, max_rate=10.0, concurrency=8.0)
+
+    async def main() -> float:
+        start = time.monotonic()
+        for _ in range(4):  # 1 Token vorrätig, dann 10/s
+            await limiter.aacquire(HOST)
+            limiter.release(HOST, 0.001, 404)
+        return time.monotonic() - start
+
+    assert 0.25 <= asyncio.run(main()) < 0.6
+
+
+def test_cancelled_waiter_leaves_queue_and_returns_slot():
+    limiter = _fast()
+
+    async def main() -> None:
+        await limiter.aacquire(HOST)
+        first = asyncio.create_task(limiter.aacquire(HOST))
+        second = asyncio.create_task(limiter.aacquire(HOST))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        limiter.release(HOST, 0.01, 200)
+        await asyncio.wait_for(second, 1.0)
+
+    asyncio.run(main())
+
+
+def test_throttle_halves_rate_and_concurrency():
+    limiter = HostRateLimiter(rate=8.0, concurrency=4.0)
+    limiter.acquire(HOST)
+    limiter.release(HOST, 0.1, 503)
+    rate, parallel, _ = limiter.snapshot()[HOST]
+    assert rate == 4.0 and parallel == 2
+
+    # Schwall paralleler Fehler: höchstens ein Schnitt pro Antwortzeit
+    limiter.release(HOST, 0.1, 503)
+    assert limiter.snapshot()[HOST][0] == 4.0
+
+
+def test_success_increases_rate_up_to_max():
+    limiter = HostRateLimiter(rate=1.0, max_rate=1.5, step=0.25)
+    for _ in range(4):
+        limiter.release(HOST, 0.01, 200)
+    assert limiter.snapshot()[HOST][0] == 1.5
+
+
+def test_retry_after_blocks_host():
+    limiter = _fast(concurrency=4.0)
+
+    async def main() -> float:
+        await limiter.aacquire(HOST)
+        limiter.release(HOST, 0.01, 429, retry_after=0.2)
+        start = time.monotonic()
+        await limiter.aacquire(HOST)
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 0.19
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("bald") is None
+    assert parse_retry_after(None) is None
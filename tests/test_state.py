@@ -0,0 +1,100 @@
+"""Inkrementeller Crawl‑Zustand (scripts/crawler/state.py) und Feed‑Lastmod."""
+
+from datetime import timedelta, timezone
+
+import pytest
+
+from scripts.crawler import base
+from scripts.crawler.base import iter_feed
+from scripts.crawler.state import CrawlState
+
+URL = "https://example.org/artikel/ki-im-banking"
+RECORD = {"title": "KI im Banking", "text": "Inhalt"}
+
+
+@pytest.fixture
+def state(tmp_path):
+    return CrawlState(tmp_path / "state.sqlite")
+
+
+def test_unknown_url_needs_fetch(state):
+    assert state.needs_fetch(URL, "2026-10-01T08:00:00+00:00")
+
+
+def test_same_lastmod_is_skipped(state):
+    state.record("x", URL, "2026-10-01T08:00:00+00:00", RECORD)
+    assert not state.needs_fetch(URL, "2026-10-01T08:00:00+00:00")
+    assert not state.needs_fetch(URL + "?utm_source=feed", "2026-10-01T08:00:00+00:00")
+
+
+def test_newer_lastmod_needs_fetch(state):
+    state.record("x", URL, "2026-10-01T08:00:00+00:00", RECORD)
+    assert state.needs_fetch(URL, "2026-10-02T09:30:00+00:00")
+
+
+def test_same_instant_in_other_notation_is_skipped(state):
+    # Sitemap mit Ortszeit, Feed als UTC‑isoformat – derselbe Zeitpunkt
+    state.record("x", URL, "2026-10-01T10:00:00+02:00", RECORD)
+    assert not state.needs_fetch(URL, "2026-10-01T08:00:00+00:00")
+    assert not state.needs_fetch(URL, "2026-10-01T08:00:00Z")
+
+
+def test_switch_between_sitemap_and_feed_does_not_refetch(state):
+    # Sitemap‑Lastmod (geändert) gespeichert, Feed liefert nur das ältere pubDate
+    state.record("x", URL, "2026-10-03T12:00:00+00:00", RECORD)
+    assert not state.needs_fetch(URL, "2026-10-01T08:00:00+00:00")
+
+
+def test_unparsable_lastmod_falls_back_to_text(state):
+    state.record("x", URL, "gestern", RECORD)
+    assert not state.needs_fetch(URL, "gestern")
+    assert state.needs_fetch(URL, "heute")
+
+
+def test_record_reports_delta(state):
+    assert state.record("x", URL, "2026-10-01", RECORD) == "new"
+    assert state.record("x", URL, "2026-10-02", RECORD) == "unchanged"
+    assert state.record("x", URL, "2026-10-03", {**RECORD, "text": "neu"}) == "changed"
+
+
+def test_feed_reports_published_and_updated():
+    atom = b"""<?xml version="1.0"?>
+    <feed xmlns="http://www.w3.org/2005/Atom">
+      <entry><link href="https://example.org/a"/>
+        <published>2026-10-01T08:00:00Z</published>
+        <updated>2026-10-02T09:00:00Z</updated></entry>
+      <entry><link href="https://example.org/b"/>
+        <published>2026-10-01T07:00:00Z</published></entry>
+    </feed>"""
+    rss = b"""<?xml version="1.0"?>
+    <rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>
+      <item><link>https://example.org/c</link>
+        <pubDate>Thu, 01 Oct 2026 08:00:00 +0000</pubDate>
+        <atom:updated>2026-10-02T10:00:00+00:00</atom:updated></item>
+    </channel></rss>"""
+    got = {link: (pub.isoformat(), upd and upd.isoformat())
+           for link, pub, upd in list(iter_feed(atom)) + list(iter_feed(rss))}
+    assert got == {
+        "https://example.org/a": ("2026-10-01T08:00:00+00:00", "2026-10-02T09:00:00+00:00"),
+        "https://example.org/b": ("2026-10-01T07:00:00+00:00", None),
+        "https://example.org/c": ("2026-10-01T08:00:00+00:00", "2026-10-02T10:00:00+00:00"),
+    }
+
+
+def test_feed_window_follows_publication_date(monkeypatch):
+    now = base.crawl_now().astimezone(timezone.utc)
+
+    def stamp(days: float) -> str:
+        return (now - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    atom = f"""<?xml version="1.0"?>
+    <feed xmlns="http://www.w3.org/2005/Atom">
+      <entry><link href="https://example.org/neu"/>
+        <published>{stamp(1)}</published><updated>{stamp(0.5)}</updated></entry>
+      <entry><link href="https://example.org/alt-korrigiert"/>
+        <published>{stamp(9)}</published><updated>{stamp(0.2)}</updated></entry>
+    </feed>""".encode()
+    monkeypatch.setattr(base, "fetch_bytes", lambda url, ttl=None: atom)
+    links = base.collect_feed_links("https://example.org/feed/", days_back=7)
+    assert links == [("https://example.org/neu",
+                      (now - timedelta(days=0.5)).replace(microsecond=0).isoformat())]
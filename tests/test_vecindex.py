@@ -0,0 +1,135 @@
+"""Upsert/Remove/Compact/Load-Rundläufe von scripts/vecindex.VectorIndex."""
+
+import faiss  # type: ignore
+import numpy as np
+import pytest
+
+from scripts.vecindex import IndexSpec, VectorIndex, chunk_id
+
+DIM = 16
+
+
+def _article(url: str, digest: str, n: int, seed: int) -> tuple[np.ndarray, list[dict]]:
+    emb = np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    meta = [{"url": url, "content_hash": digest, "chunk_no": i, "text": f"{url} {digest} {i}",
+             "published": "2026-10-01T00:00:00+00:00"} for i in range(n)]
+    return emb, meta
+
+
+def _index(tmp_path, kind: str = "flat") -> VectorIndex:
+    return VectorIndex(DIM, tmp_path / "articles.index", tmp_path / "articles.meta.pkl",
+                       IndexSpec(kind))
+
+
+def _consistent(vi: VectorIndex) -> None:
+    assert vi.index.ntotal == len(vi.chunks) + len(vi.tombstones)
+    assert not vi.tombstones & vi.chunks.keys()
+    for url, entry in vi.articles.items():
+        assert len(entry["ids"]) == len(set(entry["ids"]))
+        assert all(vi.chunks[cid]["url"] == url for cid in entry["ids"])
+
+
+@pytest.mark.parametrize("kind", ["flat", "hnsw"])
+def test_upsert_back_to_previous_version_keeps_vectors(tmp_path, kind):
+    vi = _index(tmp_path, kind)
+    emb_a, meta_a = _article("https://x/a", "A", 2, seed=1)
+    emb_b, meta_b = _article("https://x/a", "B", 2, seed=2)
+    vi.upsert(emb_a, meta_a)
+    vi.upsert(emb_b, meta_b)
+    vi.upsert(emb_a, meta_a)  # A→B→A: IDs von A liegen noch als Tombstones im Index
+    _consistent(vi)
+
+    vi.compact(force=True)
+    assert vi.index.ntotal == len(vi.chunks) == 2
+    assert not vi.tombstones
+    scores, ids = vi.search(emb_a[:1], 1)
+    assert ids[0, 0] == chunk_id("https://x/a", "A", 0)
+    assert scores[0, 0] == pytest.approx(1.0, abs=1e-4)
+
+
+def test_upsert_duplicate_records_in_batch(tmp_path):
+    vi = _index(tmp_path)
+    emb, meta = _article("https://x/a", "A", 2, seed=1)
+    assert vi.upsert(np.vstack([emb, emb]), meta + meta) == 2
+    assert vi.articles["https://x/a"]["ids"] == [chunk_id("https://x/a", "A", i) for i in range(2)]
+    _consistent(vi)
+
+    vi.save()
+    loaded = VectorIndex.load(vi.index_path, vi.meta_path)
+    assert loaded is not None and loaded.index.ntotal == 2
+
+
+def test_upsert_last_version_of_article_wins(tmp_path):
+    vi = _index(tmp_path)
+    emb_a, meta_a = _article("https://x/a", "A", 2, seed=1)
+    emb_b, meta_b = _article("https://x/a", "B", 3, seed=2)
+    assert vi.upsert(np.vstack([emb_a, emb_b]), meta_a + meta_b) == 3
+    assert vi.article_hash("https://x/a") == "B"
+    _consistent(vi)
+
+
+def test_remove_compact_save_load_roundtrip(tmp_path, capsys):
+    vi = _index(tmp_path)
+    for n, url in enumerate(["https://x/a", "https://x/b", "https://x/c"]):
+        vi.upsert(*_article(url, "A", 3, seed=n))
+    assert vi.remove(["https://x/b"]) == 3
+    assert len(vi.tombstones) == 3 and vi.index.ntotal == 9
+    vi.save()
+
+    loaded = VectorIndex.load(vi.index_path, vi.meta_path)
+    assert "passt nicht" not in capsys.readouterr().out
+    assert loaded.tombstones == vi.tombstones
+    assert loaded.chunks.keys() == vi.chunks.keys()
+    np.testing.assert_array_equal(loaded.vectors(sorted(loaded.rows)), vi.vectors(sorted(vi.rows)))
+
+    assert loaded.compact() == 3
+    assert loaded.index.ntotal == 6 and not loaded.tombstones
+    loaded.save()
+    again = VectorIndex.load(vi.index_path, vi.meta_path)
+    assert again.index.ntotal == 6
+    assert set(again.articles) == {"https://x/a", "https://x/c"}
+
+
+def test_load_rebuilds_after_interrupted_save(tmp_path, capsys):
+    vi = _index(tmp_path)
+    vi.upsert(*_article("https://x/a", "A", 2, seed=1))
+    vi.save()
+    vi.upsert(*_article("https://x/b", "A", 2, seed=2))
+    vi.index_path.unlink()
+    faiss.write_index(vi.index, str(vi.index_path))  # Index neu, Metadaten noch alt
+
+    loaded = VectorIndex.load(vi.index_path, vi.meta_path)
+    assert "baue neu auf" in capsys.readouterr().out
+    assert loaded.index.ntotal == len(loaded.chunks) == 2
+
+
+@pytest.mark.parametrize("storage", ["f16", "int8", "binary"])
+def test_compressed_storage_rescores_exactly(tmp_path, storage):
+    vi = VectorIndex(DIM, tmp_path / "articles.index", tmp_path / "articles.meta.pkl",
+                     IndexSpec("flat", storage))
+    embs = {}
+    for n in range(30):
+        emb, meta = _article(f"https://x/{n}", "A", 2, seed=n)
+        vi.upsert(emb, meta)
+        embs[f"https://x/{n}"] = emb
+    vi.remove(["https://x/3"])
+    vi.compact(force=True)
+    assert vi.built.storage == storage and vi.built.compressed
+
+    query = embs["https://x/7"][1:2]
+    scores, ids = vi.search(query, 3)
+    assert ids[0, 0] == chunk_id("https://x/7", "A", 1)
+    assert scores[0, 0] == pytest.approx(1.0, abs=1e-5)  # exakt aus den Vollvektoren
+    exact = vi.vectors(ids[0].tolist()) @ query[0]
+    np.testing.assert_allclose(scores[0], exact, rtol=1e-5)
+
+    # gelöschte Chunks tauchen nach der Nachbewertung nicht mehr auf
+    vi.remove(["https://x/7"])
+    _, ids = vi.search(query, 3)
+    assert chunk_id("https://x/7", "A", 1) not in ids[0]
+
+    vi.save()
+    loaded = VectorIndex.load(vi.index_path, vi.meta_path)
+    assert loaded.built == vi.built
+    np.testing.assert_array_equal(loaded.search(query, 3)[1], vi.search(query, 3)[1])